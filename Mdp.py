@@ -1,17 +1,46 @@
 import sys
 import os
-import json
+import hmac
+import time
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QLabel, QLineEdit, QVBoxLayout, QWidget, 
-                             QPushButton, QHBoxLayout, QMessageBox, QTableWidget, QTableWidgetItem, QInputDialog)
-from PyQt5.QtCore import Qt
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import hashes
-import base64
+                             QPushButton, QHBoxLayout, QMessageBox, QTableWidget, QTableWidgetItem, QInputDialog,
+                             QProgressBar)
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
+from cryptography.fernet import InvalidToken
+from vault import DEFAULT_TARGET, KDFS, VaultLog, calibrate, derive_key, describe, estimate_seconds, legacy_params
 import random
 import string
 
+# Thread de dérivation de la clé : l'interface reste utilisable pendant la dérivation.
+# Sans paramètres, ils sont d'abord calibrés (vault.calibrate) pour la durée cible.
+# Avec check (paramètres, clé), le mot de passe est d'abord vérifié contre la clé de la session.
+class KeyDerivationThread(QThread):
+    estimate_signal = pyqtSignal(float)
+    key_ready_signal = pyqtSignal(bytes, object)
+    failed_signal = pyqtSignal(str)
+
+    def __init__(self, password, params=None, kdf='pbkdf2', target=DEFAULT_TARGET, check=None):
+        super().__init__()
+        self.password = password
+        self.params = params
+        self.kdf = kdf
+        self.target = target
+        self.check = check
+
+    def run(self):
+        try:
+            if self.check is not None:
+                check_params, check_key = self.check
+                self.estimate_signal.emit(estimate_seconds(check_params))
+                if not hmac.compare_digest(derive_key(self.password, check_params), check_key):
+                    self.failed_signal.emit("Mot de passe maître incorrect.")
+                    return
+            params = self.params or calibrate(self.kdf, self.target)
+            self.estimate_signal.emit(estimate_seconds(params))
+            self.key_ready_signal.emit(derive_key(self.password, params), params)
+        except (ValueError, MemoryError) as e:
+            self.failed_signal.emit(str(e) or "Mémoire insuffisante pour la dérivation")
+
 class PasswordManager(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -21,7 +50,12 @@ class PasswordManager(QMainWindow):
         self.encryption_key = None
         self.salt_file = "salt.dat"  # Fichier pour sauvegarder le sel
         self.password_file = "passwords.dat"  # Fichier pour sauvegarder les mots de passe chiffrés
+        self.vault = VaultLog(self.password_file)  # Journal chiffré : un enregistrement par modification
         self.salt = None
+        self.kdf_params = None  # Fonction de dérivation et paramètres du coffre (en-tête)
+        self.derivation_thread = None
+        self.derivation_started = 0.0
+        self.derivation_estimate = 0.0
 
         self.initUI()
 
@@ -51,6 +85,15 @@ class PasswordManager(QMainWindow):
         self.infoLabel = QLabel("", self)
         self.layout.addWidget(self.infoLabel)
 
+        # Avancement (estimé) de la dérivation de la clé
+        self.derivationProgress = QProgressBar(self)
+        self.derivationProgress.setRange(0, 100)
+        self.derivationProgress.setVisible(False)
+        self.layout.addWidget(self.derivationProgress)
+        self.derivationTimer = QTimer(self)
+        self.derivationTimer.setInterval(50)
+        self.derivationTimer.timeout.connect(self.updateDerivationProgress)
+
         # Boutons de gestion des mots de passe
         self.buttonLayout = QHBoxLayout()
         self.addButton = QPushButton("Ajouter", self)
@@ -61,6 +104,10 @@ class PasswordManager(QMainWindow):
         self.generateButton.clicked.connect(self.generatePassword)
         self.buttonLayout.addWidget(self.generateButton)
 
+        self.kdfButton = QPushButton("Paramètres de chiffrement", self)
+        self.kdfButton.clicked.connect(self.changeKeyDerivation)
+        self.buttonLayout.addWidget(self.kdfButton)
+
         self.layout.addLayout(self.buttonLayout)
 
         # Table pour afficher les mots de passe
@@ -79,44 +126,125 @@ class PasswordManager(QMainWindow):
             self.infoLabel.setText("Veuillez entrer le mot de passe maître.")
             return
         
-        # Générer la clé de chiffrement à partir du mot de passe maître
-        self.encryption_key = self.derive_key_from_password(password)
+        # Paramètres de dérivation lus dans l'en-tête du coffre ; ancien format : PBKDF2 et salt.dat ;
+        # nouveau coffre : paramètres calibrés pour cette machine
+        try:
+            params = self.vault.read_header()
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Erreur", f"Coffre illisible : {e}")
+            return
+        if params is None and self.vault.exists():
+            # Ancien format : sans salt.dat, aucune clé ne peut être la bonne
+            if self.salt is None:
+                QMessageBox.warning(self, "Erreur", f"Coffre de l'ancien format sans fichier de sel ({self.salt_file}) : "
+                                    "impossible de le déchiffrer.")
+                return
+            params = legacy_params(self.salt)
+
+        # Générer la clé de chiffrement à partir du mot de passe maître, hors du thread de l'interface
+        self.startKeyDerivation(KeyDerivationThread(password, params), self.vaultKeyReady)
+
+    def vaultKeyReady(self, key, params):
+        # Clé dérivée : elle est gardée pour la session, les sauvegardes ne la redérivent pas
+        self.encryption_key = key
+        self.kdf_params = params
+        self.vault.unlock(key, params)
         self.infoLabel.setText("Application déverrouillée.")
 
-        # Charger les mots de passe depuis le fichier chiffré
-        if os.path.exists(self.password_file):
-            with open(self.password_file, "rb") as file:
-                encrypted_data = file.read()
+        # Charger les mots de passe en rejouant le journal chiffré
+        if self.vault.exists():
             try:
-                fernet = Fernet(self.encryption_key)
-                decrypted_data = fernet.decrypt(encrypted_data).decode()
-                self.passwords = json.loads(decrypted_data)
+                self.passwords = self.vault.load()
                 self.populateTable()
-            except:
+            except InvalidToken:
+                self.encryption_key = None
+                self.infoLabel.setText("")
                 QMessageBox.warning(self, "Erreur", "Mot de passe maître incorrect.")
+            except (OSError, ValueError) as e:
+                self.encryption_key = None
+                self.infoLabel.setText("")
+                QMessageBox.warning(self, "Erreur", f"Coffre illisible : {e}")
         else:
             QMessageBox.information(self, "Info", "Aucun mot de passe enregistré.")
 
-    def derive_key_from_password(self, password):
-        # Utiliser PBKDF2 pour dériver la clé à partir du mot de passe maître
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=self.salt,
-            iterations=100000,
-            backend=default_backend()
-        )
-        return base64.urlsafe_b64encode(kdf.derive(password.encode()))
+    def startKeyDerivation(self, thread, on_ready):
+        # Lance une dérivation ; les boutons qui en dépendent sont désactivés jusqu'à la fin
+        self.unlockButton.setDisabled(True)
+        self.kdfButton.setDisabled(True)
+        self.infoLabel.setText("Dérivation de la clé...")
+        self.derivation_estimate = 0.0
+        self.derivationProgress.setValue(0)
+        self.derivationProgress.setVisible(True)
+        self.derivation_thread = thread
+        thread.estimate_signal.connect(self.derivationEstimated)
+        thread.key_ready_signal.connect(on_ready)
+        thread.failed_signal.connect(self.derivationFailed)
+        thread.finished.connect(self.derivationFinished)
+        thread.start()
+        self.derivationTimer.start()
+
+    def derivationEstimated(self, seconds):
+        # Nouvelle étape (vérification, calibrage, dérivation) : la barre repart de zéro
+        self.derivation_started = time.monotonic()
+        self.derivation_estimate = max(seconds, 0.01)
+
+    def updateDerivationProgress(self):
+        # La dérivation est un seul appel : l'avancement est estimé d'après la durée mesurée
+        if self.derivation_estimate:
+            elapsed = time.monotonic() - self.derivation_started
+            self.derivationProgress.setValue(min(99, int(elapsed / self.derivation_estimate * 100)))
+
+    def derivationFailed(self, message):
+        self.infoLabel.setText("")
+        QMessageBox.warning(self, "Erreur", message)
+
+    def derivationFinished(self):
+        self.derivationTimer.stop()
+        self.derivationProgress.setVisible(False)
+        self.derivation_estimate = 0.0
+        self.derivation_thread = None
+        self.unlockButton.setDisabled(False)
+        self.kdfButton.setDisabled(False)
+
+    def changeKeyDerivation(self):
+        # Choisir la fonction de dérivation et la durée cible ; les paramètres sont calibrés
+        # sur cette machine et le coffre est rechiffré avec la nouvelle clé
+        if not self.encryption_key:
+            QMessageBox.information(self, "Info", "Déverrouillez d'abord l'application.")
+            return
+        labels = list(KDFS.values())
+        current = labels.index(KDFS[self.kdf_params["kdf"]]) if self.kdf_params else 0
+        label, ok = QInputDialog.getItem(self, "Paramètres de chiffrement", "Fonction de dérivation :", labels, current, False)
+        if not ok:
+            return
+        kdf = list(KDFS)[labels.index(label)]
+        target, ok = QInputDialog.getDouble(self, "Paramètres de chiffrement", "Durée de déverrouillage visée (s) :",
+                                            DEFAULT_TARGET, 0.1, 10.0, 1)
+        if not ok:
+            return
+        password, ok = QInputDialog.getText(self, "Paramètres de chiffrement", "Mot de passe maître :", QLineEdit.Password)
+        if not ok or password == "":
+            return
+        self.startKeyDerivation(KeyDerivationThread(password, None, kdf, target, check=(self.kdf_params, self.encryption_key)),
+                                self.rekeyReady)
+
+    def rekeyReady(self, key, params):
+        # Nouvelle clé : le coffre est réécrit avec le nouvel en-tête ; la session ne passe à la
+        # nouvelle clé qu'une fois le coffre remplacé, sinon l'ancienne est gardée
+        try:
+            self.vault.compact(self.passwords, key, params)
+        except OSError as e:
+            QMessageBox.warning(self, "Erreur", f"Changement de clé impossible : {e}")
+            return
+        self.encryption_key = key
+        self.kdf_params = params
+        self.infoLabel.setText(f"Chiffrement : {describe(params)}")
 
     def loadSalt(self):
-        # Charger ou générer un sel pour la dérivation de clé
+        # Charger le sel des coffres de l'ancien format (le sel des nouveaux est dans l'en-tête)
         if os.path.exists(self.salt_file):
             with open(self.salt_file, "rb") as file:
                 self.salt = file.read()
-        else:
-            self.salt = os.urandom(16)  # Générer un nouveau sel
-            with open(self.salt_file, "wb") as file:
-                file.write(self.salt)
 
     def addPassword(self):
         # Ajouter un mot de passe
@@ -124,7 +252,7 @@ class PasswordManager(QMainWindow):
         if site and password:
             self.passwords[site] = password
             self.populateTable()
-            self.savePasswords()
+            self.saveRecord(site)
 
     def generatePassword(self):
         # Générer un mot de passe sécurisé
@@ -135,7 +263,7 @@ class PasswordManager(QMainWindow):
         if site:
             self.passwords[site] = password
             self.populateTable()
-            self.savePasswords()
+            self.saveRecord(site)
 
     def populateTable(self):
         # Afficher les mots de passe dans la table
@@ -158,13 +286,13 @@ class PasswordManager(QMainWindow):
             return None, None
         return site, password
 
-    def savePasswords(self):
-        # Sauvegarder les mots de passe dans un fichier chiffré
+    def saveRecord(self, site):
+        # Ajouter au coffre le seul enregistrement modifié (compactage si nécessaire)
         if self.encryption_key:
-            fernet = Fernet(self.encryption_key)
-            encrypted_data = fernet.encrypt(json.dumps(self.passwords).encode())
-            with open(self.password_file, "wb") as file:
-                file.write(encrypted_data)
+            try:
+                self.vault.append(self.passwords, site)
+            except OSError as e:
+                QMessageBox.warning(self, "Erreur", f"Enregistrement impossible : {e}")
 
 def main():
     app = QApplication(sys.argv)
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Banc d'essai reproductible du moteur de recherche.
+# Génère des arborescences synthétiques (largeur, profondeur, fichiers par dossier, distribution des noms,
+# chaîne de dossiers très profonde), y lance la recherche sans interface et mesure : fichiers parcourus
+# par seconde, délai du premier résultat, durée totale, nombre d'appels système et pic de mémoire (RSS).
+# Chaque mesure est faite dans un processus séparé. Les résultats sont enregistrés en JSON et peuvent
+# être comparés à une exécution précédente :
+#
+#     ./benchmark.py --shapes wide,deep --output bench.json
+#     ./benchmark.py --shapes wide,deep --compare bench.json
+#
+# Les appels système sont comptés avec strace s'il est installé, sinon par instrumentation
+# (scandir/stat appelés par le moteur) lors d'un passage séparé, non chronométré.
+
+BENCH_MANIFEST = ".filefinder-bench.json"
+
+SHAPES = {
+    'wide': {"width": 40, "depth": 2, "files": 40, "names": 'uniform', "deep": 0},
+    'deep': {"width": 2, "depth": 11, "files": 10, "names": 'uniform', "deep": 0},
+    'balanced': {"width": 6, "depth": 4, "files": 30, "names": 'zipf', "deep": 0},
+    'nested': {"width": 3, "depth": 3, "files": 20, "names": 'long', "deep": 200},
+}
+
+QUERIES = {
+    'selective': {"fileName": "alpha", "looseMatch": False},
+    'loose': {"fileName": "a", "looseMatch": True},
+    'extension': {"fileName": "", "looseMatch": True, "fileFormat": ".log"},
+}
+
+CASES = ['walk', 'scandir', 'parallel', 'process', 'index']
+
+_VOCABULARY = ["alpha", "rapport", "data", "image", "config", "test", "build", "backup", "notes", "final",
+               "draft", "export", "log", "archive", "client", "projet", "budget", "readme", "module", "cache"]
+_EXTENSIONS = [".txt", ".log", ".py", ".png", ".jpg", ".pdf", ".json", ".csv", ""]
+_EXTENSION_WEIGHTS = [20, 10, 15, 10, 8, 5, 10, 7, 5]
+
+
+def _file_name(rng, names, i):
+    if names == 'zipf':
+        # Quelques mots très fréquents, beaucoup de mots rares
+        word = rng.choices(_VOCABULARY, weights=[1 / (k + 1) for k in range(len(_VOCABULARY))])[0]
+        stem = f"{word}_{i}"
+    elif names == 'long':
+        stem = "".join(rng.choices("abcdefghijklmnopqrstuvwxyz_-", k=rng.randint(64, 120)))
+    else:
+        stem = "".join(rng.choices("abcdefghijklmnopqrstuvwxyz0123456789", k=8))
+    return stem + rng.choices(_EXTENSIONS, weights=_EXTENSION_WEIGHTS)[0]
+
+
+# Génère (ou réutilise si les paramètres sont identiques) une arborescence déterministe.
+# Seule une arborescence générée par le banc (manifeste valide) est supprimée pour être refaite ;
+# un dossier existant non vide sans manifeste n'est jamais touché (ValueError).
+def generate_tree(root, width, depth, files, names='uniform', deep=0, file_size=0, seed=0):
+    params = {"width": width, "depth": depth, "files": files, "names": names, "deep": deep,
+              "file_size": file_size, "seed": seed}
+    manifest_path = os.path.join(root, BENCH_MANIFEST)
+    generated = False
+    try:
+        with open(manifest_path) as file:
+            manifest = json.load(file)
+        if manifest["params"] == params:
+            return manifest
+        generated = set(manifest["params"]) == set(params)
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    if generated:
+        shutil.rmtree(root)
+    elif os.path.exists(root) and (not os.path.isdir(root) or os.listdir(root)):
+        raise ValueError(f"{root} existe et n'a pas été généré par le banc d'essai : choisissez un autre --workdir")
+    os.makedirs(root, exist_ok=True)
+    rng = random.Random(seed)
+    payload = b"x" * file_size
+    counts = {"files": 0, "dirs": 0}
+
+    def fill(path):
+        counts["dirs"] += 1
+        for i in range(files):
+            with open(os.path.join(path, _file_name(rng, names, i)), "wb") as file:
+                file.write(payload)
+            counts["files"] += 1
+
+    level = [root]
+    fill(root)
+    for _ in range(depth):
+        next_level = []
+        for parent in level:
+            for i in range(width):
+                path = os.path.join(parent, f"d{i}")
+                os.mkdir(path)
+                fill(path)
+                next_level.append(path)
+        level = next_level
+    # Chaîne de dossiers imbriqués (un fichier par niveau)
+    path = root
+    for i in range(deep):
+        path = os.path.join(path, f"n{i % 10}")
+        os.mkdir(path)
+        counts["dirs"] += 1
+        with open(os.path.join(path, _file_name(rng, names, i)), "wb") as file:
+            file.write(payload)
+        counts["files"] += 1
+
+    manifest = {"params": params, "files": counts["files"], "dirs": counts["dirs"]}
+    with open(manifest_path, "w") as file:
+        json.dump(manifest, file)
+    return manifest
+
+
+# --- Processus enfant : une mesure -------------------------------------------------------------
+
+class _CountingEntry:
+    __slots__ = ('_entry', '_counted')
+
+    def __init__(self, entry):
+        self._entry = entry
+        self._counted = False
+
+    def __getattr__(self, name):
+        return getattr(self._entry, name)
+
+    def stat(self, follow_symlinks=True):
+        if not self._counted:
+            self._counted = True
+            next(_SYSCALLS)
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+
+class _CountingScandir:
+    def __init__(self, iterator):
+        self._iterator = iterator
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._iterator.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return _CountingEntry(next(self._iterator))
+
+    def close(self):
+        self._iterator.close()
+
+
+_SYSCALLS = itertools.count()
+
+
+# Instrumentation : opendir/getdents/close par scandir, un appel par stat
+def _instrument_os():
+    real_scandir, real_stat, real_lstat = os.scandir, os.stat, os.lstat
+
+    def scandir(path='.'):
+        for _ in range(3):
+            next(_SYSCALLS)
+        return _CountingScandir(real_scandir(path))
+
+    def stat(*args, **kwargs):
+        next(_SYSCALLS)
+        return real_stat(*args, **kwargs)
+
+    def lstat(*args, **kwargs):
+        next(_SYSCALLS)
+        return real_lstat(*args, **kwargs)
+
+    os.scandir, os.stat, os.lstat = scandir, stat, lstat
+
+
+def run_child(case):
+    import resource
+
+    from search_core import search
+
+    if case.get("instrument"):
+        _instrument_os()
+    options = dict(case["query"])
+    if case["backend"] == 'index':
+        options.update(index_mode='cached', index_path=case["index_path"])
+    else:
+        options.update(backend=case["backend"], workers=case.get("workers"))
+    start = time.perf_counter()
+    first = None
+    results = 0
+    if case["backend"] != 'baseline':
+        for _ in search([case["root"]], **options):
+            if first is None:
+                first = time.perf_counter() - start
+            results += 1
+    wall = time.perf_counter() - start
+    return {
+        "results": results,
+        "wall_seconds": wall,
+        "first_result_seconds": first,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "syscalls": next(_SYSCALLS) if case.get("instrument") else None,
+    }
+
+
+# --- Processus parent ----------------------------------------------------------------------------
+
+def _child_command(case):
+    return [sys.executable, os.path.abspath(__file__), "--child", json.dumps(case)]
+
+
+def _run_case(case):
+    output = subprocess.run(_child_command(case), check=True, capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    return json.loads(output)
+
+
+def _strace_syscalls(case):
+    with tempfile.NamedTemporaryFile(suffix=".strace") as trace:
+        subprocess.run(["strace", "-f", "-c", "-o", trace.name] + _child_command(case), check=True,
+                       capture_output=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        total = 0
+        for line in open(trace.name):
+            fields = line.split()
+            # Lignes de détail : % time, seconds, usecs/call, calls, [errors], syscall
+            if len(fields) >= 5 and fields[-1] != "total" and fields[3].isdigit():
+                total += int(fields[3])
+        return total
+
+
+def count_syscalls(case, baseline):
+    if shutil.which("strace"):
+        return _strace_syscalls(case) - baseline, "strace"
+    return _run_case(dict(case, instrument=True))["syscalls"], "instrumented"
+
+
+def _median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def run_benchmarks(shapes, queries, backends, workdir, repeat=3, workers=None, seed=0):
+    from file_index import FileIndex
+
+    baseline_case = {"backend": 'baseline', "root": workdir, "query": {}}
+    baseline_syscalls = _strace_syscalls(baseline_case) if shutil.which("strace") else 0
+    baseline_rss = _run_case(baseline_case)["peak_rss_kb"]
+    trees = {}
+    results = []
+    for shape in shapes:
+        root = os.path.join(workdir, shape)
+        trees[shape] = generate_tree(root, seed=seed, **SHAPES[shape])
+        index_path = os.path.join(workdir, f"{shape}.index.db")
+        if 'index' in backends:
+            index = FileIndex(index_path)
+            index.refresh([root])
+            index.close()
+        for query_name in queries:
+            for backend in backends:
+                case = {"backend": backend, "root": root, "query": QUERIES[query_name],
+                        "workers": workers, "index_path": index_path}
+                runs = [_run_case(case) for _ in range(repeat)]
+                wall = _median([run["wall_seconds"] for run in runs])
+                first = [run["first_result_seconds"] for run in runs if run["first_result_seconds"] is not None]
+                syscalls, method = count_syscalls(case, baseline_syscalls)
+                results.append({
+                    "tree": shape,
+                    "query": query_name,
+                    "backend": backend,
+                    "files": trees[shape]["files"],
+                    "results": runs[0]["results"],
+                    "wall_seconds": wall,
+                    "first_result_seconds": _median(first) if first else None,
+                    "files_per_second": trees[shape]["files"] / wall if wall else None,
+                    "peak_rss_kb": max(run["peak_rss_kb"] for run in runs),
+                    "syscalls": syscalls,
+                    "syscalls_method": method,
+                })
+    return {
+        "meta": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+            "seed": seed,
+            "baseline_rss_kb": baseline_rss,
+        },
+        "trees": trees,
+        "results": results,
+    }
+
+
+# Compare deux exécutions ; renvoie les cas dont la durée a augmenté de plus de threshold
+def compare(current, previous, threshold=0.10):
+    reference = {(r["tree"], r["query"], r["backend"]): r for r in previous["results"]}
+    regressions = []
+    for result in current["results"]:
+        key = (result["tree"], result["query"], result["backend"])
+        before = reference.get(key)
+        if before is None or not before["wall_seconds"]:
+            continue
+        change = result["wall_seconds"] / before["wall_seconds"] - 1
+        print(f"{'/'.join(key):40s} {before['wall_seconds']:8.3f} s -> {result['wall_seconds']:8.3f} s  {change:+7.1%}")
+        if change > threshold:
+            regressions.append((key, change))
+    return regressions
+
+
+def print_report(report):
+    print(f"{'arbre':10s} {'requête':10s} {'moteur':9s} {'fichiers':>9s} {'résultats':>9s} {'durée (s)':>10s} "
+          f"{'1er (ms)':>9s} {'fichiers/s':>11s} {'RSS (Ko)':>9s} {'syscalls':>9s}")
+    for r in report["results"]:
+        first = f"{r['first_result_seconds'] * 1000:9.1f}" if r["first_result_seconds"] is not None else f"{'-':>9s}"
+        print(f"{r['tree']:10s} {r['query']:10s} {r['backend']:9s} {r['files']:9d} {r['results']:9d} "
+              f"{r['wall_seconds']:10.3f} {first} {r['files_per_second']:11.0f} {r['peak_rss_kb']:9d} {r['syscalls']:9d}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai du moteur de recherche.")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--shapes", default=",".join(SHAPES), help="formes d'arbres : " + ", ".join(SHAPES))
+    parser.add_argument("--queries", default=",".join(QUERIES), help="requêtes : " + ", ".join(QUERIES))
+    parser.add_argument("--backends", default=",".join(CASES), help="moteurs : " + ", ".join(CASES))
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "filefinder-bench"),
+                        help="dossier des arbres générés (tmpfs ou disque local)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, help="threads (moteur parallèle) ou processus (moteur process)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="fichier JSON de résultats")
+    parser.add_argument("--compare", help="fichier JSON d'une exécution précédente")
+    parser.add_argument("--threshold", type=float, default=0.10, help="seuil de régression (0.10 = +10 %%)")
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_child(json.loads(args.child))))
+        return 0
+
+    try:
+        report = run_benchmarks(args.shapes.split(","), args.queries.split(","), args.backends.split(","),
+                                args.workdir, args.repeat, args.workers, args.seed)
+    except ValueError as e:
+        print(f"benchmark: {e}", file=sys.stderr)
+        return 2
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            previous = json.load(file)
+        regressions = compare(report, previous, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} régression(s) au-delà de {args.threshold:.0%}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
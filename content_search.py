@@ -0,0 +1,171 @@
+import mmap
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, wait
+
+# Recherche dans le contenu des fichiers, répartie sur un pool de processus (pas de GIL partagé).
+# Les fichiers sont envoyés aux processus par paquets pour limiter le coût des échanges ;
+# les gros fichiers sont lus par mmap, les fichiers binaires (octet nul au début) et ceux qui
+# dépassent la taille maximale sont ignorés. Un paquet incomplet part après CHUNK_WAIT secondes et
+# les paquets terminés sont livrés à chaque résultat reçu : sur un parcours lent, les correspondances
+# arrivent au fil de l'eau et non à la fin du parcours. Chaque correspondance donne la ligne (à partir de 1),
+# la position en octets dans le fichier et le texte de la ligne.
+# Les processus sont lancés en mode « spawn » : sûr même depuis un programme multithread (Qt).
+# multiprocessing n'est importé qu'au premier filtrage : il ralentirait le démarrage de l'interface.
+
+ContentMatch = namedtuple('ContentMatch', 'line offset text')
+
+DEFAULT_MAX_FILE_SIZE = 100 * 1024 * 1024
+MMAP_THRESHOLD = 1024 * 1024
+BINARY_SNIFF_SIZE = 8192
+MAX_MATCHES_PER_FILE = 100
+MAX_LINE_LENGTH = 200
+CHUNK_FILES = 64
+CHUNK_BYTES = 32 * 1024 * 1024
+CHUNK_WAIT = 0.1
+
+
+# Motif en octets : texte littéral ou expression régulière (insensible à la casse pour l'ASCII)
+def compile_content_pattern(content, regex=False, ignore_case=True):
+    source = content.encode('utf-8')
+    if not regex:
+        source = re.escape(source)
+    try:
+        return re.compile(source, re.IGNORECASE if ignore_case else 0)
+    except re.error as e:
+        raise ValueError(f"Expression régulière invalide (contenu) : {e}")
+
+
+def _line_text(data, start, end):
+    line_start = data.rfind(b'\n', 0, start) + 1
+    line_end = data.find(b'\n', end)
+    if line_end < 0:
+        line_end = len(data)
+    line = data[line_start:min(line_end, line_start + MAX_LINE_LENGTH * 4)]
+    return line.decode('utf-8', 'replace').strip()[:MAX_LINE_LENGTH]
+
+
+def _find_matches(data, pattern, max_matches):
+    matches = []
+    line = 1
+    position = 0
+    for match in pattern.finditer(data):
+        start = match.start()
+        line += data[position:start].count(b'\n')
+        position = start
+        matches.append(ContentMatch(line, start, _line_text(data, start, match.end())))
+        if len(matches) >= max_matches:
+            break
+    return matches
+
+
+def scan_file(path, pattern, max_size=DEFAULT_MAX_FILE_SIZE, max_matches=MAX_MATCHES_PER_FILE):
+    try:
+        with open(path, 'rb') as file:
+            size = file.seek(0, 2)
+            if size == 0 or size > max_size:
+                return None
+            file.seek(0)
+            head = file.read(BINARY_SNIFF_SIZE)
+            if b'\0' in head:
+                return None
+            if size <= len(head):
+                return _find_matches(head, pattern, max_matches) or None
+            if size < MMAP_THRESHOLD:
+                return _find_matches(head + file.read(), pattern, max_matches) or None
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return _find_matches(data, pattern, max_matches) or None
+    except (OSError, ValueError):
+        return None
+
+
+# --- Côté processus de travail ---
+
+_worker_state = {}
+
+
+def _init_worker(content, regex, ignore_case, max_size, max_matches):
+    _worker_state.update(pattern=compile_content_pattern(content, regex, ignore_case),
+                         max_size=max_size, max_matches=max_matches)
+
+
+def _scan_chunk(paths):
+    pattern = _worker_state["pattern"]
+    max_size = _worker_state["max_size"]
+    max_matches = _worker_state["max_matches"]
+    return [scan_file(path, pattern, max_size, max_matches) for path in paths]
+
+
+# Paquet en cours de constitution : prêt quand il est assez gros ou qu'il attend depuis CHUNK_WAIT
+class _Chunk:
+    def __init__(self):
+        self.results = []
+        self.size = 0
+        self.started = 0.0
+
+    def add(self, result):
+        if not self.results:
+            self.started = time.monotonic()
+        self.results.append(result)
+        self.size += result.size
+
+    def ready(self):
+        return bool(self.results) and (len(self.results) >= CHUNK_FILES or self.size >= CHUNK_BYTES or
+                                       time.monotonic() - self.started >= CHUNK_WAIT)
+
+
+class ContentSearcher:
+    def __init__(self, content, regex=False, ignore_case=True, max_size=DEFAULT_MAX_FILE_SIZE,
+                 processes=None, max_matches=MAX_MATCHES_PER_FILE):
+        # Valide le motif tout de suite (ValueError), avant de lancer les processus
+        compile_content_pattern(content, regex, ignore_case)
+        self.content = content
+        self.regex = regex
+        self.ignore_case = ignore_case
+        self.max_size = max_size
+        self.processes = processes or os.cpu_count() or 1
+        self.max_matches = max_matches
+
+    # Filtre un flux de résultats (objets avec path, size et _replace) et ne garde que ceux dont
+    # le contenu correspond, complétés par matches. L'ordre de sortie suit la fin des traitements.
+    def filter(self, results, is_running=lambda: True):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_worker,
+                                   initargs=(self.content, self.regex, self.ignore_case, self.max_size, self.max_matches))
+        futures = {}
+        max_in_flight = self.processes * 2
+        chunk = _Chunk()
+        try:
+            for result in results:
+                if not is_running():
+                    return
+                # Paquets déjà terminés : livrés sans attendre
+                yield from self._collect(futures, FIRST_COMPLETED, timeout=0)
+                if 0 < result.size <= self.max_size:
+                    chunk.add(result)
+                if chunk.ready():
+                    futures[pool.submit(_scan_chunk, [r.path for r in chunk.results])] = chunk.results
+                    chunk = _Chunk()
+                    while len(futures) >= max_in_flight:
+                        yield from self._collect(futures, FIRST_COMPLETED)
+            if chunk.results:
+                futures[pool.submit(_scan_chunk, [r.path for r in chunk.results])] = chunk.results
+            while futures:
+                if not is_running():
+                    return
+                yield from self._collect(futures, FIRST_COMPLETED, timeout=0.2)
+        finally:
+            # Arrêt : les paquets non commencés sont annulés, les processus se terminent
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _collect(self, futures, return_when, timeout=None):
+        done, _ = wait(futures, timeout=timeout, return_when=return_when)
+        for future in done:
+            chunk = futures.pop(future)
+            for result, matches in zip(chunk, future.result()):
+                if matches:
+                    yield result._replace(matches=matches)
@@ -0,0 +1,117 @@
+import hashlib
+import os
+from collections import defaultdict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# Recherche de doublons par étapes, de la moins coûteuse à la plus coûteuse :
+#   1. regroupement par taille (aucune lecture : la taille vient du parcours) ;
+#   2. empreinte des premiers et derniers Ko, seulement pour les tailles partagées ;
+#   3. empreinte complète, seulement pour les fichiers encore groupés après l'étape 2.
+# Les lectures sont faites par un pool de threads borné (hashlib libère le GIL sur les gros blocs).
+
+# files : résultats de la recherche (path, size, mtime...) triés par chemin
+DuplicateGroup = namedtuple('DuplicateGroup', 'size digest files')
+
+PARTIAL_SIZE = 4096
+READ_SIZE = 1024 * 1024
+DEFAULT_HASH_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+
+def partial_hash(path, size):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as file:
+        digest.update(file.read(PARTIAL_SIZE))
+        if size > 2 * PARTIAL_SIZE:
+            file.seek(-PARTIAL_SIZE, os.SEEK_END)
+            digest.update(file.read(PARTIAL_SIZE))
+        elif size > PARTIAL_SIZE:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def full_hash(path, is_running=lambda: True):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as file:
+        while is_running():
+            block = file.read(READ_SIZE)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DuplicateFinder:
+    def __init__(self, workers=DEFAULT_HASH_WORKERS, min_size=1):
+        self.workers = workers
+        self.min_size = min_size
+        self.stats = {"files": 0, "size_candidates": 0, "partial_hashed": 0, "full_hashed": 0, "groups": 0}
+
+    # Applique hash_file au chemin de chaque résultat avec au plus 2 * workers lectures en attente ;
+    # produit (résultat, empreinte), les fichiers illisibles sont ignorés
+    def _hash_all(self, pool, hash_file, files, is_running):
+        in_flight = deque()
+        files = iter(files)
+        while True:
+            while len(in_flight) < self.workers * 2 and is_running():
+                result = next(files, None)
+                if result is None:
+                    break
+                in_flight.append((result, pool.submit(hash_file, result.path)))
+            if not in_flight:
+                return
+            result, future = in_flight.popleft()
+            try:
+                yield result, future.result()
+            except OSError:
+                continue
+
+    @staticmethod
+    def _regroup(hashed):
+        groups = defaultdict(list)
+        for result, digest in hashed:
+            groups[digest].append(result)
+        return [(digest, files) for digest, files in groups.items() if len(files) > 1]
+
+    # results : objets avec path et size (ex. SearchResult). Les groupes sont produits
+    # au fur et à mesure, par taille décroissante (les doublons les plus coûteux d'abord).
+    def find(self, results, is_running=lambda: True):
+        by_size = defaultdict(list)
+        seen = set()
+        for result in results:
+            if not is_running():
+                return
+            self.stats["files"] += 1
+            if result.size < self.min_size:
+                continue
+            # Même fichier atteint par deux dossiers de recherche imbriqués
+            if result.path in seen:
+                continue
+            seen.add(result.path)
+            by_size[result.size].append(result)
+
+        buckets = sorted(((size, files) for size, files in by_size.items() if len(files) > 1),
+                         key=lambda bucket: bucket[0], reverse=True)
+        self.stats["size_candidates"] = sum(len(files) for size, files in buckets)
+        with ThreadPoolExecutor(self.workers) as pool:
+            for size, files in buckets:
+                if not is_running():
+                    return
+                self.stats["partial_hashed"] += len(files)
+                groups = self._regroup(self._hash_all(pool, lambda path: partial_hash(path, size), files, is_running))
+                for digest, group in groups:
+                    # Fichier lu en entier par l'empreinte partielle : elle suffit
+                    if size > 2 * PARTIAL_SIZE:
+                        self.stats["full_hashed"] += len(group)
+                        hashed = self._hash_all(pool, lambda path: full_hash(path, is_running), group, is_running)
+                        confirmed = self._regroup(hashed)
+                    else:
+                        confirmed = [(digest, group)]
+                    if not is_running():
+                        return
+                    for full_digest, duplicates in confirmed:
+                        self.stats["groups"] += 1
+                        yield DuplicateGroup(size, full_digest, sorted(duplicates, key=lambda result: result.path))
+
+
+def find_duplicates(results, workers=DEFAULT_HASH_WORKERS, min_size=1, is_running=lambda: True):
+    return DuplicateFinder(workers, min_size).find(results, is_running)
@@ -0,0 +1,176 @@
+import csv
+import datetime
+import json
+import mimetypes
+import os
+
+# Export des résultats au fil de la recherche, en CSV, JSON (tableau) ou NDJSON (un objet par ligne).
+# Le chemin est toujours exporté ; taille, date de modification, type MIME et détail
+# (correspondance, groupe de doublons, score) sont des colonnes facultatives.
+# Les lignes sont formatées par lots et écrites en une fois dans un fichier à grand tampon.
+# Le fichier est écrit sous un nom temporaire (.part) puis renommé à la fermeture : le fichier
+# final est toujours complet et valide, y compris si la recherche est interrompue.
+# En cas d'erreur, abort() supprime le fichier temporaire sans toucher au fichier final existant.
+#
+#     with ResultExporter("rapport.csv", columns=("size", "mtime")) as exporter:
+#         for result in search(["/srv/partage"], fileFormat=".pdf"):
+#             exporter.write(result.path, result.size, result.mtime)
+
+EXPORT_FORMATS = {
+    'csv': "CSV",
+    'json': "JSON",
+    'ndjson': "NDJSON",
+}
+
+EXPORT_COLUMNS = {
+    'size': "Taille (octets)",
+    'mtime': "Date de modification",
+    'type': "Type MIME",
+    'detail': "Correspondance",
+}
+
+BATCH_SIZE = 1000
+BUFFER_SIZE = 1024 * 1024
+
+_mime_cache = {}
+
+
+# Type MIME déterminé une seule fois par extension
+def mime_type(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in _mime_cache:
+        _mime_cache[ext] = mimetypes.guess_type("f" + ext)[0]
+    return _mime_cache[ext]
+
+
+# Format déduit de l'extension du fichier (.csv, .json, .ndjson / .jsonl), CSV par défaut
+def format_from_path(path):
+    ext = os.path.splitext(path)[1].lower().lstrip('.')
+    if ext == 'jsonl':
+        return 'ndjson'
+    return ext if ext in EXPORT_FORMATS else 'csv'
+
+
+def parse_columns(text):
+    columns = [column.strip() for column in (text or "").split(",") if column.strip()]
+    unknown = [column for column in columns if column not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Colonne d'export inconnue : {', '.join(unknown)}")
+    return tuple(columns)
+
+
+class ResultExporter:
+    def __init__(self, path, export_format=None, columns=(), batch_size=BATCH_SIZE, buffer_size=BUFFER_SIZE):
+        self.path = path
+        self.format = export_format or format_from_path(path)
+        if self.format not in EXPORT_FORMATS:
+            raise ValueError(f"Format d'export inconnu : {self.format}")
+        self.columns = tuple(column for column in EXPORT_COLUMNS if column in columns)
+        self.batch_size = batch_size
+        self.count = 0
+        self._batch = []
+        self._temp_path = path + ".part"
+        self._file = open(self._temp_path, 'w', encoding='utf-8', errors='backslashreplace', newline='',
+                          buffering=buffer_size)
+        self._csv = None
+        if self.format == 'csv':
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(['path'] + list(self.columns))
+        elif self.format == 'json':
+            self._file.write("[")
+
+    def __enter__(self):
+        return self
+
+    # Interruption (Ctrl+C) : le fichier partiel est publié ; autre exception : export abandonné
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None or issubclass(exc_type, KeyboardInterrupt):
+            self.close()
+        else:
+            self.abort()
+
+    def _values(self, path, size, mtime, detail):
+        values = {}
+        for column in self.columns:
+            if column == 'size':
+                values[column] = size
+            elif column == 'mtime':
+                values[column] = (datetime.datetime.fromtimestamp(mtime).isoformat(timespec='seconds')
+                                  if mtime is not None else None)
+            elif column == 'type':
+                values[column] = mime_type(path)
+            else:
+                values[column] = detail
+        return values
+
+    def write(self, path, size=None, mtime=None, detail=None):
+        values = self._values(path, size, mtime, detail)
+        if self._csv is not None:
+            self._batch.append([path] + ["" if values[column] is None else values[column] for column in self.columns])
+        else:
+            record = {"path": path}
+            record.update(values)
+            self._batch.append(json.dumps(record, ensure_ascii=False))
+        self.count += 1
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._batch:
+            return
+        if self._csv is not None:
+            self._csv.writerows(self._batch)
+        elif self.format == 'json':
+            # Séparateur avant chaque lot sauf le premier
+            prefix = "\n" if self.count == len(self._batch) else ",\n"
+            self._file.write(prefix + ",\n".join(self._batch))
+        else:
+            self._file.write("\n".join(self._batch) + "\n")
+        self._batch = []
+
+    @property
+    def closed(self):
+        return self._file is None
+
+    # Termine le fichier (fin du tableau JSON) et le met à sa place définitive
+    def close(self):
+        if self._file is None:
+            return
+        try:
+            self.flush()
+            if self.format == 'json':
+                self._file.write("\n]\n" if self.count else "]\n")
+            self._file.close()
+            os.replace(self._temp_path, self.path)
+        except BaseException:
+            self._file.close()
+            try:
+                os.remove(self._temp_path)
+            except OSError:
+                pass
+            raise
+        finally:
+            self._file = None
+
+    # Abandonne l'export : le fichier temporaire est supprimé, le fichier final n'est pas remplacé
+    def abort(self):
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+        except OSError:
+            pass
+        finally:
+            self._file = None
+            self._batch = []
+        try:
+            os.remove(self._temp_path)
+        except OSError:
+            pass
+
+    # Transmet les résultats (search_core.SearchResult) en les exportant au passage ;
+    # detail(result) (facultatif) remplit la colonne de détail
+    def tee(self, results, detail=None):
+        for result in results:
+            self.write(result.path, result.size, result.mtime, detail(result) if detail is not None else None)
+            yield result
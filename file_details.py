@@ -0,0 +1,111 @@
+import mimetypes
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# Détails du fichier sélectionné (stat, type MIME) lus hors du thread de l'interface :
+# sur un partage réseau lent, un stat peut bloquer plusieurs secondes.
+# Les détails sont gardés par chemin (LRU) pendant MAX_AGE secondes ; invalidate() et
+# invalidate_tree() les oublient quand on sait qu'un fichier ou un dossier a changé.
+# Le thread ne traite que la dernière demande : en parcourant le tableau au clavier,
+# les lignes seulement survolées ne coûtent aucun stat.
+
+FileDetails = namedtuple('FileDetails', 'path size ctime mtime mime error')
+
+MAX_ENTRIES = 4096
+MAX_AGE = 10.0
+
+
+def read_details(path):
+    mime_type, _ = mimetypes.guess_type(path)
+    try:
+        file_stat = os.stat(path)
+    except OSError as e:
+        return FileDetails(path, None, None, None, mime_type, e.strerror or str(e))
+    return FileDetails(path, file_stat.st_size, file_stat.st_ctime, file_stat.st_mtime, mime_type, None)
+
+
+class DetailsCache:
+    def __init__(self, max_entries=MAX_ENTRIES, max_age=MAX_AGE):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Détails encore valides pour path, ou None
+    def get(self, path):
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return None
+            details, read_at = entry
+            if time.monotonic() - read_at > self.max_age:
+                del self._entries[path]
+                return None
+            self._entries.move_to_end(path)
+            return details
+
+    def put(self, details):
+        with self._lock:
+            self._entries[details.path] = (details, time.monotonic())
+            self._entries.move_to_end(details.path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path):
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def invalidate_tree(self, path):
+        prefix = path.rstrip(os.sep) + os.sep
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Thread de lecture des détails : seule la dernière demande est traitée
+class DetailsThread(QThread):
+    details_ready_signal = pyqtSignal(object)
+
+    def __init__(self, cache, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self._condition = threading.Condition()
+        self._request = None
+        self._is_running = True
+
+    # Détails en cache renvoyés tout de suite ; sinon lus en arrière-plan (details_ready_signal)
+    def requestDetails(self, path):
+        details = self.cache.get(path)
+        if details is not None:
+            return details
+        with self._condition:
+            self._request = path
+            self._condition.notify()
+        return None
+
+    def run(self):
+        while True:
+            with self._condition:
+                while self._request is None and self._is_running:
+                    self._condition.wait()
+                if not self._is_running:
+                    return
+                path = self._request
+                self._request = None
+            details = self.cache.get(path) or read_details(path)
+            if details.error is None:
+                self.cache.put(details)
+            self.details_ready_signal.emit(details)
+
+    def stop(self):
+        with self._condition:
+            self._is_running = False
+            self._condition.notify()
@@ -0,0 +1,316 @@
+import os
+import sqlite3
+import stat
+import time
+
+from traversal import Backend
+
+# Index persistant des noms de fichiers (SQLite).
+# Chaque dossier indexé est mémorisé avec sa date de modification : lors d'un rafraîchissement,
+# seuls les dossiers dont la date a changé sont relistés (un fichier ajouté, supprimé ou renommé
+# change la date de son dossier). Les autres ne coûtent qu'un stat.
+# Les noms sont indexés dans une table FTS5 (tokenizer trigram) pour la recherche non stricte.
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".filefinder", "index.db")
+
+INDEX_MODES = {
+    'off': "Désactivé",
+    'refresh': "Index (rafraîchi avant la recherche)",
+    'cached': "Index (sans rafraîchir)",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS roots (path TEXT PRIMARY KEY, crawled REAL);
+CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, parent TEXT, mtime REAL);
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs(parent);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    stem TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    size INTEGER,
+    mtime REAL
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files(dir);
+CREATE INDEX IF NOT EXISTS files_stem ON files(stem);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(name, content='files', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS files_ai AFTER INSERT ON files BEGIN
+    INSERT INTO files_fts(rowid, name) VALUES (new.id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS files_ad AFTER DELETE ON files BEGIN
+    INSERT INTO files_fts(files_fts, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+"""
+
+
+def normalize_root(path):
+    return os.path.abspath(path)
+
+
+# Bornes [préfixe, préfixe suivant) pour sélectionner un sous-arbre avec l'index B-tree
+def _subtree_bounds(path):
+    prefix = path if path.endswith(os.sep) else path + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+def _file_row(dirpath, name, file_stat):
+    stem, ext = os.path.splitext(name)
+    return (dirpath, name, stem.lower(), ext.lower(), file_stat.st_size, file_stat.st_mtime)
+
+
+# Entrée issue de l'index : compatible avec os.DirEntry, stat() ne fait aucun appel système
+class IndexEntry:
+    __slots__ = ('name', 'path', 'st_size', 'st_mtime')
+
+    def __init__(self, dirpath, name, size, mtime):
+        self.name = name
+        self.path = os.path.join(dirpath, name)
+        self.st_size = size
+        self.st_mtime = mtime
+
+    def stat(self, follow_symlinks=True):
+        return self
+
+    def is_dir(self, follow_symlinks=True):
+        return False
+
+    def is_file(self, follow_symlinks=True):
+        return True
+
+
+class FileIndex:
+    def __init__(self, db_path=DEFAULT_INDEX_PATH):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite sans FTS5 ou sans tokenizer trigram : repli sur instr()
+            self.has_fts = False
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def is_indexed(self, rootDir):
+        row = self.conn.execute("SELECT 1 FROM roots WHERE path = ?", (normalize_root(rootDir),)).fetchone()
+        return row is not None
+
+    # Rafraîchissement incrémental : renvoie le nombre de dossiers relistés
+    def refresh(self, directories, is_running=lambda: True, full=False):
+        rescanned = 0
+        for rootDir in directories:
+            root = normalize_root(rootDir)
+            rescanned += self._refresh_tree(root, None, is_running, full)
+            if not is_running():
+                self.conn.commit()
+                return rescanned
+            self.conn.execute("INSERT OR REPLACE INTO roots(path, crawled) VALUES (?, ?)", (root, time.time()))
+            self.conn.commit()
+        return rescanned
+
+    def _refresh_tree(self, root, parent, is_running=lambda: True, full=False):
+        rescanned = 0
+        stack = [(root, parent)]
+        while stack:
+            if not is_running():
+                break
+            path, parent = stack.pop()
+            try:
+                dir_mtime = os.stat(path).st_mtime
+            except OSError:
+                self._delete_tree(path)
+                continue
+            row = self.conn.execute("SELECT mtime FROM dirs WHERE path = ?", (path,)).fetchone()
+            if not full and row is not None and row[0] == dir_mtime:
+                stack.extend((child, path) for (child,) in
+                             self.conn.execute("SELECT path FROM dirs WHERE parent = ?", (path,)))
+                continue
+            subdirs = self._rescan_dir(path, parent, dir_mtime, is_running)
+            if subdirs is None:
+                break
+            rescanned += 1
+            stack.extend((child, path) for child in reversed(subdirs))
+        return rescanned
+
+    # Mise à jour ponctuelle d'un chemin créé, modifié, renommé ou supprimé
+    # (utilisée par la surveillance en direct). L'état est relu sur le disque.
+    def update_path(self, path):
+        dirpath, name = os.path.split(path)
+        self.conn.execute("DELETE FROM files WHERE dir = ? AND name = ?", (dirpath, name))
+        try:
+            path_stat = os.stat(path)
+        except OSError:
+            self._delete_tree(path)
+            return
+        if stat.S_ISDIR(path_stat.st_mode):
+            if os.path.islink(path):
+                self._delete_tree(path)
+            else:
+                self._refresh_tree(path, dirpath, full=True)
+        else:
+            self.conn.execute("INSERT INTO files(dir, name, stem, ext, size, mtime) VALUES (?, ?, ?, ?, ?, ?)",
+                              _file_row(dirpath, name, path_stat))
+
+    # Enregistre la date actuelle d'un dossier déjà à jour, pour que le prochain
+    # rafraîchissement incrémental ne le reliste pas
+    def touch_dir(self, path):
+        try:
+            dir_mtime = os.stat(path).st_mtime
+        except OSError:
+            return
+        self.conn.execute("UPDATE dirs SET mtime = ? WHERE path = ?", (dir_mtime, path))
+
+    def commit(self):
+        self.conn.commit()
+
+    # Reliste un dossier ; interrompu (None), il n'écrit rien pour ne pas enregistrer un listage partiel
+    def _rescan_dir(self, path, parent, dir_mtime, is_running=lambda: True):
+        rows = []
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if not is_running():
+                        return None
+                    try:
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                subdirs.append(entry.path)
+                            continue
+                        rows.append(_file_row(path, entry.name, entry.stat()))
+                    except OSError:
+                        continue
+        except OSError:
+            self._delete_tree(path)
+            return []
+        self.conn.execute("DELETE FROM files WHERE dir = ?", (path,))
+        self.conn.executemany("INSERT INTO files(dir, name, stem, ext, size, mtime) VALUES (?, ?, ?, ?, ?, ?)", rows)
+        current = set(subdirs)
+        for (child,) in self.conn.execute("SELECT path FROM dirs WHERE parent = ?", (path,)).fetchall():
+            if child not in current:
+                self._delete_tree(child)
+        # Une racine peut aussi être un sous-dossier d'une autre racine : on garde son parent connu
+        self.conn.execute("INSERT INTO dirs(path, parent, mtime) VALUES (?, ?, ?) "
+                          "ON CONFLICT(path) DO UPDATE SET mtime = excluded.mtime, "
+                          "parent = coalesce(excluded.parent, dirs.parent)", (path, parent, dir_mtime))
+        return subdirs
+
+    def _delete_tree(self, path):
+        low, high = _subtree_bounds(path)
+        self.conn.execute("DELETE FROM files WHERE dir = ? OR (dir >= ? AND dir < ?)", (path, low, high))
+        self.conn.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", (path, low, high))
+
+    # Requête sur l'index. Les critères de la requête compilée (query.CompiledQuery) servent
+    # à réduire les candidats côté SQL ; l'appelant applique ensuite la requête complète.
+    def query(self, rootDir, query=None):
+        where, params = self._candidates(rootDir, query)
+        for dirpath, name, size, mtime in self.conn.execute("SELECT dir, name, size, mtime FROM files WHERE " + where,
+                                                            params):
+            yield IndexEntry(dirpath, name, size, mtime)
+
+    # Nombre de lignes que query() renverra (total de l'avancement en mode index)
+    def count_candidates(self, rootDir, query=None):
+        where, params = self._candidates(rootDir, query)
+        return self.conn.execute("SELECT count(*) FROM files WHERE " + where, params).fetchone()[0]
+
+    def _candidates(self, rootDir, query):
+        root = normalize_root(rootDir)
+        low, high = _subtree_bounds(root)
+        sql = "(dir = ? OR (dir >= ? AND dir < ?))"
+        params = [root, low, high]
+        if query is None:
+            fileName = looseMatch = extensions = None
+        else:
+            fileName, looseMatch, extensions = query.textName, query.looseMatch, query.extensions
+        if fileName:
+            name = fileName.lower()
+            if looseMatch and self.has_fts and len(name) >= 3:
+                sql += " AND id IN (SELECT rowid FROM files_fts WHERE files_fts MATCH ?) AND instr(stem, ?) > 0"
+                params += ['"' + name.replace('"', '""') + '"', name]
+            elif looseMatch:
+                sql += " AND instr(stem, ?) > 0"
+                params.append(name)
+            else:
+                sql += " AND stem = ?"
+                params.append(name)
+        # La colonne ext ne contient que la dernière extension (.gz pour .tar.gz)
+        if extensions and all(ext.startswith('.') and ext.count('.') == 1 for ext in extensions):
+            sql += " AND ext IN (%s)" % ", ".join("?" * len(extensions))
+            params.extend(extensions)
+        return sql, params
+
+    def count_files(self, directories):
+        total = 0
+        for rootDir in directories:
+            root = normalize_root(rootDir)
+            low, high = _subtree_bounds(root)
+            total += self.conn.execute("SELECT count(*) FROM files WHERE dir = ? OR (dir >= ? AND dir < ?)",
+                                       (root, low, high)).fetchone()[0]
+        return total
+
+
+# Moteur de recherche adossé à l'index : mêmes entrées que les moteurs de parcours,
+# utilisable tel quel par FileSearchThread.
+# La connexion SQLite est ouverte dans le thread qui parcourt (contrainte de sqlite3).
+# L'avancement compte les lignes examinées, et son total est le nombre de lignes candidates
+# (count_candidates) : les deux comptent la même unité.
+class IndexBackend(Backend):
+    name = 'index'
+    exact_total = True
+    PROGRESS_ROWS = 1000
+
+    def __init__(self, db_path=DEFAULT_INDEX_PATH, refresh=True, query=None):
+        self.db_path = db_path
+        self.refresh = refresh
+        self.query = query
+
+    def iter_files(self, rootDir, is_running=lambda: True):
+        return self.iter_roots([rootDir], is_running)
+
+    def iter_roots(self, directories, is_running=lambda: True):
+        index = FileIndex(self.db_path)
+        try:
+            stale = directories if self.refresh else [d for d in directories if not index.is_indexed(d)]
+            if stale:
+                index.refresh(stale, is_running)
+            progress = self.progress
+            if progress is not None:
+                progress.set_total(sum(index.count_candidates(d, self.query) for d in directories), 'index')
+            for rootDir in directories:
+                if not is_running():
+                    return
+                yield from self._iter_root(index, rootDir, is_running)
+        finally:
+            index.close()
+
+    def _iter_root(self, index, rootDir, is_running):
+        progress = self.progress
+        if progress is not None:
+            progress.enter_dir(rootDir)
+        rows = 0
+        # L'index couvre toute l'arborescence (il est partagé entre les recherches) :
+        # les règles d'élagage sont appliquées aux candidats
+        root = normalize_root(rootDir)
+        states = {}
+        for entry in index.query(rootDir, self.query):
+            if not is_running():
+                return
+            rows += 1
+            if progress is not None and rows >= self.PROGRESS_ROWS:
+                progress.dir_done(rootDir, rows, dirs=0)
+                rows = 0
+            if self.prune is None or self.prune.allows_path(root, entry.path, states):
+                yield entry
+        if progress is not None:
+            progress.dir_done(rootDir, rows)
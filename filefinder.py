@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import sys
+
+from export import EXPORT_COLUMNS, EXPORT_FORMATS, ResultExporter, parse_columns
+from file_index import DEFAULT_INDEX_PATH, INDEX_MODES
+from query import NAME_SYNTAXES
+from search_core import options_from_settings, search, search_duplicates
+from search_watch import WATCH_MODES, watch_from_settings
+from traversal import BACKENDS
+
+# Recherche en ligne de commande, sans interface graphique (cron, scripts, pipelines).
+# Les résultats sont écrits au fur et à mesure du parcours :
+#   ndjson : un objet JSON par ligne {"path", "size", "mtime"}, plus "matches" avec --content
+#   null   : chemins séparés par un octet nul (pour xargs -0)
+#   lines  : un chemin par ligne
+# Avec --duplicates, un objet {"size", "hash", "paths"} par groupe de doublons en ndjson ;
+# dans les autres formats, les groupes sont séparés par un enregistrement vide.
+# Avec --export, les résultats sont écrits dans un fichier CSV, JSON ou NDJSON au lieu de la sortie
+# standard (colonnes facultatives : --export-columns size,mtime,type,detail) ; le fichier reste
+# valide si la recherche est interrompue (Ctrl+C, --timeout).
+# Avec --watch, la recherche est refaite périodiquement (--watch-mode interval, toutes les
+# --watch-interval minutes) ou à chaque modification des dossiers (--watch-mode change) jusqu'à Ctrl+C ;
+# seuls les écarts sont écrits : "event" (added, removed, changed) en ndjson, chemins préfixés
+# par +, - ou ~ dans les autres formats. La première vérification liste tous les résultats (added).
+#
+#     ./filefinder.py /srv/projets --name rapport --loose --format .pdf,.docx
+#     ./filefinder.py --settings recherche.json -0 | xargs -0 ls -l
+#     ./filefinder.py /srv/projets --format .py --content "TODO"
+#     ./filefinder.py ~/projets --syntax fuzzy --name fsearch --top-k 10
+#     ./filefinder.py ~/projets --name setup --exclude node_modules --exclude .git/ --ignore-files -x
+#     ./filefinder.py /srv/partage --format .pdf --export rapport.csv --export-columns size,mtime,type
+#     ./filefinder.py --settings gros_fichiers.json --watch --watch-mode change
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="filefinder", description="Recherche de fichiers sans interface graphique.")
+    parser.add_argument("directories", nargs="*", help="dossiers à parcourir")
+    parser.add_argument("--settings", help="fichier de paramètres JSON enregistré depuis l'interface")
+    parser.add_argument("--name", dest="fileName", help="nom du fichier recherché (sans extension en syntaxe texte)")
+    parser.add_argument("--loose", dest="looseMatch", action="store_true", default=None,
+                        help="recherche non stricte du nom")
+    parser.add_argument("--syntax", dest="nameSyntax", choices=list(NAME_SYNTAXES),
+                        help="syntaxe du nom ; glob, regex et fuzzy portent sur le nom complet, extension comprise")
+    parser.add_argument("--format", dest="fileFormat", help="extension(s), séparées par des virgules")
+    parser.add_argument("--min-size", dest="minSize", type=int, help="taille minimale (Ko)")
+    parser.add_argument("--max-size", dest="maxSize", type=int, help="taille maximale (Ko)")
+    parser.add_argument("--date-from", dest="dateFrom", help="date de modification minimale (AAAA-MM-JJ)")
+    parser.add_argument("--date-to", dest="dateTo", help="date de modification maximale (AAAA-MM-JJ)")
+    parser.add_argument("--content", help="texte recherché dans le contenu des fichiers")
+    parser.add_argument("--content-regex", dest="contentRegex", action="store_true", default=None,
+                        help="le texte recherché dans le contenu est une expression régulière")
+    parser.add_argument("--max-content-size", dest="maxContentSize", type=int,
+                        help="taille maximale des fichiers lus pour le contenu (Mo)")
+    parser.add_argument("--duplicates", action="store_true", default=None,
+                        help="n'afficher que les fichiers en double, par groupes")
+    parser.add_argument("--max-results", "-n", dest="maxResults", type=int,
+                        help="s'arrêter après ce nombre de résultats (1 : premier fichier trouvé)")
+    parser.add_argument("--timeout", dest="deadline", type=float, help="durée maximale de la recherche (s)")
+    parser.add_argument("--top-k", dest="topK", type=int, help="résultats gardés en syntaxe fuzzy (classés)")
+    parser.add_argument("--exclude", action="append",
+                        help="motif de style .gitignore à exclure du parcours (option répétable)")
+    parser.add_argument("--ignore-files", dest="ignoreFiles", action="store_true", default=None,
+                        help="respecter les fichiers .gitignore / .ignore rencontrés")
+    parser.add_argument("--max-depth", dest="maxDepth", type=int,
+                        help="profondeur maximale sous chaque dossier (0 : le dossier seul)")
+    parser.add_argument("--one-filesystem", "-x", dest="oneFilesystem", action="store_true", default=None,
+                        help="ne pas descendre dans les autres systèmes de fichiers (points de montage)")
+    parser.add_argument("--follow-symlinks", "-L", dest="followSymlinks", action="store_true", default=None,
+                        help="suivre les liens symboliques vers des dossiers (sans boucle)")
+    parser.add_argument("--backend", choices=list(BACKENDS), help="moteur de parcours")
+    parser.add_argument("--workers", type=int, help="threads (moteur parallèle) ou processus (moteur process)")
+    parser.add_argument("--index", dest="indexMode", choices=list(INDEX_MODES), help="utilisation de l'index persistant")
+    parser.add_argument("--index-path", default=DEFAULT_INDEX_PATH, help="fichier de l'index persistant")
+    parser.add_argument("--output", choices=["ndjson", "null", "lines"], default="ndjson", help="format de sortie")
+    parser.add_argument("-0", dest="output", action="store_const", const="null", help="équivaut à --output null")
+    parser.add_argument("--flush", action="store_true", help="vider la sortie après chaque résultat")
+    parser.add_argument("--export", help="fichier d'export (.csv, .json ou .ndjson) au lieu de la sortie standard")
+    parser.add_argument("--export-format", choices=list(EXPORT_FORMATS),
+                        help="format d'export (par défaut : d'après l'extension du fichier)")
+    parser.add_argument("--export-columns", default="",
+                        help="colonnes exportées en plus du chemin : " + ",".join(EXPORT_COLUMNS))
+    parser.add_argument("--watch", action="store_true", help="surveiller la recherche et n'écrire que les écarts")
+    parser.add_argument("--watch-mode", dest="watchMode", choices=[mode for mode in WATCH_MODES if mode != 'off'],
+                        help="vérification périodique ou à chaque modification (inotify, Linux)")
+    parser.add_argument("--watch-interval", dest="watchInterval", type=float,
+                        help="intervalle entre deux vérifications (minutes)")
+    return parser.parse_args(argv)
+
+
+# Paramètres : fichier --settings éventuel, surchargé par les options de la ligne de commande
+def build_settings(args):
+    settings = {}
+    if args.settings:
+        with open(args.settings, 'r') as file:
+            settings = json.load(file)
+    for key in ("fileName", "looseMatch", "nameSyntax", "fileFormat", "minSize", "maxSize",
+                "dateFrom", "dateTo", "content", "contentRegex", "maxContentSize", "duplicates", "maxResults", "deadline",
+                "topK", "exclude", "ignoreFiles", "maxDepth", "oneFilesystem", "followSymlinks",
+                "backend", "workers", "indexMode", "watchMode", "watchInterval"):
+        value = getattr(args, key)
+        if value is not None:
+            settings[key] = value
+    if args.directories:
+        settings["directories"] = args.directories
+    return settings
+
+
+def result_record(result):
+    record = {"path": result.path, "size": result.size, "mtime": result.mtime}
+    if result.score is not None:
+        record["score"] = round(result.score, 1)
+    if result.matches:
+        record["matches"] = [{"line": m.line, "offset": m.offset, "text": m.text} for m in result.matches]
+    return record
+
+
+def format_result(result, output):
+    if output == "ndjson":
+        return (json.dumps(result_record(result), ensure_ascii=False) + "\n").encode(errors="backslashreplace")
+    separator = b"\0" if output == "null" else b"\n"
+    return result.path.encode(errors="surrogateescape") + separator
+
+
+# Écart d'une vérification (search_watch.ResultDelta)
+def format_delta(delta, output):
+    chunks = []
+    separator = b"\0" if output == "null" else b"\n"
+    for event, prefix, items in (("added", "+ ", delta.added), ("removed", "- ", delta.removed),
+                                 ("changed", "~ ", delta.changed)):
+        for item in items:
+            path = item if event == "removed" else item.path
+            if output == "ndjson":
+                record = {"event": event}
+                record.update({"path": path} if event == "removed" else result_record(item))
+                chunks.append((json.dumps(record, ensure_ascii=False) + "\n").encode(errors="backslashreplace"))
+            else:
+                chunks.append(prefix.encode() + path.encode(errors="surrogateescape") + separator)
+    return b"".join(chunks)
+
+
+# Mode surveillance : jusqu'à Ctrl+C, chaque vérification écrit son écart (rien s'il est vide)
+def watch_main(settings, args):
+    settings.setdefault("watchMode", 'interval')
+    if settings["watchMode"] == 'off':
+        settings["watchMode"] = 'interval'
+    try:
+        watch = watch_from_settings(settings)
+    except ValueError as e:
+        print(f"filefinder: {e}", file=sys.stderr)
+        return 2
+    watch.options["index_path"] = args.index_path
+    out = sys.stdout.buffer
+    try:
+        for delta in watch.watch():
+            if delta:
+                out.write(format_delta(delta, args.output))
+                out.flush()
+    except ValueError as e:
+        print(f"filefinder: {e}", file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except KeyboardInterrupt:
+        return 130
+    return 0
+
+
+def format_group(group, output):
+    if output == "ndjson":
+        record = {"size": group.size, "hash": group.digest, "paths": [result.path for result in group.files]}
+        return (json.dumps(record, ensure_ascii=False) + "\n").encode(errors="backslashreplace")
+    separator = b"\0" if output == "null" else b"\n"
+    return b"".join(format_result(result, output) for result in group.files) + separator
+
+
+# Colonne de détail de l'export : empreinte du groupe de doublons, sinon première correspondance ou score
+def export_detail(result, group=None):
+    if group is not None:
+        return group.digest
+    if result.matches:
+        first = result.matches[0]
+        return f"{first.line}:{first.offset}:{first.text}"
+    if result.score is not None:
+        return f"{result.score:.1f}"
+    return None
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        settings = build_settings(args)
+        options = options_from_settings(settings)
+    except (OSError, ValueError) as e:
+        print(f"filefinder: {e}", file=sys.stderr)
+        return 2
+    if not options["directories"]:
+        print("filefinder: aucun dossier à parcourir", file=sys.stderr)
+        return 2
+    if args.watch:
+        if args.export:
+            print("filefinder: --export ne s'applique pas à --watch", file=sys.stderr)
+            return 2
+        return watch_main(settings, args)
+    directories = options.pop("directories")
+    options["index_path"] = args.index_path
+    duplicates = options.pop("duplicates")
+    formatter = format_group if duplicates else format_result
+    out = sys.stdout.buffer
+    found = False
+    exporter = None
+    # Critères vérifiés avant d'ouvrir l'export : une erreur ne touche pas au fichier existant
+    try:
+        results = (search_duplicates if duplicates else search)(directories, **options)
+        if args.export:
+            exporter = ResultExporter(args.export, args.export_format, parse_columns(args.export_columns))
+    except (OSError, ValueError) as e:
+        print(f"filefinder: {e}", file=sys.stderr)
+        return 2
+    try:
+        for result in results:
+            found = True
+            if exporter is not None:
+                for file in (result.files if duplicates else [result]):
+                    exporter.write(file.path, file.size, file.mtime, export_detail(file, result if duplicates else None))
+                continue
+            out.write(formatter(result, args.output))
+            if args.flush:
+                out.flush()
+        out.flush()
+    except ValueError as e:
+        if exporter is not None:
+            exporter.abort()
+        print(f"filefinder: {e}", file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        # Lecteur fermé (ex. : | head) : on s'arrête sans message
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except KeyboardInterrupt:
+        return 130
+    except Exception:
+        if exporter is not None:
+            exporter.abort()
+        raise
+    finally:
+        # Export interrompu (Ctrl+C, --timeout) : fichier partiel valide ; abandonné après une erreur
+        if exporter is not None:
+            exporter.close()
+    return 0 if found else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import heapq
+import itertools
+import re
+
+# Recherche approximative des noms, classée par pertinence.
+# Un nom n'est candidat que s'il contient les lettres recherchées dans l'ordre (sous-séquence) :
+# ce rejet rapide est fait par une expression régulière compilée, sans calcul de score.
+# Les candidats reçoivent ensuite un score (meilleur alignement, programmation dynamique) qui favorise
+# les lettres consécutives, les débuts de mot (après - _ . espace, ou majuscule en camelCase),
+# le début du nom et les noms courts, et pénalise les lettres sautées.
+# TopK ne garde que les K meilleurs résultats dans un tas : mémoire constante quelle que soit l'arborescence.
+
+SCORE_MATCH = 16
+BONUS_CONSECUTIVE = 8
+BONUS_BOUNDARY = 10
+BONUS_CAMEL = 8
+BONUS_FIRST_CHAR = 12
+PENALTY_GAP_START = 3
+PENALTY_GAP = 1
+BONUS_EXACT = 100
+_SEPARATORS = frozenset(" -_./\\")
+
+
+# Expression de rejet rapide : "abc" -> a.*?b.*?c (insensible à la casse)
+def subsequence_pattern(needle):
+    return re.compile(".*?".join(re.escape(char) for char in needle), re.IGNORECASE | re.DOTALL)
+
+
+def _boundary_bonus(name, j):
+    if j == 0:
+        return BONUS_FIRST_CHAR
+    previous = name[j - 1]
+    if previous in _SEPARATORS:
+        return BONUS_BOUNDARY
+    if previous.islower() and name[j].isupper():
+        return BONUS_CAMEL
+    if previous.isalpha() and name[j].isdigit():
+        return BONUS_CAMEL // 2
+    return 0
+
+
+# Score du meilleur alignement de needle (en minuscules) dans name, ou None si ce n'est pas une sous-séquence
+def fuzzy_score(needle, name):
+    if not needle:
+        return 0
+    lname = name.lower()
+    n = len(lname)
+    m = len(needle)
+    if m > n:
+        return None
+    bonuses = [_boundary_bonus(name, j) for j in range(n)]
+    # best[j] : meilleur score pour needle[:i+1] avec needle[i] placé en j
+    previous = None
+    for i, char in enumerate(needle):
+        current = [None] * n
+        # carry : meilleur score de la lettre précédente placée avant j - 1 (au moins une lettre sautée),
+        # pénalités des lettres sautées déduites
+        carry = None
+        for j in range(i, n - (m - i - 1)):
+            if previous is not None and j >= 2:
+                if carry is not None:
+                    carry -= PENALTY_GAP
+                candidate = previous[j - 2]
+                if candidate is not None and (carry is None or candidate - PENALTY_GAP_START > carry):
+                    carry = candidate - PENALTY_GAP_START
+            if lname[j] != char:
+                continue
+            score = SCORE_MATCH + bonuses[j]
+            if previous is None:
+                # Première lettre : les lettres sautées en tête coûtent peu
+                current[j] = score - min(j, 10) * PENALTY_GAP
+                continue
+            best = None
+            if j > 0 and previous[j - 1] is not None:
+                best = previous[j - 1] + BONUS_CONSECUTIVE
+            if carry is not None and (best is None or carry > best):
+                best = carry
+            if best is not None:
+                current[j] = best + score
+        previous = current
+    scores = [score for score in previous if score is not None]
+    if not scores:
+        return None
+    score = max(scores)
+    stem = lname.rsplit('.', 1)[0] if '.' in lname[1:] else lname
+    if stem == needle:
+        score += BONUS_EXACT
+    elif stem.startswith(needle):
+        score += BONUS_EXACT // 2
+    # À score égal, les noms courts d'abord
+    return score - (n - m) * 0.1
+
+
+# Les K meilleurs éléments vus (score le plus haut), dans un tas minimum de taille K
+class TopK:
+    def __init__(self, k):
+        self.k = k
+        self._heap = []
+        self._counter = itertools.count()
+        self.seen = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, score, item):
+        self.seen += 1
+        entry = (score, -next(self._counter), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif score > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+
+    # Score minimal pour entrer dans le tas (rejet sans allocation quand il est plein)
+    @property
+    def threshold(self):
+        return self._heap[0][0] if len(self._heap) >= self.k else None
+
+    # (score, élément) du meilleur au moins bon ; à score égal, dans l'ordre d'arrivée
+    def items(self):
+        return [(score, item) for score, order, item in sorted(self._heap, reverse=True)]
@@ -1,23 +1,65 @@
 import sys
 import os
-import mimetypes
 import json
+import time
+import startup_trace
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QLabel, QLineEdit, 
                              QComboBox, QPushButton, QVBoxLayout, QWidget, 
                              QMessageBox, QCheckBox, QSpinBox, QProgressBar, 
-                             QMenuBar, QAction, QStatusBar, QFrame, QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QListWidget, QGroupBox, QFormLayout, QMenu, QDateEdit, QHBoxLayout)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QPropertyAnimation, QRect, QEasingCurve, QDateTime, QTranslator, QLocale, QLibraryInfo
+                             QMenuBar, QAction, QStatusBar, QFrame, QTableView, QAbstractItemView, QHeaderView,
+                             QFileDialog, QListWidget, QGroupBox, QFormLayout, QMenu, QDateEdit, QHBoxLayout,
+                             QSystemTrayIcon, QStyle)
+from PyQt5.QtCore import (Qt, QThread, QTimer, pyqtSignal, QPropertyAnimation, QRect, QEasingCurve, QDate, QDateTime,
+                          QTranslator, QLocale, QLibraryInfo, QUrl)
 from PyQt5.QtGui import QIcon, QDesktopServices, QFont
-from PyQt5.Qt import QUrl, QSystemTrayIcon, QStyle
 from PyQt5 import QtGui
+from traversal import BACKENDS, DEFAULT_BACKEND, DEFAULT_WORKERS
+from result_model import ResultTableModel, file_type_code
+from result_filter import FilterEngine, FilterThread
+from file_details import DetailsCache, DetailsThread
+from query import NAME_SYNTAXES, compile_query
+from content_search import DEFAULT_MAX_FILE_SIZE, ContentSearcher
+from duplicates import DuplicateFinder
+from search_control import STOP_REASONS, SearchControl
+# file_index, search_core, progress, result_cache, pruning, export et search_watch (sqlite3, csv, json...)
+# ne sont importés qu'à la construction des options avancées ou à la première recherche :
+# leur coût n'est plus payé avant le premier affichage (voir --trace-startup)
+
+startup_trace.mark("modules importés")
 
 # Thread pour la recherche de fichiers
 class FileSearchThread(QThread):
     file_found_signal = pyqtSignal(str)
+    files_found_signal = pyqtSignal(list)
     search_complete_signal = pyqtSignal(bool)
-
-    def __init__(self, directories, fileName, fileFormat, minSize, maxSize, looseMatch, dateFrom, dateTo):
+    progress_signal = pyqtSignal(dict)
+
+    # Livraison par lots : un signal par lot de résultats (chemin, taille, date), envoyé dès que le lot
+    # atteint batch_size fichiers ou que batch_interval secondes se sont écoulées depuis le dernier envoi.
+    # Sans batch_size, un signal file_found_signal est émis par fichier avec son chemin.
+    # Avec content, les fichiers retenus sont ensuite lus par un pool de processus et les lignes
+    # du lot portent en plus le détail de la première correspondance.
+    # Avec duplicates, seuls les doublons sont envoyés, groupe par groupe (lignes consécutives).
+    # max_results (0 ou None : illimité) et deadline (secondes) bornent la recherche ; self.control
+    # permet l'arrêt, la pause et la reprise depuis l'interface.
+    # L'avancement (progress.ProgressTracker) est envoyé par progress_signal, au plus 4 fois par seconde.
+    # En syntaxe 'fuzzy', les top_k meilleurs résultats sont envoyés à la fin, classés, avec leur score.
+    # Avec cache (result_cache.ResultCache), seuls les dossiers modifiés depuis une recherche identique sont relus.
+    # prune (pruning.PruneRules) écarte des sous-arborescences avant leur listage.
+    # exporter (export.ResultExporter) reçoit chaque résultat au fil de l'eau et est fermé à la fin,
+    # même interrompue ; sans keep_results, rien n'est envoyé au tableau (mémoire constante).
+    BATCH_INTERVAL = 0.1
+
+    def __init__(self, directories, fileName, fileFormat, minSize, maxSize, looseMatch, dateFrom, dateTo,
+                 backend=DEFAULT_BACKEND, workers=DEFAULT_WORKERS, index_mode='off',
+                 batch_size=None, batch_interval=BATCH_INTERVAL, nameSyntax='text',
+                 content=None, contentRegex=False, maxContentSize=DEFAULT_MAX_FILE_SIZE, duplicates=False,
+                 max_results=None, deadline=None, top_k=None, cache=None, prune=None,
+                 exporter=None, keep_results=True):
         super().__init__()
+        from progress import ProgressTracker
+        from result_cache import CachedBackend
+        from search_core import DEFAULT_TOP_K, make_backend
         self.directories = directories
         self.fileName = fileName
         self.fileFormat = fileFormat
@@ -26,44 +68,177 @@ class FileSearchThread(QThread):
         self.looseMatch = looseMatch
         self.dateFrom = dateFrom
         self.dateTo = dateTo
-        self._is_running = True
+        # Recherche dans le contenu ou des doublons sans nom : tous les fichiers sont candidats
+        if (content or duplicates) and not fileName:
+            looseMatch = True
+        # Lève ValueError si un motif est invalide (expression régulière)
+        self.searcher = ContentSearcher(content, contentRegex, max_size=maxContentSize) if content else None
+        self.duplicateFinder = DuplicateFinder() if duplicates else None
+        self.top_k = DEFAULT_TOP_K if top_k is None else top_k
+        self.query = compile_query(fileName, fileFormat, minSize, maxSize, looseMatch,
+                                   self.toPyDate(dateFrom), self.toPyDate(dateTo), nameSyntax)
+        self.backend = make_backend(self.query, backend, workers, index_mode, cache=cache, prune=prune)
+        self.cache = cache if isinstance(self.backend, CachedBackend) else None
+        self.cache_delta = None
+        self.progress = ProgressTracker(directories, on_update=self.progress_signal.emit)
+        self.backend.progress = self.progress
+        self.exporter = exporter
+        self.export_error = None
+        self.error = None  # Exception qui a interrompu la recherche
+        self.keep_results = keep_results
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self._batch = []
+        self._last_flush = 0.0
+        self.delivery_stats = {"signals": 0, "results": 0, "seconds": 0.0}
+        self.control = SearchControl(max_results, deadline)
+
+    @staticmethod
+    def toPyDate(date):
+        return date.toPyDate() if isinstance(date, QDate) else date
+
+    def isSearchRunning(self):
+        return self.control()
+
+    # Texte affiché pour un résultat : score de pertinence, puis la première correspondance
+    # dans le contenu et leur nombre
+    @staticmethod
+    def resultDetail(result):
+        parts = []
+        if result.score is not None:
+            parts.append(f"score {result.score:.0f}")
+        if result.matches:
+            first = result.matches[0]
+            match = f"ligne {first.line}, octet {first.offset} : {first.text}"
+            if len(result.matches) > 1:
+                match += f" (+{len(result.matches) - 1})"
+            parts.append(match)
+        return " · ".join(parts) or None
+
+    def emitResult(self, file_path, file_size, file_mtime, detail=None):
+        self.delivery_stats["results"] += 1
+        if self.exporter is not None:
+            try:
+                self.exporter.write(file_path, file_size, file_mtime, detail)
+            except OSError as e:
+                # Disque plein, partage déconnecté... : la recherche s'arrête, le fichier est terminé
+                self.export_error = str(e)
+                self.control.cancel()
+        if not self.keep_results:
+            return
+        if self.batch_size is None:
+            self.delivery_stats["signals"] += 1
+            self.file_found_signal.emit(file_path)
+            return
+        self._batch.append((file_path, file_size, file_mtime, detail) if detail else (file_path, file_size, file_mtime))
+        if len(self._batch) >= self.batch_size:
+            self.flushResults()
+        else:
+            self.checkFlush()
+
+    def flushResults(self):
+        self._last_flush = time.monotonic()
+        if self._batch:
+            self.delivery_stats["signals"] += 1
+            self.files_found_signal.emit(self._batch)
+            self._batch = []
+
+    # Envoie le lot en attente si batch_interval est écoulé, même sans nouveau résultat
+    def checkFlush(self):
+        if self._batch and time.monotonic() - self._last_flush >= self.batch_interval:
+            self.flushResults()
 
     def run(self):
+        from search_core import iter_matches, rank_results
         files_found = False
-        for rootDir in self.directories:
-            for root, dirs, files in os.walk(rootDir):
-                if not self._is_running:
-                    break
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    try:
-                        file_size = os.path.getsize(file_path)
-                        file_mtime = os.path.getmtime(file_path)
-                    except OSError:
-                        continue
-
-                    if self.fileFormat and not file.lower().endswith(self.fileFormat.lower()):
-                        continue
-
-                    file_name_without_extension = os.path.splitext(file)[0]
-                    file_date = QDateTime.fromSecsSinceEpoch(int(file_mtime)).date()
-
-                    if ((self.looseMatch and self.fileName.lower() in file_name_without_extension.lower()) or 
-                        (file_name_without_extension.lower() == self.fileName.lower())) and \
-                        (self.minSize <= file_size <= self.maxSize) and \
-                        (self.dateFrom <= file_date <= self.dateTo):
-                        self.file_found_signal.emit(file_path)
-                        files_found = True
-
-        self.search_complete_signal.emit(files_found)
+        start = self._last_flush = time.monotonic()
+        self.control.start()
+        self.progress.start()
+        if not self.backend.exact_total:
+            self.progress.estimate_async(is_running=self.isSearchRunning, prune=self.backend.prune)
+        cache_before = dict(self.cache.stats) if self.cache is not None else None
+        tick = self.checkFlush if self.batch_size is not None else None
+        try:
+            results = iter_matches(self.backend, self.directories, self.query, self.isSearchRunning, tick)
+            if self.searcher is not None:
+                results = self.searcher.filter(results, self.isSearchRunning)
+            if self.duplicateFinder is not None:
+                groups = self.control.limit(self.duplicateFinder.find(results, self.isSearchRunning))
+                for number, group in enumerate(groups, 1):
+                    detail = f"Groupe {number} : {len(group.files)} fichiers identiques"
+                    for result in group.files:
+                        self.emitResult(result.path, result.size, result.mtime, detail)
+                    files_found = True
+            else:
+                if self.query.ranked and self.top_k:
+                    results = rank_results(results, self.query, self.top_k)
+                for result in self.control.limit(results):
+                    self.emitResult(result.path, result.size, result.mtime, self.resultDetail(result))
+                    files_found = True
+        except Exception as e:
+            # Index illisible, processus de parcours arrêté, motif invalide... : signalé par searchComplete
+            self.error = e
+        finally:
+            # Export terminé (fichier valide), même si la recherche a été interrompue ;
+            # abandonné si elle a échoué (le fichier existant est gardé)
+            if self.exporter is not None:
+                try:
+                    if self.error is not None:
+                        self.exporter.abort()
+                    else:
+                        self.exporter.close()
+                except OSError as e:
+                    self.export_error = str(e)
+            # L'interface est toujours prévenue de la fin, sinon elle resterait bloquée
+            self.flushResults()
+            self.progress.finish()
+            if cache_before is not None:
+                self.cache_delta = {key: value - cache_before[key] for key, value in self.cache.stats.items()}
+            self.delivery_stats["seconds"] = time.monotonic() - start
+            self.search_complete_signal.emit(files_found)
+
+    def stop(self):
+        self.control.cancel()
+
+    def pause(self):
+        self.control.pause()
+
+    def resume(self):
+        self.control.resume()
+
+# Surveillance d'une recherche terminée (search_watch.SearchWatch) : chaque vérification envoie
+# son écart avec la précédente (search_watch.ResultDelta, vide compris) par delta_ready_signal
+class SearchWatchThread(QThread):
+    delta_ready_signal = pyqtSignal(object)
+
+    def __init__(self, watch):
+        super().__init__()
+        self.watch = watch
+        self._is_running = True
+
+    def isWatching(self):
+        return self._is_running
+
+    def run(self):
+        for delta in self.watch.watch(self.isWatching):
+            self.delta_ready_signal.emit(delta)
 
     def stop(self):
         self._is_running = False
 
 # Fenêtre principale
 class MainWindow(QMainWindow):
-    def __init__(self):
+    RESULT_BATCH_SIZE = 500
+    FILTER_DEBOUNCE_MS = 150
+
+    # Avec fast_start, l'image d'en-tête, l'icône de notification et les options avancées sont
+    # construites juste après le premier affichage, une étape par tour de boucle d'événements,
+    # et les animations d'apparition sont supprimées : la fenêtre est utilisable plus tôt.
+    def __init__(self, fast_start=False):
         super().__init__()
+        self.fast_start = fast_start
+        self.firstPaintDone = False
+        self.deferredSteps = []
         self.setWindowTitle("File Finder - Recherche intelligente de fichiers")
         self.setGeometry(100, 100, 850, 550)  # Fenêtre plus petite par défaut
         self.setWindowIcon(QIcon('logo.png'))
@@ -71,14 +246,22 @@ class MainWindow(QMainWindow):
         self.selected_directories = []
         self.translator = QTranslator()
         self.current_language = 'fr'
+        self.index_watcher = None
+        self.search_watch_thread = None
+        self.resultCache = None  # result_cache.ResultCache, créé à la première recherche qui l'utilise
+        self.batch_stats = {"batches": 0, "gui_seconds": 0.0, "max_gui_seconds": 0.0}
         self.initUI()
-        self.found_files = []
 
 
     def initUI(self):
         self.createMenuBar()
         self.createStatusBar()
-        self.createSystemTray()
+        self.trayIcon = None
+        self.optionalGroupBox = None
+        if self.fast_start:
+            self.deferredSteps = [self.loadHeaderImage, self.createSystemTray, self.ensureAdvancedOptions]
+        else:
+            self.createSystemTray()
 
         self.centralWidget = QWidget(self)
         self.setCentralWidget(self.centralWidget)
@@ -91,13 +274,8 @@ class MainWindow(QMainWindow):
 
         # Image à gauche
         self.imageLabel = QLabel(self)
-        pixmap = QtGui.QPixmap("image.png")
-        if pixmap.isNull():
-            print("Failed to load image")
-        else:
-            # Ajustement de la taille de l'image à une taille plus raisonnable
-            pixmap = pixmap.scaled(750, 750, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.imageLabel.setPixmap(pixmap)
+        if not self.fast_start:
+            self.loadHeaderImage()
 
         # Ajout de marges pour éviter que l'image ne touche la barre d'outils
         self.imageLabel.setContentsMargins(10, 10, 10, 10)
@@ -138,51 +316,11 @@ class MainWindow(QMainWindow):
         self.toggleAdvancedOptionsButton.clicked.connect(self.toggleAdvancedOptions)
         self.layout.addWidget(self.toggleAdvancedOptionsButton)
 
-        # Options avancées
-        self.optionalGroupBox = QGroupBox("Options avancées")
-        self.optionalGroupBox.setStyleSheet("QGroupBox { font-size: 14px; font-weight: bold; margin-top: 10px; }")
-        self.optionalLayout = QFormLayout()
-
-        # Format de fichier
-        self.comboBoxFileFormat = QComboBox(self)
-        self.comboBoxFileFormat.setStyleSheet(self.get_input_stylesheet())
-        self.comboBoxFileFormat.addItem("")
-        self.comboBoxFileFormat.addItems(['.png', '.jpg', '.txt', '.pdf'])
-        self.optionalLayout.addRow(QLabel("Format du fichier (optionnel) :", self.centralWidget), self.comboBoxFileFormat)
-
-        # Taille du fichier
-        self.spinBoxMinSize = QSpinBox(self)
-        self.spinBoxMinSize.setMaximum(1000000)
-        self.spinBoxMinSize.setStyleSheet(self.get_input_stylesheet())
-        self.optionalLayout.addRow(QLabel("Taille minimale du fichier (Ko) :", self.centralWidget), self.spinBoxMinSize)
-
-        self.spinBoxMaxSize = QSpinBox(self)
-        self.spinBoxMaxSize.setMaximum(1000000)
-        self.spinBoxMaxSize.setValue(1000000)
-        self.spinBoxMaxSize.setStyleSheet(self.get_input_stylesheet())
-        self.optionalLayout.addRow(QLabel("Taille maximale du fichier (Ko) :", self.centralWidget), self.spinBoxMaxSize)
-
-        # Date de création
-        self.dateEditFrom = QDateEdit(self)
-        self.dateEditFrom.setCalendarPopup(True)
-        self.dateEditFrom.setDate(QDateTime.currentDateTime().date().addYears(-1))
-        self.dateEditFrom.setStyleSheet(self.get_input_stylesheet())
-        self.optionalLayout.addRow(QLabel("Date de création à partir de :", self.centralWidget), self.dateEditFrom)
-
-        self.dateEditTo = QDateEdit(self)
-        self.dateEditTo.setCalendarPopup(True)
-        self.dateEditTo.setDate(QDateTime.currentDateTime().date())
-        self.dateEditTo.setStyleSheet(self.get_input_stylesheet())
-        self.optionalLayout.addRow(QLabel("Date de création jusqu'à :", self.centralWidget), self.dateEditTo)
-
-        # Option de recherche non stricte
-        self.checkBoxLooseMatch = QCheckBox("Recherche non stricte du nom", self)
-        self.checkBoxLooseMatch.setStyleSheet(self.get_checkbox_stylesheet())
-        self.optionalLayout.addRow(self.checkBoxLooseMatch)
-
-        self.optionalGroupBox.setLayout(self.optionalLayout)
-        self.optionalGroupBox.setVisible(False)  # Cacher les options avancées par défaut
-        self.layout.addWidget(self.optionalGroupBox)
+        # Options avancées : leur place dans la mise en page est retenue, elles peuvent être
+        # construites plus tard (démarrage rapide)
+        self.advancedOptionsIndex = self.layout.count()
+        if not self.fast_start:
+            self.createAdvancedOptions()
 
         self.addSeparator()
 
@@ -190,7 +328,21 @@ class MainWindow(QMainWindow):
         self.pushButtonSearch = QPushButton("Chercher", self)
         self.pushButtonSearch.setStyleSheet(self.get_primary_button_stylesheet())
         self.pushButtonSearch.clicked.connect(self.startSearch)
-        self.layout.addWidget(self.pushButtonSearch)
+
+        # Boutons de pause et d'arrêt, visibles pendant la recherche
+        self.pushButtonPause = QPushButton("Pause", self)
+        self.pushButtonPause.setStyleSheet(self.get_button_stylesheet())
+        self.pushButtonPause.clicked.connect(self.togglePause)
+        self.pushButtonPause.setVisible(False)
+        self.pushButtonStop = QPushButton("Arrêter", self)
+        self.pushButtonStop.setStyleSheet(self.get_button_stylesheet())
+        self.pushButtonStop.clicked.connect(self.stopSearch)
+        self.pushButtonStop.setVisible(False)
+        searchButtonsLayout = QHBoxLayout()
+        searchButtonsLayout.addWidget(self.pushButtonSearch, 1)
+        searchButtonsLayout.addWidget(self.pushButtonPause)
+        searchButtonsLayout.addWidget(self.pushButtonStop)
+        self.layout.addLayout(searchButtonsLayout)
 
         # Barre de progression
         self.progressBar = QProgressBar(self)
@@ -208,15 +360,40 @@ class MainWindow(QMainWindow):
         self.filterLineEdit.textChanged.connect(self.filterResults)
         self.layout.addWidget(self.filterLineEdit)
 
+        # Filtrage différé (anti-rebond) et calculé dans un thread dédié
+        self.filterEngine = FilterEngine()
+        self.filterThread = FilterThread(self.filterEngine, self)
+        self.filterThread.mask_ready_signal.connect(self.filterReady)
+        self.filterThread.start()
+
+        # Détails du fichier sélectionné lus hors du thread de l'interface, gardés par chemin
+        self.detailsCache = DetailsCache()
+        self.detailsThread = DetailsThread(self.detailsCache, self)
+        self.detailsThread.details_ready_signal.connect(self.detailsReady)
+        self.detailsThread.start()
+        self.filterTimer = QTimer(self)
+        self.filterTimer.setSingleShot(True)
+        self.filterTimer.setInterval(self.FILTER_DEBOUNCE_MS)
+        self.filterTimer.timeout.connect(self.applyFilter)
+
         # Tableau pour afficher les résultats de recherche
-        self.resultTable = QTableWidget(self)
-        self.resultTable.setColumnCount(1)
-        self.resultTable.setHorizontalHeaderLabels(["Chemin des fichiers"])
-        self.resultTable.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # Vue virtuelle : seules les lignes visibles sont rendues
+        self.resultModel = ResultTableModel(self)
+        self.resultTable = QTableView(self)
+        self.resultTable.setModel(self.resultModel)
+        self.resultTable.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.resultTable.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.resultTable.setWordWrap(False)
+        self.resultTable.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.resultTable.verticalHeader().setDefaultSectionSize(24)
+        self.resultTable.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.resultTable.horizontalHeader().setSectionResizeMode(ResultTableModel.COLUMN_PATH, QHeaderView.Stretch)
+        self.resultTable.setSortingEnabled(True)
         self.resultTable.setContextMenuPolicy(Qt.CustomContextMenu)
         self.resultTable.customContextMenuRequested.connect(self.showContextMenu)
-        self.resultTable.itemSelectionChanged.connect(self.displayFileDetails)
+        self.resultTable.selectionModel().currentChanged.connect(self.displayFileDetails)
         self.resultTable.setStyleSheet(self.get_table_stylesheet())
+        self.resultTable.setColumnHidden(ResultTableModel.COLUMN_DETAIL, True)
         self.resultTable.setFixedHeight(150)  # Réduire la hauteur du tableau pour correspondre à la fenêtre plus petite
         self.layout.addWidget(self.resultTable)
 
@@ -230,18 +407,227 @@ class MainWindow(QMainWindow):
         self.fileSizeLabel = QLabel("")
         self.fileCreatedLabel = QLabel("")
         self.fileModifiedLabel = QLabel("")
+        self.fileTypeLabel = QLabel("")
 
         self.detailsLayout.addRow(QLabel("Chemin du fichier :"), self.filePathLabel)
         self.detailsLayout.addRow(QLabel("Taille du fichier :"), self.fileSizeLabel)
         self.detailsLayout.addRow(QLabel("Date de création :"), self.fileCreatedLabel)
         self.detailsLayout.addRow(QLabel("Date de modification :"), self.fileModifiedLabel)
+        self.detailsLayout.addRow(QLabel("Type :"), self.fileTypeLabel)
 
         self.detailsGroupBox.setLayout(self.detailsLayout)
         self.layout.addWidget(self.detailsGroupBox)
 
         self.layout.addStretch()
 
-        self.animateWidgets()
+        if not self.fast_start:
+            self.animateWidgets()
+
+    def createAdvancedOptions(self):
+        from export import EXPORT_COLUMNS
+        from file_index import INDEX_MODES
+        from search_core import DEFAULT_TOP_K
+        from search_watch import DEFAULT_INTERVAL, WATCH_MODES
+        startup_trace.mark("modules de recherche importés")
+        self.optionalGroupBox = QGroupBox("Options avancées")
+        self.optionalGroupBox.setStyleSheet("QGroupBox { font-size: 14px; font-weight: bold; margin-top: 10px; }")
+        self.optionalLayout = QFormLayout()
+
+        # Format de fichier
+        self.comboBoxFileFormat = QComboBox(self)
+        self.comboBoxFileFormat.setEditable(True)
+        self.comboBoxFileFormat.setToolTip("Plusieurs formats possibles, séparés par des virgules (ex. : .png, .jpg)")
+        self.comboBoxFileFormat.setStyleSheet(self.get_input_stylesheet())
+        self.comboBoxFileFormat.addItem("")
+        self.comboBoxFileFormat.addItems(['.png', '.jpg', '.txt', '.pdf'])
+        self.optionalLayout.addRow(QLabel("Format du fichier (optionnel) :", self.centralWidget), self.comboBoxFileFormat)
+
+        # Syntaxe du nom recherché
+        self.comboBoxNameSyntax = QComboBox(self)
+        self.comboBoxNameSyntax.setStyleSheet(self.get_input_stylesheet())
+        for syntax, label in NAME_SYNTAXES.items():
+            self.comboBoxNameSyntax.addItem(label, syntax)
+        self.comboBoxNameSyntax.setToolTip("Texte : nom sans l'extension. Glob, expression régulière et approximative : "
+                                           "nom complet, extension comprise (ex. : img_\\d+\\.jpg)")
+        self.optionalLayout.addRow(QLabel("Syntaxe du nom :", self.centralWidget), self.comboBoxNameSyntax)
+
+        # Nombre de résultats gardés en recherche approximative (classée)
+        self.spinBoxTopK = QSpinBox(self)
+        self.spinBoxTopK.setRange(1, 100000)
+        self.spinBoxTopK.setValue(DEFAULT_TOP_K)
+        self.spinBoxTopK.setStyleSheet(self.get_input_stylesheet())
+        self.optionalLayout.addRow(QLabel("Meilleurs résultats gardés (approximative) :", self.centralWidget),
+                                   self.spinBoxTopK)
+
+        # Recherche dans le contenu des fichiers
+        self.lineEditContent = QLineEdit(self)
+        self.lineEditContent.setPlaceholderText("Texte contenu dans les fichiers")
+        self.lineEditContent.setStyleSheet(self.get_input_stylesheet())
+        self.optionalLayout.addRow(QLabel("Contenu recherché (optionnel) :", self.centralWidget), self.lineEditContent)
+
+        self.checkBoxContentRegex = QCheckBox("Contenu en expression régulière", self)
+        self.checkBoxContentRegex.setStyleSheet(self.get_checkbox_stylesheet())
+        self.optionalLayout.addRow(self.checkBoxContentRegex)
+
+        self.spinBoxMaxContentSize = QSpinBox(self)
+        self.spinBoxMaxContentSize.setRange(1, 100000)
+        self.spinBoxMaxContentSize.setValue(DEFAULT_MAX_FILE_SIZE // (1024 * 1024))
+        self.spinBoxMaxContentSize.setStyleSheet(self.get_input_stylesheet())
+        self.optionalLayout.addRow(QLabel("Taille maximale des fichiers lus (Mo) :", self.centralWidget),
+                                   self.spinBoxMaxContentSize)
+
+        # Recherche de doublons parmi les fichiers retenus
+        self.checkBoxDuplicates = QCheckBox("Rechercher les doublons", self)
+        self.checkBoxDuplicates.setStyleSheet(self.get_checkbox_stylesheet())
+        self.optionalLayout.addRow(self.checkBoxDuplicates)
+
+        # Limites de la recherche
+        self.spinBoxMaxResults = QSpinBox(self)
+        self.spinBoxMaxResults.setRange(0, 10000000)
+        self.spinBoxMaxResults.setSpecialValueText("Illimité")
+        self.spinBoxMaxResults.setStyleSheet(self.get_input_stylesheet())
+        self.optionalLayout.addRow(QLabel("Nombre maximal de résultats :", self.centralWidget), self.spinBoxMaxResults)
+
+        self.spinBoxDeadline = QSpinBox(self)
+        self.spinBoxDeadline.setRange(0, 86400)
+        self.spinBoxDeadline.setSpecialValueText("Illimitée")
+        self.spinBoxDeadline.setStyleSheet(self.get_input_stylesheet())
+        self.optionalLayout.addRow(QLabel("Durée maximale (s) :", self.centralWidget), self.spinBoxDeadline)
+
+        # Taille du fichier
+        self.spinBoxMinSize = QSpinBox(self)
+        self.spinBoxMinSize.setMaximum(1000000)
+        self.spinBoxMinSize.setStyleSheet(self.get_input_stylesheet())
+        self.optionalLayout.addRow(QLabel("Taille minimale du fichier (Ko) :", self.centralWidget), self.spinBoxMinSize)
+
+        self.spinBoxMaxSize = QSpinBox(self)
+        self.spinBoxMaxSize.setMaximum(1000000)
+        self.spinBoxMaxSize.setValue(1000000)
+        self.spinBoxMaxSize.setStyleSheet(self.get_input_stylesheet())
+        self.optionalLayout.addRow(QLabel("Taille maximale du fichier (Ko) :", self.centralWidget), self.spinBoxMaxSize)
+
+        # Date de création
+        self.dateEditFrom = QDateEdit(self)
+        self.dateEditFrom.setCalendarPopup(True)
+        self.dateEditFrom.setDate(QDateTime.currentDateTime().date().addYears(-1))
+        self.dateEditFrom.setStyleSheet(self.get_input_stylesheet())
+        self.optionalLayout.addRow(QLabel("Date de création à partir de :", self.centralWidget), self.dateEditFrom)
+
+        self.dateEditTo = QDateEdit(self)
+        self.dateEditTo.setCalendarPopup(True)
+        self.dateEditTo.setDate(QDateTime.currentDateTime().date())
+        self.dateEditTo.setStyleSheet(self.get_input_stylesheet())
+        self.optionalLayout.addRow(QLabel("Date de création jusqu'à :", self.centralWidget), self.dateEditTo)
+
+        # Option de recherche non stricte
+        self.checkBoxLooseMatch = QCheckBox("Recherche non stricte du nom", self)
+        self.checkBoxLooseMatch.setStyleSheet(self.get_checkbox_stylesheet())
+        self.optionalLayout.addRow(self.checkBoxLooseMatch)
+
+        # Élagage du parcours : dossiers exclus, fichiers .gitignore, profondeur, systèmes de fichiers, liens
+        self.lineEditExclude = QLineEdit(self)
+        self.lineEditExclude.setPlaceholderText(".git, node_modules, __pycache__, .venv, build/")
+        self.lineEditExclude.setStyleSheet(self.get_input_stylesheet())
+        self.optionalLayout.addRow(QLabel("Exclure (motifs .gitignore) :", self.centralWidget), self.lineEditExclude)
+
+        self.checkBoxIgnoreFiles = QCheckBox("Respecter les fichiers .gitignore / .ignore", self)
+        self.checkBoxIgnoreFiles.setStyleSheet(self.get_checkbox_stylesheet())
+        self.optionalLayout.addRow(self.checkBoxIgnoreFiles)
+
+        self.spinBoxMaxDepth = QSpinBox(self)
+        self.spinBoxMaxDepth.setRange(-1, 1000)
+        self.spinBoxMaxDepth.setValue(-1)
+        self.spinBoxMaxDepth.setSpecialValueText("Illimitée")
+        self.spinBoxMaxDepth.setStyleSheet(self.get_input_stylesheet())
+        self.optionalLayout.addRow(QLabel("Profondeur maximale (0 : dossier seul) :", self.centralWidget),
+                                   self.spinBoxMaxDepth)
+
+        self.checkBoxOneFilesystem = QCheckBox("Rester sur le même système de fichiers (points de montage ignorés)", self)
+        self.checkBoxOneFilesystem.setStyleSheet(self.get_checkbox_stylesheet())
+        self.optionalLayout.addRow(self.checkBoxOneFilesystem)
+
+        self.checkBoxFollowSymlinks = QCheckBox("Suivre les liens symboliques vers des dossiers", self)
+        self.checkBoxFollowSymlinks.setStyleSheet(self.get_checkbox_stylesheet())
+        self.optionalLayout.addRow(self.checkBoxFollowSymlinks)
+
+        # Export des résultats pendant la recherche (CSV, JSON ou NDJSON d'après l'extension)
+        self.lineEditExport = QLineEdit(self)
+        self.lineEditExport.setPlaceholderText("Fichier .csv, .json ou .ndjson (optionnel)")
+        self.lineEditExport.setStyleSheet(self.get_input_stylesheet())
+        self.exportBrowseButton = QPushButton("…", self)
+        self.exportBrowseButton.setStyleSheet(self.get_button_stylesheet())
+        self.exportBrowseButton.clicked.connect(self.selectExportFile)
+        exportLayout = QHBoxLayout()
+        exportLayout.addWidget(self.lineEditExport)
+        exportLayout.addWidget(self.exportBrowseButton)
+        self.optionalLayout.addRow(QLabel("Exporter pendant la recherche :", self.centralWidget), exportLayout)
+
+        self.exportColumnCheckBoxes = {}
+        exportColumnsLayout = QHBoxLayout()
+        for column, label in EXPORT_COLUMNS.items():
+            checkBox = QCheckBox(label, self)
+            checkBox.setChecked(column != 'detail')
+            checkBox.setStyleSheet(self.get_checkbox_stylesheet())
+            self.exportColumnCheckBoxes[column] = checkBox
+            exportColumnsLayout.addWidget(checkBox)
+        self.optionalLayout.addRow(QLabel("Colonnes exportées :", self.centralWidget), exportColumnsLayout)
+
+        self.checkBoxExportOnly = QCheckBox("Export seul : ne pas garder les résultats en mémoire", self)
+        self.checkBoxExportOnly.setStyleSheet(self.get_checkbox_stylesheet())
+        self.optionalLayout.addRow(self.checkBoxExportOnly)
+
+        # Moteur de parcours
+        self.comboBoxBackend = QComboBox(self)
+        self.comboBoxBackend.setStyleSheet(self.get_input_stylesheet())
+        self.comboBoxBackend.addItems(list(BACKENDS))
+        self.comboBoxBackend.setCurrentText(DEFAULT_BACKEND)
+        self.optionalLayout.addRow(QLabel("Moteur de parcours :", self.centralWidget), self.comboBoxBackend)
+
+        # Nombre de threads du moteur parallèle
+        self.spinBoxWorkers = QSpinBox(self)
+        self.spinBoxWorkers.setRange(1, 128)
+        self.spinBoxWorkers.setValue(DEFAULT_WORKERS)
+        self.spinBoxWorkers.setStyleSheet(self.get_input_stylesheet())
+        self.optionalLayout.addRow(QLabel("Threads (parallèle) ou processus (process) :", self.centralWidget),
+                                   self.spinBoxWorkers)
+
+        # Index persistant des noms de fichiers
+        self.comboBoxIndexMode = QComboBox(self)
+        self.comboBoxIndexMode.setStyleSheet(self.get_input_stylesheet())
+        for mode, label in INDEX_MODES.items():
+            self.comboBoxIndexMode.addItem(label, mode)
+        self.optionalLayout.addRow(QLabel("Index persistant :", self.centralWidget), self.comboBoxIndexMode)
+
+        # Cache des recherches identiques (moteurs walk et scandir, sans index persistant) : désactivé par
+        # défaut, car il remplace le moteur choisi par son propre parcours
+        self.checkBoxResultCache = QCheckBox("Mémoriser les recherches (seuls les dossiers modifiés sont relus)", self)
+        self.checkBoxResultCache.setChecked(False)
+        self.checkBoxResultCache.setToolTip("Avec les moteurs walk et scandir, le parcours est alors fait par le cache "
+                                            "(séquentiel, type scandir) à la place du moteur choisi")
+        self.checkBoxResultCache.setStyleSheet(self.get_checkbox_stylesheet())
+        self.optionalLayout.addRow(self.checkBoxResultCache)
+
+        # Surveillance de la recherche terminée : seuls les écarts sont appliqués au tableau
+        self.comboBoxWatchMode = QComboBox(self)
+        self.comboBoxWatchMode.setStyleSheet(self.get_input_stylesheet())
+        for mode, label in WATCH_MODES.items():
+            self.comboBoxWatchMode.addItem(label, mode)
+        self.optionalLayout.addRow(QLabel("Surveiller la recherche terminée :", self.centralWidget), self.comboBoxWatchMode)
+
+        self.spinBoxWatchInterval = QSpinBox(self)
+        self.spinBoxWatchInterval.setRange(1, 24 * 60)
+        self.spinBoxWatchInterval.setValue(DEFAULT_INTERVAL // 60)
+        self.spinBoxWatchInterval.setStyleSheet(self.get_input_stylesheet())
+        self.optionalLayout.addRow(QLabel("Intervalle de vérification (min) :", self.centralWidget), self.spinBoxWatchInterval)
+
+        self.optionalGroupBox.setLayout(self.optionalLayout)
+        self.optionalGroupBox.setVisible(False)  # Cacher les options avancées par défaut
+        self.layout.insertWidget(self.advancedOptionsIndex, self.optionalGroupBox)
+
+    # Construit les options avancées si ce n'est pas encore fait (démarrage rapide)
+    def ensureAdvancedOptions(self):
+        if self.optionalGroupBox is None:
+            self.createAdvancedOptions()
 
     def createMenuBar(self):
         menuBar = QMenuBar(self)
@@ -257,6 +643,26 @@ class MainWindow(QMainWindow):
         loadSettingsAction.triggered.connect(self.loadSettings)
         fileMenu.addAction(loadSettingsAction)
 
+        fileMenu.addSeparator()
+
+        self.liveWatchAction = QAction("Surveiller les dossiers (index en direct)", self)
+        self.liveWatchAction.setCheckable(True)
+        self.liveWatchAction.toggled.connect(self.toggleLiveWatch)
+        fileMenu.addAction(self.liveWatchAction)
+
+        exportAction = QAction("Exporter les résultats...", self)
+        exportAction.triggered.connect(self.exportResults)
+        fileMenu.addAction(exportAction)
+
+        clearCacheAction = QAction("Vider le cache des recherches", self)
+        clearCacheAction.triggered.connect(self.clearResultCache)
+        fileMenu.addAction(clearCacheAction)
+
+        self.stopWatchAction = QAction("Arrêter la surveillance de la recherche", self)
+        self.stopWatchAction.setEnabled(False)
+        self.stopWatchAction.triggered.connect(self.stopSearchWatch)
+        fileMenu.addAction(self.stopWatchAction)
+
         themeMenu = menuBar.addMenu("Thème")
 
         lightThemeAction = QAction("Thème Clair", self)
@@ -286,12 +692,45 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.statusBar)
         self.statusBar.showMessage("Prêt")
 
+        self.watchStatusLabel = QLabel("")
+        self.statusBar.addPermanentWidget(self.watchStatusLabel)
+        self.watchStatusTimer = QTimer(self)
+        self.watchStatusTimer.setInterval(1000)
+        self.watchStatusTimer.timeout.connect(self.updateWatchStatus)
+
+    def loadHeaderImage(self):
+        pixmap = QtGui.QPixmap("image.png")
+        if pixmap.isNull():
+            print("Failed to load image")
+        else:
+            # Ajustement de la taille de l'image à une taille plus raisonnable
+            pixmap = pixmap.scaled(750, 750, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self.imageLabel.setPixmap(pixmap)
+
+    # Premier affichage : les étapes différées sont lancées une par une, sans bloquer la fenêtre
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.firstPaintDone:
+            self.firstPaintDone = True
+            startup_trace.mark("premier affichage")
+            QTimer.singleShot(0, self.runDeferredStep)
+
+    def runDeferredStep(self):
+        if self.deferredSteps:
+            step = self.deferredSteps.pop(0)
+            step()
+            startup_trace.mark(step.__name__)
+            QTimer.singleShot(0, self.runDeferredStep)
+        else:
+            startup_trace.mark("interface complète")
+
     def createSystemTray(self):
         self.trayIcon = QSystemTrayIcon(self)
         self.trayIcon.setIcon(self.style().standardIcon(QStyle.SP_ComputerIcon))
         self.trayIcon.show()
 
     def toggleAdvancedOptions(self):
+        self.ensureAdvancedOptions()
         if self.toggleAdvancedOptionsButton.isChecked():
             self.optionalGroupBox.setVisible(True)
             self.toggleAdvancedOptionsButton.setText("Masquer les options avancées")
@@ -443,7 +882,7 @@ class MainWindow(QMainWindow):
 
     def get_table_stylesheet(self):
         return """
-            QTableWidget {
+            QTableView {
                 background-color: #FFF1D3;
                 border: 1px solid #787406;
                 border-radius: 8px;
@@ -455,7 +894,7 @@ class MainWindow(QMainWindow):
                 padding: 5px;
                 border: 1px solid #2980b9;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 5px;
             }
         """
@@ -490,22 +929,47 @@ class MainWindow(QMainWindow):
                 animation.start(QPropertyAnimation.DeleteWhenStopped)
 
     def selectDirectories(self):
-        directories = QFileDialog.getExistingDirectory(self, "Sélectionner des dossiers", "", QFileDialog.ShowDirsOnly | QFileDialog.DontResolveSymlinks | QFileDialog.Option())
+        directories = QFileDialog.getExistingDirectory(self, "Sélectionner des dossiers", "",
+                                                       QFileDialog.ShowDirsOnly | QFileDialog.DontResolveSymlinks)
         if directories:
             self.selected_directories.append(directories)
             self.directoryListWidget.addItem(directories)
 
+    def selectExportFile(self):
+        file_name, _ = QFileDialog.getSaveFileName(self, "Exporter les résultats", "",
+                                                   "CSV (*.csv);;JSON (*.json);;NDJSON (*.ndjson)")
+        if file_name:
+            self.lineEditExport.setText(file_name)
+
+    def exportColumns(self):
+        self.ensureAdvancedOptions()
+        return [column for column, checkBox in self.exportColumnCheckBoxes.items() if checkBox.isChecked()]
+
+    # Exporte les résultats déjà affichés (dans l'ordre du tableau, filtre compris)
+    def exportResults(self):
+        file_name, _ = QFileDialog.getSaveFileName(self, "Exporter les résultats", "",
+                                                   "CSV (*.csv);;JSON (*.json);;NDJSON (*.ndjson)")
+        if not file_name:
+            return
+        from export import ResultExporter
+        try:
+            with ResultExporter(file_name, columns=self.exportColumns()) as exporter:
+                store = self.resultModel.store
+                for row in range(self.resultModel.rowCount()):
+                    i = self.resultModel.storeRow(row)
+                    exporter.write(store.path(i), store.sizes[i], store.mtimes[i], store.details.get(i))
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Erreur", f"Export impossible : {e}")
+            return
+        self.statusBar.showMessage(f"{exporter.count} résultats exportés vers {file_name}")
+
     def startSearch(self):
+        from pruning import PruneRules, parse_patterns
+        self.ensureAdvancedOptions()
         if not self.selected_directories:
             QMessageBox.warning(self, "Erreur", "Veuillez sélectionner au moins un dossier pour la recherche.")
             return
-        
-        self.disableInputs(True)
-        self.statusBar.showMessage("Recherche en cours...")
-        self.found_files.clear()
-        self.resultTable.setRowCount(0)
-        self.progressBar.setVisible(True)
-        self.progressBar.setRange(0, 0)
+        self.stopSearchWatch()
 
         fileName = self.lineEditFileName.text()
         fileFormat = self.comboBoxFileFormat.currentText() if self.comboBoxFileFormat.currentText() != "" else None
@@ -514,13 +978,71 @@ class MainWindow(QMainWindow):
         looseMatch = self.checkBoxLooseMatch.isChecked()
         dateFrom = self.dateEditFrom.date()
         dateTo = self.dateEditTo.date()
+        backend = self.comboBoxBackend.currentText()
+        workers = self.spinBoxWorkers.value()
+        index_mode = self.comboBoxIndexMode.currentData()
+        nameSyntax = self.comboBoxNameSyntax.currentData()
+        content = self.lineEditContent.text() or None
+        contentRegex = self.checkBoxContentRegex.isChecked()
+        maxContentSize = self.spinBoxMaxContentSize.value() * 1024 * 1024
+        duplicates = self.checkBoxDuplicates.isChecked()
+        max_results = self.spinBoxMaxResults.value()
+        deadline = self.spinBoxDeadline.value()
+        top_k = self.spinBoxTopK.value()
+        cache = self.searchCache()
+        max_depth = self.spinBoxMaxDepth.value()
+        prune = PruneRules(parse_patterns(self.lineEditExclude.text()), self.checkBoxIgnoreFiles.isChecked(),
+                           max_depth if max_depth >= 0 else None, self.checkBoxOneFilesystem.isChecked(),
+                           self.checkBoxFollowSymlinks.isChecked())
+
+        # Critères vérifiés (motif invalide...) avant d'ouvrir l'export : une erreur de saisie
+        # ne touche pas au fichier d'export existant
+        try:
+            search_thread = FileSearchThread(self.selected_directories, fileName, fileFormat, minSize, maxSize, looseMatch,
+                                             dateFrom, dateTo, backend, workers, index_mode,
+                                             batch_size=self.RESULT_BATCH_SIZE, nameSyntax=nameSyntax,
+                                             content=content, contentRegex=contentRegex, maxContentSize=maxContentSize,
+                                             duplicates=duplicates, max_results=max_results, deadline=deadline,
+                                             top_k=top_k, cache=cache, prune=prune)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Erreur", str(e))
+            return
+        export_path = self.lineEditExport.text().strip()
+        if export_path:
+            from export import ResultExporter
+            try:
+                search_thread.exporter = ResultExporter(export_path, columns=self.exportColumns())
+            except (OSError, ValueError) as e:
+                QMessageBox.warning(self, "Erreur", f"Export impossible : {e}")
+                return
+            search_thread.keep_results = not self.checkBoxExportOnly.isChecked()
 
-        self.search_thread = FileSearchThread(self.selected_directories, fileName, fileFormat, minSize, maxSize, looseMatch, dateFrom, dateTo)
-        self.search_thread.file_found_signal.connect(self.fileFound)
+        self.disableInputs(True)
+        if search_thread.cache is not None:
+            # Le moteur choisi est remplacé par le parcours du cache : on le dit
+            self.statusBar.showMessage(f"Recherche en cours (cache des recherches à la place du moteur {backend})...")
+        else:
+            self.statusBar.showMessage("Recherche en cours...")
+        self.resultModel.clear()
+        self.filterEngine.clear()
+        self.detailsCache.clear()
+        self.progressBar.setVisible(True)
+        self.progressBar.setRange(0, 0)
+        self.pushButtonPause.setText("Pause")
+        self.pushButtonPause.setVisible(True)
+        self.pushButtonStop.setVisible(True)
+        self.resultTable.setColumnHidden(ResultTableModel.COLUMN_DETAIL,
+                                         content is None and not duplicates and nameSyntax != 'fuzzy')
+
+        self.batch_stats = {"batches": 0, "gui_seconds": 0.0, "max_gui_seconds": 0.0}
+        self.search_thread = search_thread
+        self.search_thread.files_found_signal.connect(self.filesFound)
         self.search_thread.search_complete_signal.connect(self.searchComplete)
+        self.search_thread.progress_signal.connect(self.progressUpdated)
         self.search_thread.start()
 
     def disableInputs(self, disable):
+        self.ensureAdvancedOptions()
         self.lineEditFileName.setDisabled(disable)
         self.comboBoxFileFormat.setDisabled(disable)
         self.spinBoxMinSize.setDisabled(disable)
@@ -530,26 +1052,225 @@ class MainWindow(QMainWindow):
         self.selectDirButton.setDisabled(disable)
         self.dateEditFrom.setDisabled(disable)
         self.dateEditTo.setDisabled(disable)
+        self.comboBoxBackend.setDisabled(disable)
+        self.spinBoxWorkers.setDisabled(disable)
+        self.comboBoxIndexMode.setDisabled(disable)
+        self.comboBoxNameSyntax.setDisabled(disable)
+        self.spinBoxTopK.setDisabled(disable)
+        self.checkBoxResultCache.setDisabled(disable)
+        self.comboBoxWatchMode.setDisabled(disable)
+        self.spinBoxWatchInterval.setDisabled(disable)
+        self.lineEditExclude.setDisabled(disable)
+        self.checkBoxIgnoreFiles.setDisabled(disable)
+        self.spinBoxMaxDepth.setDisabled(disable)
+        self.checkBoxOneFilesystem.setDisabled(disable)
+        self.checkBoxFollowSymlinks.setDisabled(disable)
+        self.lineEditExport.setDisabled(disable)
+        self.exportBrowseButton.setDisabled(disable)
+        for checkBox in self.exportColumnCheckBoxes.values():
+            checkBox.setDisabled(disable)
+        self.checkBoxExportOnly.setDisabled(disable)
+        self.lineEditContent.setDisabled(disable)
+        self.checkBoxContentRegex.setDisabled(disable)
+        self.spinBoxMaxContentSize.setDisabled(disable)
+        self.checkBoxDuplicates.setDisabled(disable)
+        self.spinBoxMaxResults.setDisabled(disable)
+        self.spinBoxDeadline.setDisabled(disable)
+
+    # Applique un lot de résultats au tableau en une seule mise à jour
+    def filesFound(self, results):
+        start = time.perf_counter()
+        self.resultModel.appendRows(results)
+        self.filterEngine.add(self.resultModel.store)
+        elapsed = time.perf_counter() - start
+        self.batch_stats["batches"] += 1
+        self.batch_stats["gui_seconds"] += elapsed
+        self.batch_stats["max_gui_seconds"] = max(self.batch_stats["max_gui_seconds"], elapsed)
+
+    # Mesures de livraison : signaux par seconde côté recherche, temps passé par lot côté interface
+    def deliveryMetrics(self):
+        delivery = self.search_thread.delivery_stats
+        batches = self.batch_stats["batches"]
+        return {
+            "results": delivery["results"],
+            "signals": delivery["signals"],
+            "signals_per_second": delivery["signals"] / delivery["seconds"] if delivery["seconds"] else 0.0,
+            "batches": batches,
+            "gui_ms_per_batch": self.batch_stats["gui_seconds"] * 1000 / batches if batches else 0.0,
+            "max_gui_ms_per_batch": self.batch_stats["max_gui_seconds"] * 1000,
+        }
+
+    @staticmethod
+    def formatDuration(seconds):
+        seconds = int(seconds)
+        if seconds < 60:
+            return f"{seconds} s"
+        if seconds < 3600:
+            return f"{seconds // 60} min {seconds % 60:02d} s"
+        return f"{seconds // 3600} h {seconds % 3600 // 60:02d} min"
+
+    # Avancement de la recherche : barre déterminée dès que le total est estimé,
+    # débit et dossier courant dans la barre d'état, débit par racine en info-bulle
+    def progressUpdated(self, snapshot):
+        if not self.progressBar.isVisible():
+            return
+        if snapshot["fraction"] is None:
+            self.progressBar.setRange(0, 0)
+        else:
+            self.progressBar.setRange(0, 1000)
+            self.progressBar.setValue(int(snapshot["fraction"] * 1000))
+        self.progressBar.setToolTip("\n".join(
+            f"{root} : {stats['files']} fichiers, {stats['files_per_second']:.0f}/s"
+            for root, stats in snapshot["roots"].items()))
+        if self.search_thread.control.paused:
+            return
+        message = (f"Recherche en cours : {snapshot['dirs']} dossiers, {snapshot['files']} fichiers "
+                   f"({snapshot['entries_per_second']:.0f}/s)")
+        if snapshot["eta"] is not None:
+            message += f", reste environ {self.formatDuration(snapshot['eta'])}"
+        if snapshot["current_dir"]:
+            message += f" — {snapshot['current_dir']}"
+        self.statusBar.showMessage(message)
+
+    def cacheSummary(self):
+        delta = self.search_thread.cache_delta
+        if not delta:
+            return ""
+        return f", cache : {delta['dirs_reused']} dossiers réutilisés, {delta['dirs_rescanned']} relus"
+
+    # Cache des recherches si la case est cochée (créé au premier usage), sinon None
+    def searchCache(self):
+        if not self.checkBoxResultCache.isChecked():
+            return None
+        if self.resultCache is None:
+            from result_cache import ResultCache
+            self.resultCache = ResultCache()
+        return self.resultCache
+
+    def clearResultCache(self):
+        if self.resultCache is None:
+            self.statusBar.showMessage("Cache vidé (0 recherches réutilisées, 0 nouvelles)")
+            return
+        stats = self.resultCache.stats
+        self.resultCache.clear()
+        self.statusBar.showMessage(f"Cache vidé ({stats['hits']} recherches réutilisées, {stats['misses']} nouvelles)")
+
+    def togglePause(self):
+        control = self.search_thread.control
+        if control.paused:
+            self.search_thread.resume()
+            self.pushButtonPause.setText("Pause")
+            self.statusBar.showMessage("Recherche en cours...")
+        else:
+            self.search_thread.pause()
+            self.pushButtonPause.setText("Reprendre")
+            self.statusBar.showMessage(f"Recherche en pause : {self.search_thread.delivery_stats['results']} fichiers trouvés")
 
-    def fileFound(self, filePath):
-        self.found_files.append(filePath)
-        row_position = self.resultTable.rowCount()
-        self.resultTable.insertRow(row_position)
-        
-        icon = self.getFileIcon(filePath)
-        item = QTableWidgetItem(icon, filePath)
-        self.resultTable.setItem(row_position, 0, item)
+    def stopSearch(self):
+        self.search_thread.stop()
+        self.pushButtonPause.setVisible(False)
+        self.pushButtonStop.setVisible(False)
+        self.statusBar.showMessage("Arrêt de la recherche...")
 
     def searchComplete(self, files_found):
         self.progressBar.setVisible(False)
+        self.pushButtonPause.setVisible(False)
+        self.pushButtonStop.setVisible(False)
         self.disableInputs(False)
-        if not self.found_files:
-            self.lineEditFileName.setStyleSheet("border: 2px solid red;")
-            QMessageBox.warning(self, "Aucun Résultat", "Fichier non trouvé. Veuillez vérifier le nom et réessayer.")
-            self.statusBar.showMessage("Recherche terminée : aucun fichier trouvé")
+        reason = self.search_thread.control.reason
+        stopped = f" ({STOP_REASONS[reason]})" if reason else ""
+        # En export seul, le tableau reste vide : le nombre de résultats vient du thread
+        found = self.search_thread.delivery_stats["results"]
+        if self.search_thread.export_error is not None:
+            QMessageBox.warning(self, "Erreur", f"Erreur d'écriture de l'export : {self.search_thread.export_error}")
+        error = self.search_thread.error
+        if error is not None:
+            message = str(error) or type(error).__name__
+            self.statusBar.showMessage(f"Recherche interrompue par une erreur : {found} fichiers trouvés ({message})")
+            QMessageBox.warning(self, "Erreur", f"La recherche a échoué : {message}")
+            return
+        if found == 0:
+            self.statusBar.showMessage(f"Recherche terminée{stopped} : aucun fichier trouvé")
+            if reason != 'cancelled':
+                self.lineEditFileName.setStyleSheet("border: 2px solid red;")
+                QMessageBox.warning(self, "Aucun Résultat", "Fichier non trouvé. Veuillez vérifier le nom et réessayer.")
         else:
-            self.statusBar.showMessage("Recherche terminée : fichiers trouvés")
-            self.trayIcon.showMessage("File Finder", "Recherche terminée : fichiers trouvés", QSystemTrayIcon.Information, 5000)
+            metrics = self.deliveryMetrics()
+            progress = self.search_thread.progress.snapshot()
+            exporter = self.search_thread.exporter
+            exported = ""
+            if exporter is not None and self.search_thread.export_error is None:
+                exported = f", exportés vers {exporter.path}"
+            self.statusBar.showMessage(f"Recherche terminée{stopped} : {found} fichiers trouvés{exported} "
+                                       f"parmi {progress['files']} en {self.formatDuration(progress['elapsed'])} "
+                                       f"({progress['entries_per_second']:.0f}/s, {metrics['batches']} lots, "
+                                       f"{metrics['gui_ms_per_batch']:.1f} ms par lot{self.cacheSummary()})")
+            if self.trayIcon is not None:
+                self.trayIcon.showMessage("File Finder", "Recherche terminée : fichiers trouvés",
+                                          QSystemTrayIcon.Information, 5000)
+        self.startSearchWatch(reason)
+
+    # Surveille la recherche terminée si un mode est choisi. L'état de départ est celui du tableau :
+    # seules les vérifications suivantes relisent le disque, à travers le cache des recherches.
+    def startSearchWatch(self, reason):
+        if self.comboBoxWatchMode.currentData() == 'off':
+            return
+        if reason is not None or not self.search_thread.keep_results or self.search_thread.duplicateFinder is not None:
+            self.statusBar.showMessage(self.statusBar.currentMessage() +
+                                       " — surveillance impossible (recherche interrompue, export seul ou doublons)")
+            return
+        store = self.resultModel.store
+        snapshot = {store.path(i): (store.sizes[i], store.mtimes[i]) for i in range(len(store))}
+        cache = self.searchCache()
+        from search_watch import watch_from_settings
+        try:
+            watch = watch_from_settings(self.currentSettings(), cache, snapshot)
+        except ValueError as e:
+            QMessageBox.warning(self, "Erreur", str(e))
+            return
+        self.search_watch_thread = SearchWatchThread(watch)
+        self.search_watch_thread.delta_ready_signal.connect(self.searchWatchDelta)
+        self.search_watch_thread.start()
+        self.stopWatchAction.setEnabled(True)
+
+    def stopSearchWatch(self):
+        if self.search_watch_thread is None:
+            return
+        self.search_watch_thread.stop()
+        self.search_watch_thread.wait()
+        self.search_watch_thread = None
+        self.stopWatchAction.setEnabled(False)
+        self.statusBar.showMessage("Surveillance de la recherche arrêtée")
+
+    # Applique l'écart d'une vérification au tableau, sans le réinitialiser
+    def searchWatchDelta(self, delta):
+        checked = QDateTime.currentDateTime().toString("hh:mm:ss")
+        if not delta:
+            self.statusBar.showMessage(f"Surveillance : aucun changement (vérifié à {checked})")
+            return
+        model = self.resultModel
+        store = model.store
+        if delta.removed or delta.changed:
+            rows = {store.path(i): i for i in range(len(store))}
+            model.updateStoreRows([(rows[result.path], result.size, result.mtime, FileSearchThread.resultDetail(result))
+                                   for result in delta.changed if result.path in rows])
+            model.removeStoreRows([rows[path] for path in delta.removed if path in rows])
+            for path in delta.removed + [result.path for result in delta.changed]:
+                self.detailsCache.invalidate(path)
+        if delta.removed:
+            # Lignes renumérotées : le filtre repart du stockage
+            self.filterEngine.clear()
+        added = []
+        for result in delta.added:
+            detail = FileSearchThread.resultDetail(result)
+            row = (result.path, result.size, result.mtime)
+            added.append(row + (detail,) if detail else row)
+        model.appendRows(added)
+        self.filterEngine.add(store)
+        self.statusBar.showMessage(f"Surveillance : {delta.summary()} (vérifié à {checked})")
+        if self.trayIcon is not None:
+            self.trayIcon.showMessage("File Finder", f"Recherche surveillée : {delta.summary()}",
+                                      QSystemTrayIcon.Information, 5000)
 
     def switchTheme(self, theme):
         self.current_theme = theme
@@ -560,8 +1281,11 @@ class MainWindow(QMainWindow):
         elif theme == 'blue':
             self.setStyleSheet(self.blue_theme_stylesheet())
 
-    def saveSettings(self):
-        settings = {
+    # Paramètres de la recherche, tels qu'enregistrés (voir search_core.options_from_settings)
+    def currentSettings(self):
+        from pruning import parse_patterns
+        self.ensureAdvancedOptions()
+        return {
             "directories": self.selected_directories,
             "fileName": self.lineEditFileName.text(),
             "fileFormat": self.comboBoxFileFormat.currentText(),
@@ -569,8 +1293,33 @@ class MainWindow(QMainWindow):
             "maxSize": self.spinBoxMaxSize.value(),
             "looseMatch": self.checkBoxLooseMatch.isChecked(),
             "dateFrom": self.dateEditFrom.date().toString(Qt.ISODate),
-            "dateTo": self.dateEditTo.date().toString(Qt.ISODate)
+            "dateTo": self.dateEditTo.date().toString(Qt.ISODate),
+            "backend": self.comboBoxBackend.currentText(),
+            "workers": self.spinBoxWorkers.value(),
+            "indexMode": self.comboBoxIndexMode.currentData(),
+            "nameSyntax": self.comboBoxNameSyntax.currentData(),
+            "content": self.lineEditContent.text(),
+            "contentRegex": self.checkBoxContentRegex.isChecked(),
+            "maxContentSize": self.spinBoxMaxContentSize.value(),
+            "duplicates": self.checkBoxDuplicates.isChecked(),
+            "maxResults": self.spinBoxMaxResults.value(),
+            "deadline": self.spinBoxDeadline.value(),
+            "topK": self.spinBoxTopK.value(),
+            "resultCache": self.checkBoxResultCache.isChecked(),
+            "exclude": parse_patterns(self.lineEditExclude.text()),
+            "ignoreFiles": self.checkBoxIgnoreFiles.isChecked(),
+            "maxDepth": self.spinBoxMaxDepth.value() if self.spinBoxMaxDepth.value() >= 0 else None,
+            "oneFilesystem": self.checkBoxOneFilesystem.isChecked(),
+            "followSymlinks": self.checkBoxFollowSymlinks.isChecked(),
+            "exportPath": self.lineEditExport.text(),
+            "exportColumns": self.exportColumns(),
+            "exportOnly": self.checkBoxExportOnly.isChecked(),
+            "watchMode": self.comboBoxWatchMode.currentData(),
+            "watchInterval": self.spinBoxWatchInterval.value()
         }
+
+    def saveSettings(self):
+        settings = self.currentSettings()
         file_name, _ = QFileDialog.getSaveFileName(self, "Sauvegarder les paramètres", "", "JSON Files (*.json)")
         if file_name:
             with open(file_name, 'w') as file:
@@ -582,6 +1331,9 @@ class MainWindow(QMainWindow):
         if file_name:
             with open(file_name, 'r') as file:
                 settings = json.load(file)
+                self.ensureAdvancedOptions()
+                from search_core import DEFAULT_TOP_K
+                from search_watch import DEFAULT_INTERVAL
                 self.selected_directories = settings["directories"]
                 self.directoryListWidget.clear()
                 self.directoryListWidget.addItems(self.selected_directories)
@@ -592,6 +1344,34 @@ class MainWindow(QMainWindow):
                 self.checkBoxLooseMatch.setChecked(settings["looseMatch"])
                 self.dateEditFrom.setDate(QDateTime.fromString(settings["dateFrom"], Qt.ISODate).date())
                 self.dateEditTo.setDate(QDateTime.fromString(settings["dateTo"], Qt.ISODate).date())
+                self.comboBoxBackend.setCurrentText(settings.get("backend", DEFAULT_BACKEND))
+                self.spinBoxWorkers.setValue(settings.get("workers", DEFAULT_WORKERS))
+                self.comboBoxIndexMode.setCurrentIndex(
+                    max(0, self.comboBoxIndexMode.findData(settings.get("indexMode", 'off'))))
+                self.comboBoxNameSyntax.setCurrentIndex(
+                    max(0, self.comboBoxNameSyntax.findData(settings.get("nameSyntax", 'text'))))
+                self.lineEditContent.setText(settings.get("content", ""))
+                self.checkBoxContentRegex.setChecked(settings.get("contentRegex", False))
+                self.spinBoxMaxContentSize.setValue(settings.get("maxContentSize", DEFAULT_MAX_FILE_SIZE // (1024 * 1024)))
+                self.checkBoxDuplicates.setChecked(settings.get("duplicates", False))
+                self.spinBoxMaxResults.setValue(settings.get("maxResults", 0))
+                self.spinBoxDeadline.setValue(settings.get("deadline", 0))
+                self.spinBoxTopK.setValue(settings.get("topK", DEFAULT_TOP_K))
+                self.checkBoxResultCache.setChecked(settings.get("resultCache", False))
+                self.lineEditExclude.setText(", ".join(settings.get("exclude", [])))
+                self.checkBoxIgnoreFiles.setChecked(settings.get("ignoreFiles", False))
+                max_depth = settings.get("maxDepth")
+                self.spinBoxMaxDepth.setValue(max_depth if max_depth is not None else -1)
+                self.checkBoxOneFilesystem.setChecked(settings.get("oneFilesystem", False))
+                self.checkBoxFollowSymlinks.setChecked(settings.get("followSymlinks", False))
+                self.lineEditExport.setText(settings.get("exportPath", ""))
+                exportColumns = settings.get("exportColumns", ['size', 'mtime', 'type'])
+                for column, checkBox in self.exportColumnCheckBoxes.items():
+                    checkBox.setChecked(column in exportColumns)
+                self.checkBoxExportOnly.setChecked(settings.get("exportOnly", False))
+                self.comboBoxWatchMode.setCurrentIndex(
+                    max(0, self.comboBoxWatchMode.findData(settings.get("watchMode", 'off'))))
+                self.spinBoxWatchInterval.setValue(int(settings.get("watchInterval", DEFAULT_INTERVAL // 60)))
             QMessageBox.information(self, "Succès", "Paramètres chargés avec succès.")
 
     def switchLanguage(self, language_code):
@@ -604,6 +1384,7 @@ class MainWindow(QMainWindow):
         self.retranslateUi()
 
     def retranslateUi(self):
+        self.ensureAdvancedOptions()
         self.setWindowTitle("File Finder - Recherche intelligente de fichiers")
         self.labelTitle.setText("File Finder")
         self.labelSubtitle.setText("Recherche intelligente et rapide de vos fichiers")
@@ -611,27 +1392,65 @@ class MainWindow(QMainWindow):
         self.lineEditFileName.setPlaceholderText("Entrez le nom du fichier...")
         self.optionalGroupBox.setTitle("Options avancées")
         self.pushButtonSearch.setText("Chercher")
+        self.pushButtonStop.setText("Arrêter")
         self.filterLineEdit.setPlaceholderText("Filtrer les résultats...")
-        self.resultTable.setHorizontalHeaderLabels(["Chemin des fichiers"])
+        self.resultModel.headerDataChanged.emit(Qt.Horizontal, 0, self.resultModel.columnCount() - 1)
         self.detailsGroupBox.setTitle("Détails du fichier")
         self.statusBar.showMessage("Prêt")
 
+    def toggleLiveWatch(self, enabled):
+        if enabled:
+            import watcher  # ctypes/inotify : chargé seulement à la première surveillance
+            if not watcher.is_supported():
+                QMessageBox.warning(self, "Erreur", "La surveillance en direct nécessite Linux (inotify).")
+                self.liveWatchAction.setChecked(False)
+                return
+            if not self.selected_directories:
+                QMessageBox.warning(self, "Erreur", "Veuillez sélectionner au moins un dossier à surveiller.")
+                self.liveWatchAction.setChecked(False)
+                return
+            self.index_watcher = watcher.InotifyWatcher(self.selected_directories, on_change=self.invalidateDetails)
+            self.index_watcher.start()
+            self.watchStatusTimer.start()
+        else:
+            self.stopLiveWatch()
+        self.updateWatchStatus()
+
+    def stopLiveWatch(self):
+        self.watchStatusTimer.stop()
+        if self.index_watcher is not None:
+            self.index_watcher.stop()
+            self.index_watcher.join()
+            self.index_watcher = None
+
+    def updateWatchStatus(self):
+        if self.index_watcher is None:
+            self.watchStatusLabel.setText("")
+            return
+        stats = self.index_watcher.stats()
+        self.watchStatusLabel.setText(f"Surveillance : {stats['watches']} dossiers, "
+                                      f"{stats['events']} événements, retard {stats['last_lag'] * 1000:.0f} ms")
+
     def closeEvent(self, event):
         if hasattr(self, 'search_thread') and self.search_thread.isRunning():
             self.search_thread.stop()
             self.search_thread.wait()
+        self.stopSearchWatch()
+        self.stopLiveWatch()
+        self.filterThread.stop()
+        self.filterThread.wait()
+        self.detailsThread.stop()
+        self.detailsThread.wait()
         event.accept()
 
     def getFileIcon(self, filePath):
-        mime_type, _ = mimetypes.guess_type(filePath)
-        if mime_type:
-            if mime_type.startswith("image"):
-                return QIcon("path/to/image/icon.png")
-            elif mime_type.startswith("text"):
-                return QIcon("path/to/text/icon.png")
-            elif mime_type.startswith("application/pdf"):
-                return QIcon("path/to/pdf/icon.png")
-        return QIcon("path/to/default/icon.png")
+        return self.resultModel.typeIcon(file_type_code(filePath))
+
+    def selectedFilePath(self):
+        index = self.resultTable.currentIndex()
+        if not index.isValid():
+            return None
+        return self.resultModel.path(index.row())
 
     def showContextMenu(self, position):
         menu = QMenu()
@@ -649,49 +1468,91 @@ class MainWindow(QMainWindow):
             self.copyFilePath()
 
     def openFile(self):
-        selected_item = self.resultTable.currentItem()
-        if selected_item:
-            QDesktopServices.openUrl(QUrl.fromLocalFile(selected_item.text()))
+        file_path = self.selectedFilePath()
+        if file_path:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(file_path))
 
     def openContainingFolder(self):
-        selected_item = self.resultTable.currentItem()
-        if selected_item:
-            folder_path = os.path.dirname(selected_item.text())
+        file_path = self.selectedFilePath()
+        if file_path:
+            folder_path = os.path.dirname(file_path)
             QDesktopServices.openUrl(QUrl.fromLocalFile(folder_path))
 
     def copyFilePath(self):
-        selected_item = self.resultTable.currentItem()
-        if selected_item:
+        file_path = self.selectedFilePath()
+        if file_path:
             clipboard = QApplication.clipboard()
-            clipboard.setText(selected_item.text())
+            clipboard.setText(file_path)
 
     def filterResults(self, text):
-        for row in range(self.resultTable.rowCount()):
-            item = self.resultTable.item(row, 0)
-            if text.lower() in item.text().lower():
-                self.resultTable.setRowHidden(row, False)
-            else:
-                self.resultTable.setRowHidden(row, True)
+        self.filterTimer.start()
 
-    def displayFileDetails(self):
-        selected_item = self.resultTable.currentItem()
-        if selected_item:
-            file_path = selected_item.text()
-            file_info = os.stat(file_path)
+    def applyFilter(self):
+        text = self.filterLineEdit.text().lower()
+        if not text:
+            self.resultModel.setFilterMask(None)
+            return
+        self.filterThread.requestFilter(text)
 
-            self.filePathLabel.setText(file_path)
-            self.fileSizeLabel.setText(f"{file_info.st_size / 1024:.2f} Ko")
-            self.fileCreatedLabel.setText(QDateTime.fromSecsSinceEpoch(int(file_info.st_ctime)).toString(Qt.DefaultLocaleLongDate))
-            self.fileModifiedLabel.setText(QDateTime.fromSecsSinceEpoch(int(file_info.st_mtime)).toString(Qt.DefaultLocaleLongDate))
+    def filterReady(self, mask, text, generation):
+        # Résultat périmé : la saisie ou les résultats ont changé entre-temps
+        if generation != self.filterEngine.generation or text != self.filterLineEdit.text().lower():
+            return
+        self.resultModel.setFilterMask(mask, lambda path: text in path.lower())
 
+    # Affiche tout de suite ce que la recherche connaît déjà (taille, date de modification) ;
+    # le stat est fait par detailsThread, sans bloquer l'interface sur un partage lent
+    def displayFileDetails(self):
+        index = self.resultTable.currentIndex()
+        if not index.isValid():
+            return
+        file_path, file_size, file_mtime = self.resultModel.fileInfo(index.row())
+        details = self.detailsThread.requestDetails(file_path)
+        if details is not None:
+            self.showFileDetails(details)
+            return
+        self.filePathLabel.setText(file_path)
+        self.fileSizeLabel.setText(f"{file_size / 1024:.2f} Ko")
+        self.fileCreatedLabel.setText("…")
+        self.fileModifiedLabel.setText(QDateTime.fromSecsSinceEpoch(int(file_mtime)).toString(Qt.DefaultLocaleLongDate))
+        self.fileTypeLabel.setText("…")
+
+    def showFileDetails(self, details):
+        self.filePathLabel.setText(details.path)
+        self.fileTypeLabel.setText(details.mime or "inconnu")
+        if details.error is not None:
+            self.fileSizeLabel.setText("")
+            self.fileCreatedLabel.setText(f"illisible ({details.error})")
+            self.fileModifiedLabel.setText("")
+            return
+        self.fileSizeLabel.setText(f"{details.size / 1024:.2f} Ko")
+        self.fileCreatedLabel.setText(QDateTime.fromSecsSinceEpoch(int(details.ctime)).toString(Qt.DefaultLocaleLongDate))
+        self.fileModifiedLabel.setText(QDateTime.fromSecsSinceEpoch(int(details.mtime)).toString(Qt.DefaultLocaleLongDate))
+
+    # Détails lus en arrière-plan : affichés seulement si la ligne est toujours sélectionnée
+    def detailsReady(self, details):
+        if details.path == self.selectedFilePath():
+            self.showFileDetails(details)
+
+    # Appelé par la surveillance en direct (depuis son thread) pour les chemins modifiés
+    def invalidateDetails(self, paths):
+        for path in paths:
+            self.detailsCache.invalidate(path)
+            self.detailsCache.invalidate_tree(path)
+
+# Options : --full-start construit toute l'interface avant le premier affichage (animations comprises),
+# --trace-startup affiche la durée de chaque étape du démarrage (voir startup_trace.py)
 def main():
+    fast_start = "--full-start" not in sys.argv
     app = QApplication(sys.argv)
+    startup_trace.mark("QApplication créée")
 
     translator = QTranslator()
     translator.load(QLibraryInfo.location(QLibraryInfo.TranslationsPath) + "/qt_fr.qm")
     app.installTranslator(translator)
 
-    window = MainWindow()
+    window = MainWindow(fast_start=fast_start)
+    startup_trace.mark("fenêtre construite")
     window.show()
     sys.exit(app.exec_())
 
@@ -0,0 +1,280 @@
+import os
+import queue
+import time
+
+from traversal import BACKENDS, Backend, ScandirBackend, list_dir
+
+# Moteur multiprocessus : parcours et correspondance dans des processus séparés, hors du GIL.
+# L'arborescence est découpée par sous-dossiers de premier niveau (et du niveau suivant s'il y en
+# a trop peu pour occuper tous les processus) ; chaque processus prend les sous-arborescences
+# dans une file commune, les parcourt comme le moteur scandir, applique le nom (name_filter),
+# fait le stat et applique taille et date (meta_filter). Seuls les fichiers retenus reviennent,
+# par lots compacts de tuples (chemin, nom, taille, date) dans une file bornée (tube) :
+# si l'interface est en pause, les processus se bloquent dès que la file est pleine.
+# L'arrêt est propagé à tous les processus par un événement partagé, consulté toutes les
+# STOP_CHECK_INTERVAL entrées.
+# Avec les liens symboliques suivis, chaque processus ne connaît que les dossiers qu'il a visités :
+# un même dossier peut être parcouru par deux processus (lien et cible dans deux sous-arborescences).
+# Les lots indiquent alors l'identité (périphérique, inode) des dossiers de leurs fichiers et le
+# processus principal ne garde, pour chaque dossier, que les fichiers d'un seul chemin.
+# Processus lancés en mode « spawn » (sûr depuis un programme multithread) : le démarrage coûte
+# quelques dizaines de millisecondes, ce moteur vise les grandes arborescences en cache.
+
+BATCH_SIZE = 512
+SEND_INTERVAL = 0.2
+STOP_CHECK_INTERVAL = 256
+SPLIT_FACTOR = 4
+MAX_SPLIT_DEPTH = 3
+
+
+# Entrée déjà « stat-ée » par un processus de parcours (équivalent minimal d'un os.DirEntry)
+class ScanEntry:
+    __slots__ = ('path', 'name', 'st_size', 'st_mtime')
+
+    def __init__(self, path, name, size, mtime):
+        self.path = path
+        self.name = name
+        self.st_size = size
+        self.st_mtime = mtime
+
+    def stat(self, follow_symlinks=True):
+        return self
+
+    def is_dir(self, follow_symlinks=True):
+        return False
+
+    def is_file(self, follow_symlinks=True):
+        return True
+
+
+# Compte les dossiers lus par un processus, transmis avec chaque lot
+class _Counter:
+    def __init__(self):
+        self.dirs = 0
+        self.files = 0
+        self.current_dir = None
+
+    def enter_dir(self, path):
+        self.current_dir = path
+
+    def dir_done(self, path, files, dirs=1):
+        self.dirs += dirs
+        self.files += files
+
+
+# Fichier d'un dossier déjà parcouru par un autre chemin (lien symbolique suivi) ? Le premier
+# chemin qui livre des fichiers d'un dossier en devient le propriétaire (owners).
+def _seen_elsewhere(owners, identities, path):
+    directory = os.path.dirname(path)
+    identity = identities.get(directory)
+    return identity is not None and owners.setdefault(identity, directory) != directory
+
+
+# Lots d'un processus de parcours : nom (name_filter), stat, taille et date (meta_filter) y sont
+# appliqués. Message : (résultats, dossiers lus, fichiers vus, dernier dossier, identités des
+# dossiers des résultats) depuis le message précédent.
+class _Batcher:
+    def __init__(self, results, counter, name_filter, meta_filter, follow_symlinks):
+        self.results = results
+        self.counter = counter
+        self.name_filter = name_filter
+        self.meta_filter = meta_filter
+        self.follow_symlinks = follow_symlinks
+        self.batch = []
+        self.known = {}
+        self.identities = {}
+        self.last_send = time.monotonic()
+
+    def offer(self, entry):
+        if self.name_filter is not None and not self.name_filter(entry.name):
+            return
+        try:
+            file_stat = entry.stat()
+        except OSError:
+            return
+        if self.meta_filter is None or self.meta_filter(file_stat.st_size, file_stat.st_mtime):
+            self.add(entry, file_stat)
+        self.tick()
+
+    def add(self, entry, file_stat):
+        if self.follow_symlinks:
+            self.identify(os.path.dirname(entry.path))
+        self.batch.append((entry.path, entry.name, file_stat.st_size, file_stat.st_mtime))
+        if len(self.batch) >= BATCH_SIZE:
+            self.send()
+
+    # (périphérique, inode) du dossier d'un fichier retenu, si les liens symboliques sont suivis
+    def identify(self, directory):
+        identity = self.known.get(directory)
+        if identity is None:
+            try:
+                dir_stat = os.stat(directory)
+            except OSError:
+                return
+            identity = self.known[directory] = (dir_stat.st_dev, dir_stat.st_ino)
+        self.identities[directory] = identity
+
+    # Envoie le lot en attente si SEND_INTERVAL est écoulé, même sans nouveau résultat
+    def tick(self):
+        if time.monotonic() - self.last_send >= SEND_INTERVAL:
+            self.send()
+
+    def flush(self):
+        if self.batch or self.counter.dirs:
+            self.send()
+
+    def send(self):
+        counter = self.counter
+        self.results.put((self.batch, counter.dirs, counter.files, counter.current_dir, self.identities))
+        self.batch = []
+        self.identities = {}
+        counter.dirs = counter.files = 0
+        self.last_send = time.monotonic()
+
+
+def _scan_worker(tasks, results, stop, name_filter, meta_filter, prune):
+    backend = ScandirBackend()
+    backend.prune = prune
+    counter = backend.progress = _Counter()
+    batcher = _Batcher(results, counter, name_filter, meta_filter, prune is not None and prune.follow_symlinks)
+    checks = 0
+
+    def is_running():
+        nonlocal checks
+        checks += 1
+        return checks % STOP_CHECK_INTERVAL != 0 or not stop.is_set()
+
+    try:
+        while not stop.is_set():
+            task = tasks.get()
+            if task is None:
+                break
+            for entry in backend.iter_tree(*task, is_running):
+                batcher.offer(entry)
+            batcher.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        results.put(None)
+
+
+class ProcessScanBackend(Backend):
+    name = 'process'
+    parallel = True
+
+    def __init__(self, workers=None):
+        self.processes = max(1, min(workers or os.cpu_count() or 1, os.cpu_count() or 1))
+
+    def iter_files(self, rootDir, is_running=lambda: True):
+        return self.iter_roots([rootDir], is_running)
+
+    # Découpe les racines en sous-arborescences (tâches) ; les fichiers des niveaux lus pour
+    # ce découpage sont produits directement. Renvoie la liste des tâches (dossier, état d'élagage).
+    # owners : (périphérique, inode) -> chemin des dossiers lus, si les liens symboliques sont suivis
+    def _split(self, directories, local, owners, is_running):
+        prune = self.prune
+        level = []
+        for rootDir in directories:
+            state = prune.root(rootDir) if prune is not None else None
+            if prune is None or state is not None:
+                level.append((rootDir, state))
+        for _ in range(MAX_SPLIT_DEPTH):
+            if len(level) >= self.processes * SPLIT_FACTOR:
+                break
+            next_level = []
+            for path, state in level:
+                if not is_running():
+                    return []
+                self._split_dir(path, state, next_level, local, owners)
+            level = next_level
+            if not level:
+                break
+        return level
+
+    # Lit un dossier du découpage : ses fichiers vont dans local, ses sous-dossiers dans next_level
+    def _split_dir(self, path, state, next_level, local, owners):
+        if self.progress is not None:
+            self.progress.enter_dir(path)
+        subdirs = []
+        try:
+            if self.prune is not None and self.prune.follow_symlinks:
+                dir_stat = os.stat(path)
+                owners.setdefault((dir_stat.st_dev, dir_stat.st_ino), path)
+            files = list(list_dir(path, self.prune, state, subdirs))
+        except OSError:
+            return
+        local.extend(files)
+        next_level.extend(subdirs)
+        if self.progress is not None:
+            self.progress.dir_done(path, len(files))
+
+    def iter_roots(self, directories, is_running=lambda: True):
+        if not directories:
+            return
+        local = []
+        owners = {}
+        tasks = self._split(directories, local, owners, is_running)
+        # Fichiers des premiers niveaux, lus pendant le découpage : le nom est vérifié par l'appelant
+        for entry in local:
+            if not is_running():
+                return
+            yield entry
+        if not tasks:
+            return
+        import multiprocessing
+        context = multiprocessing.get_context('spawn')
+        task_queue = context.Queue()
+        results = context.Queue(maxsize=self.processes * 4)
+        stop = context.Event()
+        for task in tasks:
+            task_queue.put(task)
+        processes = min(self.processes, len(tasks))
+        for _ in range(processes):
+            task_queue.put(None)
+        workers = [context.Process(target=_scan_worker, daemon=True,
+                                   args=(task_queue, results, stop, self.name_filter, self.meta_filter, self.prune))
+                   for _ in range(processes)]
+        for worker in workers:
+            worker.start()
+        progress = self.progress
+        finished = 0
+        try:
+            while finished < len(workers):
+                if not is_running():
+                    return
+                try:
+                    message = results.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if message is None:
+                    finished += 1
+                    continue
+                rows, dirs, files, current_dir, identities = message
+                if progress is not None and current_dir is not None:
+                    progress.enter_dir(current_dir)
+                    progress.dir_done(current_dir, files, dirs)
+                for path, name, size, mtime in rows:
+                    if not is_running():
+                        return
+                    if identities and _seen_elsewhere(owners, identities, path):
+                        continue
+                    yield ScanEntry(path, name, size, mtime)
+        finally:
+            # Arrêt demandé ou générateur abandonné : tous les processus s'arrêtent ; la file
+            # de résultats est vidée pour débloquer ceux qui attendent de pouvoir écrire
+            stop.set()
+            deadline = time.monotonic() + 2.0
+            while any(worker.is_alive() for worker in workers) and time.monotonic() < deadline:
+                try:
+                    results.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+                worker.join()
+            task_queue.cancel_join_thread()
+            results.cancel_join_thread()
+
+
+BACKENDS[ProcessScanBackend.name] = ProcessScanBackend
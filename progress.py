@@ -0,0 +1,220 @@
+import copy
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from file_index import DEFAULT_INDEX_PATH, FileIndex
+from traversal import list_dir
+
+# Suivi de l'avancement d'un parcours : dossiers et fichiers visités, débit, dossier courant,
+# estimation du total et temps restant, globalement et par dossier racine (pour repérer
+# les racines ou points de montage lents).
+# Les moteurs de parcours appellent enter_dir() puis dir_done() pour chaque dossier lu ;
+# on_update(snapshot) est appelé au plus une fois par intervalle, depuis le thread qui parcourt.
+#
+# Le total est estimé, dans un thread à part, à partir de l'index persistant s'il couvre déjà
+# toutes les racines, sinon par sondage : descentes aléatoires depuis chaque racine (estimateur
+# de Knuth), chaque niveau comptant pour le produit des nombres de sous-dossiers traversés.
+# Le sondage applique les mêmes règles d'élagage que le parcours ; l'index, qui les ignore,
+# n'est alors pas utilisé. Un moteur qui connaît son total (mode index) le donne par set_total().
+
+UPDATE_INTERVAL = 0.25
+SAMPLE_PROBES = 100000
+SAMPLE_BUDGET = 0.3
+
+
+# Sous-dossiers (chemin, état d'élagage) et nombre de fichiers retenus d'un dossier
+def _list_dir(path, prune=None, state=None):
+    subdirs = []
+    files = 0
+    try:
+        for _ in list_dir(path, prune, state, subdirs):
+            files += 1
+    except OSError:
+        pass
+    return subdirs, files
+
+
+# Estimation du nombre de fichiers sous rootDir par descentes aléatoires, en temps limité.
+# Les listages sont mis en cache : les premiers niveaux, communs à toutes les descentes, ne sont lus qu'une fois.
+# prune (pruning.PruneRules, facultatif) : une copie est utilisée, pour ne pas marquer comme visités
+# les dossiers que le parcours doit encore lire.
+def estimate_files(rootDir, probes=SAMPLE_PROBES, budget=SAMPLE_BUDGET, is_running=lambda: True, rng=None,
+                   prune=None):
+    rng = rng or random.Random(0)
+    state = None
+    if prune is not None:
+        prune = copy.copy(prune)
+        state = prune.root(rootDir)
+        if state is None:
+            return 0
+    listings = {}
+    estimates = []
+    deadline = time.monotonic() + budget
+    for _ in range(probes):
+        if not is_running() or (estimates and time.monotonic() >= deadline):
+            break
+        path, path_state = rootDir, state
+        weight = 1
+        total = 0
+        while True:
+            listing = listings.get(path)
+            if listing is None:
+                listing = listings[path] = _list_dir(path, prune, path_state)
+            subdirs, files = listing
+            total += weight * files
+            if not subdirs:
+                break
+            weight *= len(subdirs)
+            path, path_state = rng.choice(subdirs)
+        estimates.append(total)
+    return sum(estimates) / len(estimates) if estimates else 0
+
+
+# Nombre de fichiers connu de l'index persistant, si toutes les racines y sont déjà ;
+# l'index n'est pas créé s'il n'existe pas
+def indexed_files(directories, db_path=DEFAULT_INDEX_PATH):
+    if not os.path.exists(db_path):
+        return None
+    try:
+        index = FileIndex(db_path)
+    except sqlite3.Error:
+        return None
+    try:
+        if not all(index.is_indexed(rootDir) for rootDir in directories):
+            return None
+        return index.count_files(directories)
+    finally:
+        index.close()
+
+
+class RootProgress:
+    __slots__ = ('dirs', 'files', 'first', 'last')
+
+    def __init__(self):
+        self.dirs = 0
+        self.files = 0
+        self.first = None
+        self.last = None
+
+
+class ProgressTracker:
+    def __init__(self, directories, on_update=None, interval=UPDATE_INTERVAL):
+        self.roots = [os.path.normpath(d) for d in directories]
+        self.on_update = on_update
+        self.interval = interval
+        self.dirs = 0
+        self.files = 0
+        self.current_dir = None
+        self.estimated_total = None
+        self.estimate_source = None
+        self._exact_total = False
+        self.started = time.monotonic()
+        self.finished = None
+        self._per_root = {root: RootProgress() for root in self.roots}
+        self._lock = threading.Lock()
+        self._next_update = 0.0
+
+    def start(self):
+        self.started = time.monotonic()
+
+    def _root_of(self, path):
+        best = None
+        for root in self.roots:
+            if (path == root or path.startswith(root.rstrip(os.sep) + os.sep)) and (best is None or len(root) > len(best)):
+                best = root
+        return best
+
+    def enter_dir(self, path):
+        self.current_dir = path
+        self._maybe_update()
+
+    # Appelé par les moteurs (éventuellement depuis plusieurs threads) après la lecture d'un dossier ;
+    # dirs > 1 : bilan groupé de plusieurs dossiers (moteur multiprocessus), path étant le dernier lu
+    def dir_done(self, path, files, dirs=1):
+        now = time.monotonic()
+        root = self._per_root.get(self._root_of(path))
+        with self._lock:
+            self.dirs += dirs
+            self.files += files
+            if root is not None:
+                root.dirs += dirs
+                root.files += files
+                if root.first is None:
+                    root.first = now
+                root.last = now
+        self._maybe_update(now)
+
+    def _maybe_update(self, now=None):
+        if self.on_update is None:
+            return
+        now = now or time.monotonic()
+        if now >= self._next_update:
+            self._next_update = now + self.interval
+            self.on_update(self.snapshot(now))
+
+    def finish(self):
+        self.finished = time.monotonic()
+        if self.on_update is not None:
+            self.on_update(self.snapshot(self.finished))
+
+    # Total exact fourni par le moteur ; l'estimation en cours, s'il y en a une, est alors ignorée
+    def set_total(self, total, source):
+        self.estimated_total = int(total)
+        self.estimate_source = source
+        self._exact_total = True
+
+    # Estimation du total dans un thread à part : l'index s'il couvre les racines (et qu'aucune règle
+    # d'élagage ne s'applique), sinon le sondage
+    def estimate_async(self, db_path=DEFAULT_INDEX_PATH, is_running=lambda: True, prune=None):
+        def estimate():
+            total = indexed_files(self.roots, db_path) if prune is None else None
+            source = 'index'
+            if total is None:
+                total = 0
+                for root in self.roots:
+                    total += estimate_files(root, is_running=is_running, prune=prune)
+                source = 'sampling'
+            if not self._exact_total:
+                self.estimated_total = int(total)
+                self.estimate_source = source
+        thread = threading.Thread(target=estimate, daemon=True)
+        thread.start()
+        return thread
+
+    def snapshot(self, now=None):
+        now = now or time.monotonic()
+        elapsed = (self.finished or now) - self.started
+        files = self.files
+        rate = files / elapsed if elapsed > 0 else 0.0
+        total = self.estimated_total
+        fraction = eta = None
+        if self.finished is not None:
+            fraction, eta = 1.0, 0.0
+        elif total:
+            # Estimation dépassée : on suppose qu'il reste encore un peu de travail
+            total = max(total, int(files * 1.05))
+            fraction = files / total
+            eta = (total - files) / rate if rate > 0 else None
+        roots = {}
+        for root, progress in self._per_root.items():
+            seconds = (progress.last - progress.first) if progress.first is not None else 0.0
+            roots[root] = {
+                "dirs": progress.dirs,
+                "files": progress.files,
+                "files_per_second": progress.files / seconds if seconds > 0 else 0.0,
+            }
+        return {
+            "dirs": self.dirs,
+            "files": files,
+            "elapsed": elapsed,
+            "entries_per_second": rate,
+            "current_dir": self.current_dir,
+            "estimated_total": total,
+            "estimate_source": self.estimate_source,
+            "fraction": fraction,
+            "eta": eta,
+            "roots": roots,
+        }
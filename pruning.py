@@ -0,0 +1,247 @@
+import os
+import re
+import threading
+
+# Règles d'élagage du parcours : les sous-arborescences écartées ne sont jamais listées.
+#   - exclusions : motifs de style .gitignore, relatifs à chaque dossier racine
+#     (« node_modules », « .git/ », « *.log », « /build », « docs/**/tmp ») ;
+#   - fichiers .gitignore / .ignore rencontrés pendant le parcours (sous-ensemble de la syntaxe :
+#     commentaires, négation « ! », « / » final pour les dossiers, ancrage, « * », « ? », « ** ») ;
+#   - profondeur maximale (0 : dossier racine seulement) ;
+#   - un seul système de fichiers (pas de descente dans les points de montage) ;
+#   - liens symboliques vers des dossiers suivis ou non ; s'ils le sont, chaque dossier n'est visité
+#     qu'une fois (périphérique, inode) : pas de boucle.
+# Chaque dossier à parcourir est accompagné d'un état (DirState) : profondeur, périphérique
+# de la racine et règles d'exclusion héritées des dossiers parents.
+# Un objet PruneRules sert à un seul parcours (il mémorise les dossiers visités).
+
+IGNORE_FILES = ('.gitignore', '.ignore')
+
+
+def _translate(pattern):
+    i = 0
+    n = len(pattern)
+    parts = []
+    while i < n:
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+            continue
+        if char == '*':
+            parts.append('[^/]*')
+        elif char == '?':
+            parts.append('[^/]')
+        elif char == '[':
+            end = pattern.find(']', i + 1)
+            if end < 0:
+                parts.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return re.compile(''.join(parts) + r'\Z', re.DOTALL)
+
+
+class IgnoreRule:
+    __slots__ = ('regex', 'negate', 'dir_only', 'anchored')
+
+    def __init__(self, line):
+        self.negate = line.startswith('!')
+        if self.negate:
+            line = line[1:]
+        self.dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        # Un « / » au début ou au milieu ancre le motif au dossier qui le déclare
+        self.anchored = '/' in line
+        self.regex = _translate(line.lstrip('/'))
+
+    def matches(self, relpath, name, is_dir):
+        if self.dir_only and not is_dir:
+            return False
+        return self.regex.match(relpath if self.anchored else name) is not None
+
+
+def parse_rules(lines):
+    rules = []
+    for line in lines:
+        line = line.rstrip('\n').rstrip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('\\'):
+            line = line[1:]
+        rules.append(IgnoreRule(line))
+    return tuple(rules)
+
+
+class DirState:
+    __slots__ = ('depth', 'dev', 'rules')
+
+    def __init__(self, depth, dev, rules):
+        self.depth = depth
+        self.dev = dev
+        # ((dossier de base, règles), ...) du plus haut au plus profond
+        self.rules = rules
+
+
+class PruneRules:
+    def __init__(self, exclude=(), ignore_files=False, max_depth=None, one_filesystem=False, follow_symlinks=False):
+        self.exclude = tuple(pattern.strip() for pattern in exclude if pattern.strip())
+        self.ignore_files = ignore_files
+        self.max_depth = max_depth
+        self.one_filesystem = one_filesystem
+        self.follow_symlinks = follow_symlinks
+        self._exclude_rules = parse_rules(self.exclude)
+        self._visited = set()
+        self._visited_lock = threading.Lock()
+
+    # Copie envoyée aux processus de parcours : sans verrou, avec son propre ensemble de dossiers visités
+    # (un dossier atteint par deux processus est dédoublonné par process_scan)
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_visited_lock']
+        state['_visited'] = set()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._visited_lock = threading.Lock()
+
+    # Identifie les règles (clé du cache des recherches)
+    @property
+    def key(self):
+        return (self.exclude, self.ignore_files, self.max_depth, self.one_filesystem, self.follow_symlinks)
+
+    @property
+    def active(self):
+        return bool(self.exclude or self.ignore_files or self.max_depth is not None or
+                    self.one_filesystem or self.follow_symlinks)
+
+    def _first_visit(self, path_stat):
+        identity = (path_stat.st_dev, path_stat.st_ino)
+        with self._visited_lock:
+            if identity in self._visited:
+                return False
+            self._visited.add(identity)
+            return True
+
+    def root(self, path):
+        path = path.rstrip(os.sep) or os.sep
+        dev = None
+        if self.one_filesystem or self.follow_symlinks:
+            try:
+                path_stat = os.stat(path)
+            except OSError:
+                return None
+            dev = path_stat.st_dev
+            if self.follow_symlinks and not self._first_visit(path_stat):
+                return None
+        rules = ((path, self._exclude_rules),) if self._exclude_rules else ()
+        return DirState(0, dev, rules)
+
+    # À l'entrée d'un dossier : ajoute les règles de ses fichiers .gitignore / .ignore
+    def enter(self, path, state):
+        if not self.ignore_files:
+            return state
+        lines = []
+        for name in IGNORE_FILES:
+            try:
+                with open(os.path.join(path, name), 'r', errors='replace') as file:
+                    lines.extend(file)
+            except OSError:
+                continue
+        if not lines:
+            return state
+        rules = parse_rules(lines)
+        if not rules:
+            return state
+        return DirState(state.depth, state.dev, state.rules + ((path, rules),))
+
+    def _excluded(self, path, name, is_dir, state):
+        excluded = False
+        for base, rules in state.rules:
+            relpath = path[len(base):].lstrip(os.sep).replace(os.sep, '/')
+            for rule in rules:
+                if rule.negate == excluded and rule.matches(relpath, name, is_dir):
+                    excluded = not rule.negate
+        return excluded
+
+    def allow_file(self, path, name, state):
+        return not state.rules or not self._excluded(path, name, False, state)
+
+    # Sous-dossier à parcourir ? Renvoie son état, ou None s'il est élagué.
+    # entry (os.DirEntry, facultatif) évite de refaire les appels système déjà faits par scandir.
+    def allow_dir(self, path, name, state, entry=None):
+        if self.max_depth is not None and state.depth >= self.max_depth:
+            return None
+        is_symlink = entry.is_symlink() if entry is not None else os.path.islink(path)
+        if is_symlink and not self.follow_symlinks:
+            return None
+        if state.rules and self._excluded(path, name, True, state):
+            return None
+        if self.one_filesystem or self.follow_symlinks:
+            try:
+                path_stat = entry.stat() if entry is not None else os.stat(path)
+            except OSError:
+                return None
+            if self.one_filesystem and path_stat.st_dev != state.dev:
+                return None
+            if self.follow_symlinks and not self._first_visit(path_stat):
+                return None
+        return DirState(state.depth + 1, state.dev, state.rules)
+
+    # État d'un sous-dossier déjà retenu lors d'un parcours précédent (cache des recherches) :
+    # seule la protection contre les boucles est refaite
+    def descend(self, path, state):
+        if self.follow_symlinks:
+            try:
+                if not self._first_visit(os.stat(path)):
+                    return None
+            except OSError:
+                return None
+        return DirState(state.depth + 1, state.dev, state.rules)
+
+    # Vérifie a posteriori un chemin sous root (résultats de l'index persistant) ;
+    # les états des dossiers sont mémorisés dans states
+    def allows_path(self, root, path, states):
+        root = root.rstrip(os.sep) or os.sep
+        dirpath, name = os.path.split(path)
+        state = self._dir_state(root, dirpath, states)
+        return state is not None and self.allow_file(path, name, state)
+
+    def _dir_state(self, root, dirpath, states):
+        if dirpath in states:
+            return states[dirpath]
+        if dirpath == root or len(dirpath) <= len(root):
+            state = self.root(root)
+        else:
+            parent, name = os.path.split(dirpath)
+            parent_state = self._dir_state(root, parent, states)
+            state = None
+            if parent_state is not None:
+                depth_ok = self.max_depth is None or parent_state.depth < self.max_depth
+                if depth_ok and not (parent_state.rules and self._excluded(dirpath, name, True, parent_state)):
+                    state = DirState(parent_state.depth + 1, parent_state.dev, parent_state.rules)
+                if state is not None and self.one_filesystem:
+                    try:
+                        if os.stat(dirpath).st_dev != state.dev:
+                            state = None
+                    except OSError:
+                        state = None
+        if state is not None:
+            state = self.enter(dirpath, state)
+        states[dirpath] = state
+        return state
+
+
+def parse_patterns(text):
+    return [pattern for pattern in re.split(r"[,;\n]+", text or "") if pattern.strip()]
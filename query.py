@@ -0,0 +1,123 @@
+import datetime
+import fnmatch
+import os
+import re
+import time
+
+from fuzzy import fuzzy_score, subsequence_pattern
+
+# Compilation des critères de recherche en un seul objet de correspondance.
+# Les critères sur le nom et l'extension (match_name) ne demandent aucun appel système et sont
+# évalués en premier ; la taille et la date (match_meta) ne sont vérifiées que pour les noms retenus,
+# contre des bornes déjà converties en secondes depuis l'epoch.
+# En syntaxe texte, le nom recherché est comparé au nom sans son extension ; en glob, regex et fuzzy,
+# le motif porte sur le nom complet, extension comprise.
+# En syntaxe 'fuzzy', match_name ne garde que les noms qui contiennent les lettres dans l'ordre
+# et score() donne la pertinence qui sert au classement (voir fuzzy.py).
+
+NAME_SYNTAXES = {
+    'text': "Texte",
+    'glob': "Glob (*, ?, [...])",
+    'regex': "Expression régulière",
+    'fuzzy': "Approximative (classée)",
+}
+
+_EXTENSION_SEPARATORS = re.compile(r"[\s,;|]+")
+
+
+# ".png, .jpg" -> ('.png', '.jpg') ; None si aucun format
+def parse_extensions(fileFormat):
+    if not fileFormat:
+        return None
+    extensions = tuple(ext.lower() for ext in _EXTENSION_SEPARATORS.split(fileFormat) if ext)
+    return extensions or None
+
+
+# Minuit (heure locale) du jour donné, en secondes depuis l'epoch
+def date_to_epoch(date):
+    return time.mktime(date.timetuple())
+
+
+class CompiledQuery:
+    def __init__(self, fileName='', fileFormat=None, minSize=0, maxSize=None, looseMatch=False,
+                 dateFrom=None, dateTo=None, nameSyntax='text'):
+        if nameSyntax not in NAME_SYNTAXES:
+            raise ValueError(f"Syntaxe de nom inconnue : {nameSyntax}")
+        self.fileName = fileName or ''
+        self.fileFormat = fileFormat
+        self.minSize = minSize or 0
+        self.maxSize = maxSize
+        self.looseMatch = looseMatch
+        self.dateFrom = dateFrom
+        self.dateTo = dateTo
+        self.nameSyntax = nameSyntax
+
+        self.extensions = parse_extensions(fileFormat)
+        self._size_min = self.minSize
+        self._size_max = float('inf') if maxSize is None else maxSize
+        # Date de modification comprise dans [dateFrom 00:00, lendemain de dateTo 00:00[
+        self._mtime_min = date_to_epoch(dateFrom) if dateFrom else float('-inf')
+        self._mtime_max = date_to_epoch(dateTo + datetime.timedelta(days=1)) if dateTo else float('inf')
+        self.needs_meta = (self._size_min > 0 or maxSize is not None or
+                           dateFrom is not None or dateTo is not None)
+        self._name_test = self._compile_name()
+
+    # Le motif compilé n'est pas sérialisable : on recompile à partir des critères
+    def __reduce__(self):
+        return (self.__class__, (self.fileName, self.fileFormat, self.minSize, self.maxSize, self.looseMatch,
+                                 self.dateFrom, self.dateTo, self.nameSyntax))
+
+    # Texte à rechercher dans les noms (pour l'index), si la syntaxe le permet
+    @property
+    def textName(self):
+        return self.fileName if self.nameSyntax == 'text' else None
+
+    # Résultats à classer par pertinence plutôt qu'à livrer dans l'ordre du parcours
+    @property
+    def ranked(self):
+        return self.nameSyntax == 'fuzzy'
+
+    def score(self, name):
+        return fuzzy_score(self.fileName.lower(), name)
+
+    def _compile_name(self):
+        needle = self.fileName.lower()
+        if self.nameSyntax == 'text':
+            if self.looseMatch:
+                if not needle:
+                    return None
+                # Rejet rapide sur le nom complet avant de découper l'extension
+                return lambda lname, name: needle in lname and needle in os.path.splitext(lname)[0]
+            return lambda lname, name: lname.startswith(needle) and os.path.splitext(lname)[0] == needle
+        if self.nameSyntax == 'fuzzy':
+            if not needle:
+                return None
+            search = subsequence_pattern(needle).search
+            return lambda lname, name: search(lname) is not None
+        if self.nameSyntax == 'glob':
+            pattern = f"*{needle}*" if self.looseMatch else needle
+            match = re.compile(fnmatch.translate(pattern), re.DOTALL).match
+            return lambda lname, name: match(lname) is not None
+        try:
+            regex = re.compile(self.fileName, re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"Expression régulière invalide : {e}")
+        match = regex.search if self.looseMatch else regex.fullmatch
+        return lambda lname, name: match(name) is not None
+
+    # Critères sans appel système : extension puis nom
+    def match_name(self, name):
+        lname = name.lower()
+        if self.extensions and not lname.endswith(self.extensions):
+            return False
+        return self._name_test is None or self._name_test(lname, name)
+
+    # Critères sur les métadonnées (taille en octets, date de modification en secondes)
+    def match_meta(self, size, mtime):
+        return (self._size_min <= size <= self._size_max and
+                self._mtime_min <= mtime < self._mtime_max)
+
+
+def compile_query(fileName='', fileFormat=None, minSize=0, maxSize=None, looseMatch=False,
+                  dateFrom=None, dateTo=None, nameSyntax='text'):
+    return CompiledQuery(fileName, fileFormat, minSize, maxSize, looseMatch, dateFrom, dateTo, nameSyntax)
@@ -0,0 +1,201 @@
+import os
+import threading
+from collections import OrderedDict
+
+from traversal import Backend, WalkEntry, list_dir
+
+# Cache des recherches déjà faites, en mémoire, validé par la date de modification des dossiers.
+# Pour chaque recherche (critères de nom normalisés + dossiers racines), on garde chaque dossier
+# parcouru : sa date de modification, les noms de fichiers retenus par les critères de nom,
+# ses sous-dossiers et son nombre de fichiers (pour l'avancement). Lors d'une nouvelle recherche
+# identique, un dossier dont la date n'a pas changé n'est pas relu (un seul stat) ; seuls les
+# dossiers modifiés ou nouveaux sont relistés.
+# La taille et la date des fichiers ne font pas partie de la clé : les fichiers retenus sont
+# stat-és à nouveau à chaque recherche, ces critères restent donc exacts.
+# Les règles d'élagage (pruning.PruneRules) font partie de la clé : les listages gardés sont déjà élagués.
+# Une modification sur place d'un .gitignore ne change pas la date de son dossier : elle n'est prise
+# en compte qu'à la relecture de ce dossier.
+# Éviction LRU, bornée par le nombre de recherches et par le nombre total de noms gardés.
+
+DEFAULT_MAX_SEARCHES = 16
+DEFAULT_MAX_ITEMS = 2000000
+
+
+class CachedSearch:
+    __slots__ = ('dirs', 'size')
+
+    def __init__(self):
+        # chemin du dossier -> (mtime_ns, noms retenus, sous-dossiers, nombre de fichiers du dossier)
+        self.dirs = {}
+        self.size = 0
+
+    def store(self, path, record):
+        old = self.dirs.get(path)
+        if old is not None:
+            self.size -= 1 + len(old[1]) + len(old[2])
+        self.dirs[path] = record
+        self.size += 1 + len(record[1]) + len(record[2])
+
+    def discard(self, path):
+        old = self.dirs.pop(path, None)
+        if old is not None:
+            self.size -= 1 + len(old[1]) + len(old[2])
+
+    # Dossier supprimé : on oublie aussi toute sa sous-arborescence
+    def discard_tree(self, path):
+        prefix = path.rstrip(os.sep) + os.sep
+        for child in [child for child in self.dirs if child.startswith(prefix)]:
+            self.discard(child)
+        self.discard(path)
+
+
+class ResultCache:
+    def __init__(self, max_searches=DEFAULT_MAX_SEARCHES, max_items=DEFAULT_MAX_ITEMS):
+        self.max_searches = max_searches
+        self.max_items = max_items
+        self._searches = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "dirs_reused": 0, "dirs_rescanned": 0}
+
+    # Clé : seuls les critères qui décident des noms retenus, et les racines normalisées
+    @staticmethod
+    def key(query, directories, prune=None):
+        roots = tuple(sorted(os.path.normpath(os.path.abspath(d)) for d in directories))
+        name = query.fileName if query.nameSyntax == 'regex' else query.fileName.lower()
+        return (name, query.nameSyntax, query.looseMatch, query.extensions, roots, prune.key if prune else None)
+
+    def lookup(self, query, directories, prune=None):
+        key = self.key(query, directories, prune)
+        with self._lock:
+            search = self._searches.get(key)
+            if search is None:
+                self.stats["misses"] += 1
+                search = self._searches[key] = CachedSearch()
+            else:
+                self.stats["hits"] += 1
+                self._searches.move_to_end(key)
+            return search
+
+    def backend(self, query):
+        return CachedBackend(self, query)
+
+    def clear(self):
+        with self._lock:
+            self._searches.clear()
+
+    def __len__(self):
+        return len(self._searches)
+
+    @property
+    def items(self):
+        return sum(search.size for search in self._searches.values())
+
+    # Évince les recherches les moins récemment utilisées au-delà des limites ; la plus récente
+    # est gardée, sauf si elle dépasse à elle seule la limite de taille
+    def evict(self):
+        with self._lock:
+            while len(self._searches) > 1 and (len(self._searches) > self.max_searches or self.items > self.max_items):
+                self._searches.popitem(last=False)
+                self.stats["evictions"] += 1
+            if self._searches and self.items > self.max_items:
+                self._searches.clear()
+                self.stats["evictions"] += 1
+
+
+# Moteur de parcours (type scandir) qui lit et alimente le cache
+class CachedBackend(Backend):
+    name = 'cache'
+
+    def __init__(self, cache, query):
+        self.cache = cache
+        self.query = query
+        self.name_filter = query.match_name
+
+    def iter_files(self, rootDir, is_running=lambda: True):
+        return self.iter_roots([rootDir], is_running)
+
+    def iter_roots(self, directories, is_running=lambda: True):
+        search = self.cache.lookup(self.query, directories, self.prune)
+        try:
+            for rootDir in directories:
+                if not is_running():
+                    return
+                yield from self._iter_tree(search, os.path.normpath(os.path.abspath(rootDir)), is_running)
+        finally:
+            self.cache.evict()
+
+    def _iter_tree(self, search, root, is_running):
+        prune = self.prune
+        progress = self.progress
+        state = None
+        if prune is not None:
+            state = prune.root(root)
+            if state is None:
+                return
+        stack = [(root, state)]
+        while stack:
+            if not is_running():
+                return
+            path, state = stack.pop()
+            if prune is not None:
+                state = prune.enter(path, state)
+            if progress is not None:
+                progress.enter_dir(path)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                search.discard_tree(path)
+                continue
+            record = search.dirs.get(path)
+            if record is not None and record[0] == mtime:
+                subdirs = yield from self._reuse_dir(path, record, state, is_running)
+            else:
+                subdirs = yield from self._rescan_dir(search, path, mtime, record, state, is_running)
+            # Ordre inversé pour visiter les sous-dossiers dans l'ordre de listage
+            stack.extend(reversed(subdirs))
+
+    # Dossier inchangé : ses noms retenus sont repris du cache, sans listage.
+    # Renvoie les sous-dossiers à parcourir (chemin, état d'élagage).
+    def _reuse_dir(self, path, record, state, is_running):
+        self.cache.stats["dirs_reused"] += 1
+        for name in record[1]:
+            if not is_running():
+                return []
+            yield WalkEntry(path, name)
+        if self.progress is not None:
+            self.progress.dir_done(path, record[3])
+        if self.prune is None:
+            return [(subdir, None) for subdir in record[2]]
+        children = ((subdir, self.prune.descend(subdir, state)) for subdir in record[2])
+        return [(subdir, child) for subdir, child in children if child is not None]
+
+    # Dossier nouveau ou modifié : relisté ; enregistré seulement s'il a été lu en entier
+    def _rescan_dir(self, search, path, mtime, record, state, is_running):
+        name_filter = self.name_filter
+        names = []
+        subdirs = []
+        files = 0
+        try:
+            for entry in list_dir(path, self.prune, state, subdirs, is_running):
+                files += 1
+                if name_filter is None or name_filter(entry.name):
+                    names.append(entry.name)
+                    yield entry
+        except OSError:
+            search.discard_tree(path)
+            return []
+        if not is_running():
+            return []
+        self._store(search, path, (mtime, tuple(names), tuple(subdir for subdir, _ in subdirs), files), record)
+        return subdirs
+
+    # Enregistre un dossier relu ; les sous-dossiers disparus depuis l'ancien enregistrement sont oubliés.
+    # La date est lue avant le listage : un changement pendant la lecture provoquera une relecture.
+    def _store(self, search, path, new_record, record):
+        self.cache.stats["dirs_rescanned"] += 1
+        if record is not None:
+            for removed in set(record[2]).difference(new_record[2]):
+                search.discard_tree(removed)
+        search.store(path, new_record)
+        if self.progress is not None:
+            self.progress.dir_done(path, new_record[3])
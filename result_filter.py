@@ -0,0 +1,109 @@
+import os
+import threading
+from collections import OrderedDict
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# Filtrage des résultats hors du thread de l'interface.
+# Les noms et les dossiers du stockage (result_model.ResultStore) sont mis en minuscules une seule
+# fois, à leur arrivée ; un dossier n'est examiné qu'une fois par saisie, quel que soit le nombre
+# de ses fichiers, et le chemin complet n'est reconstitué que si le texte contient un séparateur
+# (il peut alors chevaucher dossier et nom). Quand la nouvelle saisie contient une saisie
+# précédente (l'utilisateur complète sa requête), seules les lignes qui correspondaient déjà
+# sont réexaminées. Le résultat est un masque des lignes visibles.
+
+
+class FilterEngine:
+    HISTORY_SIZE = 16
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    # Appelé depuis le thread de l'interface, après l'ajout d'un lot de résultats au stockage.
+    # Un nom déjà en minuscules n'est pas dupliqué.
+    def add(self, store):
+        with self._lock:
+            self.dir_ids = store.dir_ids
+            self.lower_dirs.extend(directory.lower() for directory in store.dirs[len(self.lower_dirs):])
+            for name in store.names[len(self.lower_names):]:
+                lname = name.lower()
+                self.lower_names.append(name if lname == name else lname)
+
+    def clear(self):
+        with self._lock:
+            self.generation = getattr(self, 'generation', 0) + 1
+            self.dir_ids = None
+            self.lower_dirs = []
+            self.lower_names = []
+            self._history = OrderedDict()
+
+    # Calcule le masque (bytearray, un octet par ligne) des lignes contenant text
+    def compute(self, text, generation):
+        with self._lock:
+            dir_ids = self.dir_ids
+            lower_dirs = self.lower_dirs[:]
+            lower_names = self.lower_names
+            n = len(lower_names)
+            base = None
+            for previous, entry in self._history.items():
+                if previous in text and (base is None or len(previous) > len(base[0])):
+                    base = (previous, entry)
+        if os.sep in text or (os.altsep and os.altsep in text):
+            def test(i):
+                return text in lower_dirs[dir_ids[i]] + lower_names[i]
+        else:
+            dir_hits = bytearray(text in directory for directory in lower_dirs)
+
+            def test(i):
+                return dir_hits[dir_ids[i]] or text in lower_names[i]
+        if base is None:
+            matches = [i for i in range(n) if test(i)]
+        else:
+            previous_matches, previous_count = base[1]
+            matches = [i for i in previous_matches if test(i)]
+            matches.extend(i for i in range(previous_count, n) if test(i))
+        mask = bytearray(n)
+        for i in matches:
+            mask[i] = 1
+        with self._lock:
+            if generation == self.generation:
+                self._history[text] = (matches, n)
+                self._history.move_to_end(text)
+                while len(self._history) > self.HISTORY_SIZE:
+                    self._history.popitem(last=False)
+        return mask
+
+
+# Thread de filtrage : seule la dernière saisie demandée est traitée
+class FilterThread(QThread):
+    mask_ready_signal = pyqtSignal(object, str, int)
+
+    def __init__(self, engine, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self._condition = threading.Condition()
+        self._request = None
+        self._is_running = True
+
+    def requestFilter(self, text):
+        with self._condition:
+            self._request = (text, self.engine.generation)
+            self._condition.notify()
+
+    def run(self):
+        while True:
+            with self._condition:
+                while self._request is None and self._is_running:
+                    self._condition.wait()
+                if not self._is_running:
+                    return
+                text, generation = self._request
+                self._request = None
+            mask = self.engine.compute(text, generation)
+            self.mask_ready_signal.emit(mask, text, generation)
+
+    def stop(self):
+        with self._condition:
+            self._is_running = False
+            self._condition.notify()
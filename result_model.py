@@ -0,0 +1,307 @@
+import mimetypes
+import os
+from array import array
+from itertools import compress
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QDateTime, QModelIndex
+from PyQt5.QtGui import QIcon
+
+# Types de fichiers affichés : (libellé, icône). L'indice sert de code dans le stockage.
+FILE_TYPES = [
+    ("Autre", "path/to/default/icon.png"),
+    ("Image", "path/to/image/icon.png"),
+    ("Texte", "path/to/text/icon.png"),
+    ("PDF", "path/to/pdf/icon.png"),
+]
+TYPE_OTHER, TYPE_IMAGE, TYPE_TEXT, TYPE_PDF = range(len(FILE_TYPES))
+
+_type_cache = {}
+
+
+# Code de type d'un fichier, déterminé une seule fois par extension
+def file_type_code(path):
+    ext = os.path.splitext(path)[1].lower()
+    code = _type_cache.get(ext)
+    if code is None:
+        mime_type, _ = mimetypes.guess_type("f" + ext)
+        code = TYPE_OTHER
+        if mime_type:
+            if mime_type.startswith("image"):
+                code = TYPE_IMAGE
+            elif mime_type.startswith("text"):
+                code = TYPE_TEXT
+            elif mime_type.startswith("application/pdf"):
+                code = TYPE_PDF
+        _type_cache[ext] = code
+    return code
+
+
+# Dossier (avec son séparateur final) et nom d'un chemin : dossier + nom redonne le chemin exact
+def split_path(path):
+    cut = path.rfind(os.sep)
+    if os.altsep:
+        cut = max(cut, path.rfind(os.altsep))
+    return path[:cut + 1], path[cut + 1:]
+
+
+# Stockage en colonnes des résultats. Chaque dossier n'est gardé qu'une fois, dans une table
+# (dirs) ; une ligne ne garde que l'identifiant de son dossier et son nom, avec des tableaux typés
+# pour la taille, la date et le type (quelques octets par ligne au lieu d'objets Qt ou de chemins
+# complets). Le chemin n'est reconstitué qu'à la demande : lignes affichées, export, tri.
+# Le détail des correspondances (recherche dans le contenu) est creux : indice -> texte.
+class ResultStore:
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.dirs = []
+        self._dir_index = {}
+        self._last_dir = None
+        self._last_dir_id = 0
+        self.dir_ids = array('I')
+        self.names = []
+        self.sizes = array('q')
+        self.mtimes = array('d')
+        self.types = array('B')
+        self.details = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    # Identifiant du dossier ; les résultats arrivent groupés par dossier, d'où le raccourci
+    def _dir_id(self, directory):
+        if directory == self._last_dir:
+            return self._last_dir_id
+        dir_id = self._dir_index.get(directory)
+        if dir_id is None:
+            dir_id = self._dir_index[directory] = len(self.dirs)
+            self.dirs.append(directory)
+        self._last_dir = directory
+        self._last_dir_id = dir_id
+        return dir_id
+
+    def append(self, path, size, mtime, detail=None):
+        if detail:
+            self.details[len(self.names)] = detail
+        directory, name = split_path(path)
+        self.dir_ids.append(self._dir_id(directory))
+        self.names.append(name)
+        self.sizes.append(size)
+        self.mtimes.append(mtime)
+        self.types.append(file_type_code(name))
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(*row)
+
+    def path(self, i):
+        return self.dirs[self.dir_ids[i]] + self.names[i]
+
+    # Retire des lignes ; renvoie la nouvelle position de chaque ligne (-1 : retirée).
+    # La table des dossiers est gardée telle quelle.
+    def remove(self, indices):
+        removed = set(indices)
+        keep = [i for i in range(len(self.names)) if i not in removed]
+        remap = array('q', [-1]) * len(self.names)
+        for new, old in enumerate(keep):
+            remap[old] = new
+        self.dir_ids = array('I', (self.dir_ids[i] for i in keep))
+        self.names = [self.names[i] for i in keep]
+        self.sizes = array('q', (self.sizes[i] for i in keep))
+        self.mtimes = array('d', (self.mtimes[i] for i in keep))
+        self.types = array('B', (self.types[i] for i in keep))
+        self.details = {remap[i]: detail for i, detail in self.details.items() if remap[i] >= 0}
+        return remap
+
+
+# Modèle de tableau virtuel : Qt ne demande les données que pour les lignes visibles.
+# Le tri ne déplace pas les données, il calcule seulement une permutation des lignes ;
+# le filtre est un masque (un octet par ligne). Les lignes affichées combinent les deux.
+class ResultTableModel(QAbstractTableModel):
+    COLUMNS = ["Chemin des fichiers", "Taille", "Date de modification", "Type", "Correspondance"]
+    COLUMN_PATH, COLUMN_SIZE, COLUMN_MTIME, COLUMN_TYPE, COLUMN_DETAIL = range(5)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store = ResultStore()
+        self._sorted = None
+        self._mask = None
+        self._predicate = None
+        self._order = None
+        self._icons = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._order) if self._order is not None else len(self.store)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def totalCount(self):
+        return len(self.store)
+
+    def _rebuildOrder(self):
+        if self._mask is None:
+            self._order = self._sorted
+        elif self._sorted is None:
+            self._order = array('L', compress(range(len(self._mask)), self._mask))
+        else:
+            self._order = array('L', compress(self._sorted, map(self._mask.__getitem__, self._sorted)))
+
+    def storeRow(self, row):
+        return self._order[row] if self._order is not None else row
+
+    def path(self, row):
+        return self.store.path(self.storeRow(row))
+
+    # (chemin, taille, date de modification) connus depuis la recherche, sans accès au disque
+    def fileInfo(self, row):
+        i = self.storeRow(row)
+        return self.store.path(i), self.store.sizes[i], self.store.mtimes[i]
+
+    def typeIcon(self, code):
+        icon = self._icons.get(code)
+        if icon is None:
+            icon = self._icons[code] = QIcon(FILE_TYPES[code][1])
+        return icon
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        i = self.storeRow(index.row())
+        column = index.column()
+        store = self.store
+        if role == Qt.DisplayRole:
+            if column == self.COLUMN_PATH:
+                return store.path(i)
+            if column == self.COLUMN_SIZE:
+                return f"{store.sizes[i] / 1024:.2f} Ko"
+            if column == self.COLUMN_MTIME:
+                return QDateTime.fromSecsSinceEpoch(int(store.mtimes[i])).toString("yyyy-MM-dd hh:mm")
+            if column == self.COLUMN_TYPE:
+                return FILE_TYPES[store.types[i]][0]
+            if column == self.COLUMN_DETAIL:
+                return store.details.get(i, "")
+        elif role == Qt.DecorationRole and column == self.COLUMN_PATH:
+            return self.typeIcon(store.types[i])
+        elif role == Qt.TextAlignmentRole and column == self.COLUMN_SIZE:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        store = self.store
+        keys = {
+            self.COLUMN_PATH: store.path,
+            self.COLUMN_SIZE: store.sizes.__getitem__,
+            self.COLUMN_MTIME: store.mtimes.__getitem__,
+            self.COLUMN_TYPE: store.types.__getitem__,
+            self.COLUMN_DETAIL: lambda i: store.details.get(i, ""),
+        }
+        self.layoutAboutToBeChanged.emit()
+        self._sorted = array('L', sorted(range(len(store)), key=keys[column], reverse=(order == Qt.DescendingOrder)))
+        self._rebuildOrder()
+        self.layoutChanged.emit()
+
+    # Applique un masque de lignes visibles (None : tout afficher).
+    # predicate(path) décide de la visibilité des lignes absentes du masque (arrivées depuis son calcul).
+    def setFilterMask(self, mask, predicate=None):
+        self.beginResetModel()
+        if mask is not None:
+            total = len(self.store)
+            if len(mask) > total:
+                del mask[total:]
+            mask.extend(predicate(self.store.path(i)) for i in range(len(mask), total))
+        self._mask = mask
+        self._predicate = predicate
+        self._rebuildOrder()
+        self.endResetModel()
+
+    # Ajoute un lot de résultats (chemin, taille, date[, détail]) en une seule insertion.
+    # Si un tri est actif, les nouvelles lignes sont ajoutées à la fin ; si un filtre est actif,
+    # seules les nouvelles lignes qui le vérifient sont affichées.
+    def appendRows(self, rows):
+        if not rows:
+            return
+        start = len(self.store)
+        new_rows = range(start, start + len(rows))
+        if self._mask is not None:
+            visible_bits = bytearray(self._predicate(row[0]) for row in rows)
+            visible = array('L', compress(new_rows, visible_bits))
+        elif self._order is not None:
+            visible = array('L', new_rows)
+        else:
+            visible = new_rows
+        if not visible:
+            self.store.extend(rows)
+            if self._sorted is not None:
+                self._sorted.extend(new_rows)
+            if self._mask is not None:
+                self._mask.extend(visible_bits)
+            return
+        first = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first, first + len(visible) - 1)
+        self.store.extend(rows)
+        if self._sorted is not None:
+            self._sorted.extend(new_rows)
+        if self._mask is not None:
+            self._mask.extend(visible_bits)
+        if self._order is not None:
+            if self._order is not self._sorted:
+                self._order.extend(visible)
+        self.endInsertRows()
+
+    # Retire des lignes (indices du stockage) sans réinitialiser la vue : les lignes affichées
+    # sont retirées par plages contiguës, puis le stockage, le tri et le filtre sont renumérotés
+    def removeStoreRows(self, indices):
+        removed = set(indices)
+        if not removed:
+            return
+        if self._order is None or self._order is self._sorted:
+            self._order = array('L', self._order if self._order is not None else range(len(self.store)))
+        order = self._order
+        rows = [row for row, i in enumerate(order) if i in removed]
+        end = len(rows)
+        while end > 0:
+            start = end - 1
+            while start > 0 and rows[start - 1] == rows[start] - 1:
+                start -= 1
+            self.beginRemoveRows(QModelIndex(), rows[start], rows[end - 1])
+            del order[rows[start]:rows[end - 1] + 1]
+            self.endRemoveRows()
+            end = start
+        remap = self.store.remove(removed)
+        if self._sorted is not None:
+            self._sorted = array('L', (remap[i] for i in self._sorted if remap[i] >= 0))
+        if self._mask is not None:
+            self._mask = bytearray(bit for i, bit in enumerate(self._mask) if remap[i] >= 0)
+        self._rebuildOrder()
+
+    # Met à jour des lignes existantes : changes = [(indice du stockage, taille, date, détail)]
+    def updateStoreRows(self, changes):
+        if not changes:
+            return
+        store = self.store
+        for i, size, mtime, detail in changes:
+            store.sizes[i] = size
+            store.mtimes[i] = mtime
+            if detail:
+                store.details[i] = detail
+            else:
+                store.details.pop(i, None)
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0, self.COLUMN_SIZE), self.index(self.rowCount() - 1, self.COLUMN_DETAIL))
+
+    def clear(self):
+        self.beginResetModel()
+        self.store.clear()
+        self._sorted = None
+        if self._mask is not None:
+            self._mask = bytearray()
+        self._rebuildOrder()
+        self.endResetModel()
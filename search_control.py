@@ -0,0 +1,90 @@
+import threading
+import time
+
+# Contrôle coopératif d'une recherche en cours : arrêt, pause/reprise, nombre maximal de résultats
+# et durée maximale. L'objet s'appelle comme un is_running() : les moteurs de parcours, la recherche
+# dans le contenu et les doublons le consultent à chaque entrée.
+# En pause, l'appel bloque le thread appelant : les générateurs restent suspendus là où ils sont,
+# l'état du parcours (piles, files des threads) est conservé et la reprise continue au même point.
+# Le temps passé en pause n'est pas décompté de la durée maximale.
+
+STOP_REASONS = {
+    'cancelled': "interrompue",
+    'limit': "limite de résultats atteinte",
+    'deadline': "durée maximale atteinte",
+}
+
+
+class SearchControl:
+    def __init__(self, max_results=None, deadline=None, is_running=None):
+        self.max_results = max_results or None
+        self.deadline = deadline or None
+        self.results = 0
+        self.reason = None
+        self._parent = is_running
+        self._stopped = False
+        self._resume = threading.Event()
+        self._resume.set()
+        self._deadline_at = None
+        self._paused_at = None
+        self.start()
+
+    # (Re)démarre le décompte de la durée maximale
+    def start(self):
+        self._deadline_at = time.monotonic() + self.deadline if self.deadline else None
+
+    def __call__(self):
+        if self._stopped:
+            return False
+        if not self._resume.is_set():
+            self._resume.wait()
+            if self._stopped:
+                return False
+        if self._deadline_at is not None and time.monotonic() >= self._deadline_at:
+            self.stop('deadline')
+            return False
+        if self._parent is not None and not self._parent():
+            self.stop('cancelled')
+            return False
+        return True
+
+    def stop(self, reason='cancelled'):
+        if not self._stopped:
+            self.reason = reason
+            self._stopped = True
+        # Débloque les threads en pause pour qu'ils constatent l'arrêt
+        self._resume.set()
+
+    def cancel(self):
+        self.stop('cancelled')
+
+    def pause(self):
+        if not self._stopped and self._paused_at is None:
+            self._paused_at = time.monotonic()
+            self._resume.clear()
+
+    def resume(self):
+        if self._paused_at is not None:
+            if self._deadline_at is not None:
+                self._deadline_at += time.monotonic() - self._paused_at
+            self._paused_at = None
+        self._resume.set()
+
+    @property
+    def paused(self):
+        return not self._resume.is_set()
+
+    @property
+    def stopped(self):
+        return self._stopped
+
+    # Laisse passer au plus max_results résultats ; l'arrêt est signalé dès le dernier,
+    # avant de le transmettre, pour que les threads de parcours s'arrêtent sans attendre.
+    def limit(self, results):
+        for result in results:
+            self.results += 1
+            if self.max_results is not None and self.results >= self.max_results:
+                self.stop('limit')
+                yield result
+                return
+            yield result
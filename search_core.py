@@ -0,0 +1,159 @@
+import datetime
+import os
+from collections import namedtuple
+
+from content_search import DEFAULT_MAX_FILE_SIZE, ContentSearcher
+from duplicates import DEFAULT_HASH_WORKERS, find_duplicates
+from fuzzy import TopK
+from file_index import DEFAULT_INDEX_PATH, IndexBackend
+import process_scan  # noqa: F401  (enregistre le moteur 'process')
+from pruning import PruneRules
+from query import compile_query
+from search_control import SearchControl
+from traversal import DEFAULT_BACKEND, DEFAULT_WORKERS, get_backend
+
+# Cœur de la recherche, sans dépendance à Qt : utilisé par FileSearchThread (interface),
+# par la ligne de commande (filefinder.py) et importable depuis d'autres scripts.
+#
+#     from search_core import search
+#     for result in search(["/srv/projets"], fileName="rapport", looseMatch=True):
+#         print(result.path, result.size, result.mtime)
+#
+# Avec content, seuls les fichiers dont le contenu correspond sont retenus ; result.matches
+# donne alors les correspondances (ligne, position en octets, texte de la ligne).
+# search_duplicates produit des groupes de fichiers identiques (DuplicateGroup) parmi les résultats.
+# max_results arrête la recherche dès le n-ième résultat (max_results=1 : premier fichier trouvé),
+# deadline au bout de ce nombre de secondes. is_running peut être un SearchControl (pause/reprise).
+# En syntaxe 'fuzzy', seuls les top_k meilleurs résultats sont gardés et livrés à la fin,
+# du plus pertinent au moins pertinent, avec leur score.
+# exclude, ignore_files, max_depth, one_filesystem et follow_symlinks élaguent le parcours
+# (voir pruning.py) : les dossiers écartés ne sont pas listés.
+
+SearchResult = namedtuple('SearchResult', 'path size mtime matches score', defaults=(None, None))
+
+DEFAULT_TOP_K = 100
+
+
+# Moteurs que le cache peut remplacer : son parcours est lui-même séquentiel, type scandir
+CACHED_BACKENDS = ('walk', 'scandir')
+
+
+# Avec cache (result_cache.ResultCache), le parcours réutilise les dossiers inchangés depuis
+# une recherche identique ; il ne s'applique ni à l'index ni aux moteurs parallèles.
+# Le moteur multiprocessus applique lui-même nom, taille et date dans ses processus.
+def make_backend(query, backend=DEFAULT_BACKEND, workers=DEFAULT_WORKERS, index_mode='off', index_path=DEFAULT_INDEX_PATH,
+                 cache=None, prune=None):
+    if index_mode == 'off' and cache is not None and backend in CACHED_BACKENDS:
+        search_backend = cache.backend(query)
+    elif index_mode == 'off':
+        search_backend = get_backend(backend, workers)
+        search_backend.name_filter = query.match_name
+        search_backend.meta_filter = query.match_meta
+    else:
+        search_backend = IndexBackend(index_path, refresh=(index_mode == 'refresh'), query=query)
+    if prune is not None and prune.active:
+        search_backend.prune = prune
+    return search_backend
+
+
+# Parcourt les dossiers et produit les résultats au fil de l'eau.
+# tick (facultatif) est appelé pour chaque entrée examinée, correspondante ou non.
+def iter_matches(search_backend, directories, query, is_running=lambda: True, tick=None):
+    match_name = query.match_name
+    match_meta = query.match_meta
+    for entry in search_backend.iter_roots(directories, is_running):
+        if tick is not None:
+            tick()
+        # Nom et extension d'abord : le stat n'est fait que pour les noms retenus
+        if not match_name(entry.name):
+            continue
+        try:
+            file_stat = entry.stat()
+        except OSError:
+            continue
+        if match_meta(file_stat.st_size, file_stat.st_mtime):
+            yield SearchResult(entry.path, file_stat.st_size, file_stat.st_mtime)
+
+
+# Classe les résultats par score ; la mémoire reste bornée par top_k
+def rank_results(results, query, top_k=DEFAULT_TOP_K):
+    best = TopK(top_k)
+    score = query.score
+    for result in results:
+        value = score(os.path.basename(result.path))
+        if value is not None:
+            best.push(value, result)
+    for value, result in best.items():
+        yield result._replace(score=value)
+
+
+def search(directories, fileName='', fileFormat=None, minSize=0, maxSize=None, looseMatch=False,
+           dateFrom=None, dateTo=None, nameSyntax='text', backend=DEFAULT_BACKEND, workers=DEFAULT_WORKERS,
+           index_mode='off', index_path=DEFAULT_INDEX_PATH, content=None, contentRegex=False,
+           maxContentSize=DEFAULT_MAX_FILE_SIZE, processes=None, max_results=None, deadline=None,
+           top_k=DEFAULT_TOP_K, cache=None, exclude=(), ignore_files=False, max_depth=None, one_filesystem=False,
+           follow_symlinks=False, is_running=lambda: True):
+    # Recherche dans le contenu sans nom : tous les fichiers sont candidats
+    if content and not fileName:
+        looseMatch = True
+    query = compile_query(fileName, fileFormat, minSize, maxSize, looseMatch, dateFrom, dateTo, nameSyntax)
+    searcher = ContentSearcher(content, contentRegex, max_size=maxContentSize, processes=processes) if content else None
+    prune = PruneRules(exclude, ignore_files, max_depth, one_filesystem, follow_symlinks)
+    search_backend = make_backend(query, backend, workers, index_mode, index_path, cache, prune)
+    control = SearchControl(max_results, deadline, is_running)
+    results = iter_matches(search_backend, directories, query, control)
+    if searcher is not None:
+        results = searcher.filter(results, control)
+    if query.ranked and top_k:
+        results = rank_results(results, query, top_k)
+    return control.limit(results)
+
+
+# max_results porte ici sur le nombre de groupes ; pas de classement (tous les candidats comptent)
+def search_duplicates(directories, fileName='', looseMatch=False, hash_workers=DEFAULT_HASH_WORKERS,
+                      max_results=None, deadline=None, is_running=lambda: True, **options):
+    if not fileName:
+        looseMatch = True
+    control = SearchControl(max_results, deadline, is_running)
+    options["top_k"] = None
+    results = search(directories, fileName, looseMatch=looseMatch, is_running=control, **options)
+    return control.limit(find_duplicates(results, hash_workers, is_running=control))
+
+
+def _parse_date(value):
+    return datetime.date.fromisoformat(value) if value else None
+
+
+# Convertit les paramètres enregistrés par MainWindow.saveSettings (tailles en Ko, dates ISO)
+# en arguments de search() ; "duplicates" indique s'il faut appeler search_duplicates()
+def options_from_settings(settings):
+    options = {
+        "directories": list(settings.get("directories", [])),
+        "fileName": settings.get("fileName", ""),
+        "fileFormat": settings.get("fileFormat") or None,
+        "looseMatch": settings.get("looseMatch", False),
+        "dateFrom": _parse_date(settings.get("dateFrom")),
+        "dateTo": _parse_date(settings.get("dateTo")),
+        "nameSyntax": settings.get("nameSyntax", 'text'),
+        "backend": settings.get("backend", DEFAULT_BACKEND),
+        "workers": settings.get("workers", DEFAULT_WORKERS),
+        "index_mode": settings.get("indexMode", 'off'),
+        "content": settings.get("content") or None,
+        "contentRegex": settings.get("contentRegex", False),
+        "duplicates": settings.get("duplicates", False),
+        "max_results": settings.get("maxResults") or None,
+        "deadline": settings.get("deadline") or None,
+        "top_k": settings.get("topK", DEFAULT_TOP_K),
+        "exclude": list(settings.get("exclude", [])),
+        "ignore_files": settings.get("ignoreFiles", False),
+        "max_depth": settings.get("maxDepth"),
+        "one_filesystem": settings.get("oneFilesystem", False),
+        "follow_symlinks": settings.get("followSymlinks", False),
+    }
+    if settings.get("maxContentSize") is not None:
+        options["maxContentSize"] = settings["maxContentSize"] * 1024 * 1024
+    if settings.get("minSize") is not None:
+        options["minSize"] = settings["minSize"] * 1024
+    if settings.get("maxSize") is not None:
+        options["maxSize"] = settings["maxSize"] * 1024
+    return options
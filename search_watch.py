@@ -0,0 +1,161 @@
+import threading
+import time
+from collections import namedtuple
+
+from result_cache import ResultCache
+from search_core import options_from_settings, search
+
+# Surveillance d'une recherche enregistrée (paramètres de MainWindow.saveSettings) : la recherche
+# est refaite périodiquement ou à chaque modification dans ses dossiers (inotify, Linux ; l'intervalle
+# sert alors de filet de sécurité) et seul l'écart avec la vérification précédente est renvoyé :
+# fichiers apparus, disparus ou modifiés (taille ou date de modification).
+# Les vérifications passent par un cache des recherches (result_cache.ResultCache) : un dossier
+# inchangé depuis la vérification précédente coûte un stat, seuls les dossiers modifiés sont relus.
+# Le nombre maximal de résultats et la durée maximale ne s'appliquent pas : une vérification
+# tronquée ferait apparaître des disparitions qui n'en sont pas. Une vérification interrompue
+# ne renvoie rien et l'état précédent est gardé.
+#
+#     watch = watch_from_settings(json.load(open("gros_fichiers.json")))
+#     for delta in watch.watch():
+#         for result in delta.added:
+#             print("+", result.path)
+
+WATCH_MODES = {
+    'off': "Désactivée",
+    'interval': "Périodique",
+    'change': "Sur modification",
+}
+
+DEFAULT_INTERVAL = 5 * 60
+# Écart minimal entre deux vérifications déclenchées par des modifications (fichier en cours d'écriture)
+MIN_CHANGE_INTERVAL = 2.0
+
+
+# added, changed : search_core.SearchResult ; removed : chemins
+class ResultDelta(namedtuple('ResultDelta', 'added removed changed')):
+    __slots__ = ()
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self):
+        parts = []
+        for items, singular, plural in ((self.added, "nouveau", "nouveaux"),
+                                        (self.removed, "supprimé", "supprimés"),
+                                        (self.changed, "modifié", "modifiés")):
+            if items:
+                parts.append(f"{len(items)} {singular if len(items) == 1 else plural}")
+        return ", ".join(parts) or "aucun changement"
+
+
+# Compare les résultats à l'état précédent (chemin -> (taille, date)) ; renvoie (nouvel état, écart)
+def diff_results(previous, results):
+    current = {}
+    added = []
+    changed = []
+    for result in results:
+        state = (result.size, result.mtime)
+        current[result.path] = state
+        old = previous.get(result.path)
+        if old is None:
+            added.append(result)
+        elif old != state:
+            changed.append(result)
+    removed = [path for path in previous if path not in current]
+    return current, ResultDelta(added, removed, changed)
+
+
+class SearchWatch:
+    # snapshot (facultatif) : état déjà connu (chemin -> (taille, date)), par exemple les résultats
+    # affichés ; sans lui, la première vérification renvoie tous les résultats comme nouveaux
+    def __init__(self, settings, mode='interval', interval=DEFAULT_INTERVAL, cache=None, snapshot=None):
+        if mode not in WATCH_MODES:
+            raise ValueError(f"Mode de surveillance inconnu : {mode}")
+        if mode == 'off':
+            raise ValueError("La surveillance est désactivée pour cette recherche")
+        options = options_from_settings(settings)
+        if options.pop("duplicates"):
+            raise ValueError("La recherche de doublons ne peut pas être surveillée")
+        self.directories = options.pop("directories")
+        if not self.directories:
+            raise ValueError("Aucun dossier à surveiller")
+        options["max_results"] = options["deadline"] = None
+        self.options = options
+        self.mode = mode
+        self.interval = interval
+        self.cache = cache if cache is not None else ResultCache(max_searches=1)
+        self.snapshot = dict(snapshot) if snapshot is not None else None
+        self.checks = 0
+        self._last_check = time.monotonic()
+        self._changed = threading.Event()
+        self._watcher = None
+
+    # Refait la recherche ; renvoie l'écart avec la vérification précédente (None si interrompue)
+    def check(self, is_running=lambda: True):
+        self._changed.clear()
+        results = search(self.directories, cache=self.cache, is_running=is_running, **self.options)
+        snapshot, delta = diff_results(self.snapshot or {}, results)
+        self._last_check = time.monotonic()
+        if not is_running():
+            return None
+        self.snapshot = snapshot
+        self.checks += 1
+        return delta
+
+    # Rappel du watcher inotify : des fichiers ont changé sous les dossiers surveillés
+    def notify(self, paths=None):
+        self._changed.set()
+
+    # En mode 'change', démarre la surveillance inotify ; sans inotify, la vérification reste périodique
+    def start(self):
+        if self.mode != 'change' or self._watcher is not None:
+            return
+        import watcher
+        if not watcher.is_supported():
+            self.mode = 'interval'
+            return
+        self._watcher = watcher.InotifyWatcher(self.directories, db_path=None, on_change=self.notify)
+        self._watcher.start()
+
+    def stop(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher.join()
+            self._watcher = None
+
+    # Attend la prochaine vérification ; False si is_running() devient faux entre-temps
+    def wait(self, is_running=lambda: True):
+        while is_running():
+            now = time.monotonic()
+            if now - self._last_check >= self.interval:
+                return True
+            if self._changed.is_set():
+                if now - self._last_check >= MIN_CHANGE_INTERVAL:
+                    return True
+                time.sleep(0.1)
+            else:
+                self._changed.wait(min(0.1, self.interval - (now - self._last_check)))
+        return False
+
+    # Vérifications successives jusqu'à ce que is_running() devienne faux ; produit chaque écart
+    # (vide compris : la vérification a eu lieu)
+    def watch(self, is_running=lambda: True):
+        self.start()
+        try:
+            if self.snapshot is None:
+                delta = self.check(is_running)
+                if delta is not None:
+                    yield delta
+            while self.wait(is_running):
+                delta = self.check(is_running)
+                if delta is not None:
+                    yield delta
+        finally:
+            self.stop()
+
+
+# Mode ("watchMode") et intervalle en minutes ("watchInterval") lus dans les paramètres enregistrés
+def watch_from_settings(settings, cache=None, snapshot=None):
+    mode = settings.get("watchMode", 'interval')
+    interval = settings.get("watchInterval") or DEFAULT_INTERVAL / 60
+    return SearchWatch(settings, mode, interval * 60, cache, snapshot)
@@ -0,0 +1,20 @@
+import os
+import sys
+import time
+
+# Mesure du démarrage de l'interface, étape par étape (imports, fenêtre construite, premier
+# affichage, interface complète), en millisecondes depuis l'import de ce module : il est importé
+# en premier par main.py. Activée par l'option --trace-startup ou la variable d'environnement
+# FILEFINDER_TRACE_STARTUP=1 ; les étapes sont écrites sur la sortie d'erreur.
+
+_started = time.perf_counter()
+enabled = "--trace-startup" in sys.argv or os.environ.get("FILEFINDER_TRACE_STARTUP", "") not in ("", "0")
+marks = []
+
+
+def mark(label):
+    elapsed = (time.perf_counter() - _started) * 1000
+    marks.append((label, elapsed))
+    if enabled:
+        print(f"démarrage : {elapsed:8.1f} ms  {label}", file=sys.stderr, flush=True)
+    return elapsed
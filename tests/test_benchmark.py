@@ -0,0 +1,41 @@
+import json
+import os
+
+import pytest
+
+from benchmark import BENCH_MANIFEST, generate_tree
+
+SMALL = {"width": 2, "depth": 1, "files": 3}
+
+
+def test_tree_is_generated_then_reused(tmp_path):
+    root = str(tmp_path / "arbre")
+    manifest = generate_tree(root, **SMALL)
+    assert manifest["dirs"] == 3 and manifest["files"] == 9
+    marker = os.path.join(root, "marqueur")
+    open(marker, "w").close()
+    assert generate_tree(root, **SMALL) == manifest
+    assert os.path.exists(marker)
+
+
+def test_generated_tree_is_rebuilt_when_parameters_change(tmp_path):
+    root = str(tmp_path / "arbre")
+    generate_tree(root, **SMALL)
+    manifest = generate_tree(root, width=1, depth=1, files=2)
+    assert manifest["files"] == 4
+    with open(os.path.join(root, BENCH_MANIFEST)) as file:
+        assert json.load(file)["params"]["width"] == 1
+
+
+def test_empty_directory_is_used(tmp_path):
+    assert generate_tree(str(tmp_path), **SMALL)["files"] == 9
+
+
+@pytest.mark.parametrize("manifest", [None, "pas du json", json.dumps({"params": {"autre": 1}})])
+def test_foreign_directory_is_never_deleted(tmp_path, manifest):
+    (tmp_path / "important.txt").write_text("à garder")
+    if manifest is not None:
+        (tmp_path / BENCH_MANIFEST).write_text(manifest)
+    with pytest.raises(ValueError):
+        generate_tree(str(tmp_path), **SMALL)
+    assert (tmp_path / "important.txt").read_text() == "à garder"
@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from content_search import (BINARY_SNIFF_SIZE, MMAP_THRESHOLD, ContentSearcher, compile_content_pattern,
+                            scan_file)
+from search_core import SearchResult
+
+
+def write(root, name, data):
+    path = root / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_scan_file_reports_line_offset_and_text(tmp_path):
+    path = write(tmp_path, "a.txt", b"premier\ndeuxieme Cible\ntroisieme cible\n")
+    matches = scan_file(path, compile_content_pattern("cible"))
+    assert [(m.line, m.offset, m.text) for m in matches] == [
+        (2, 17, "deuxieme Cible"),
+        (3, 33, "troisieme cible"),
+    ]
+
+
+def test_scan_file_case_and_regex(tmp_path):
+    path = write(tmp_path, "a.txt", b"Cible\ncible\n")
+    assert [m.line for m in scan_file(path, compile_content_pattern("cible", ignore_case=False))] == [2]
+    assert [m.line for m in scan_file(path, compile_content_pattern("(?m)^C", regex=True, ignore_case=False))] == [1]
+    assert scan_file(path, compile_content_pattern("absent")) is None
+
+
+def test_scan_file_skips_binary_empty_and_oversized(tmp_path):
+    pattern = compile_content_pattern("cible")
+    assert scan_file(write(tmp_path, "bin", b"cible\0cible"), pattern) is None
+    assert scan_file(write(tmp_path, "empty", b""), pattern) is None
+    big = write(tmp_path, "big.txt", b"cible" * 100)
+    assert scan_file(big, pattern, max_size=499) is None
+    assert len(scan_file(big, pattern, max_size=500)) == 100
+
+
+def test_scan_file_large_files_and_match_limit(tmp_path):
+    pattern = compile_content_pattern("cible")
+    # Après la zone de détection binaire, puis au-delà du seuil mmap
+    medium = write(tmp_path, "medium.txt", b"x" * BINARY_SNIFF_SIZE + b"\ncible\n")
+    assert [(m.line, m.offset) for m in scan_file(medium, pattern)] == [(2, BINARY_SNIFF_SIZE + 1)]
+    large = write(tmp_path, "large.txt", b"y\n" * MMAP_THRESHOLD + b"cible")
+    assert [m.line for m in scan_file(large, pattern)] == [MMAP_THRESHOLD + 1]
+    many = write(tmp_path, "many.txt", b"cible\n" * 10)
+    assert len(scan_file(many, pattern, max_matches=3)) == 3
+
+
+def test_invalid_content_regex():
+    with pytest.raises(ValueError):
+        ContentSearcher("(", regex=True)
+
+
+def test_filter_streams_matches_before_the_input_ends(tmp_path):
+    path = write(tmp_path, "a.txt", b"cible\n")
+    other = write(tmp_path, "b.txt", b"autre\n")
+    produced = []
+
+    # Parcours lent : un résultat correspondant puis des résultats sans rapport, espacés
+    def slow_results():
+        yield SearchResult(path, 6, 0)
+        for _ in range(400):
+            produced.append(1)
+            yield SearchResult(other, 6, 0)
+            time.sleep(0.05)
+
+    matches = ContentSearcher("cible", processes=1).filter(slow_results())
+    first = next(matches)
+    matches.close()
+    assert first.path == path
+    assert first.matches[0].line == 1
+    assert len(produced) < 400
+
+
+def test_filter_keeps_only_matching_results(tmp_path):
+    results = [SearchResult(write(tmp_path, f"{i}.txt", b"cible" if i % 2 else b"autre"), 5, 0) for i in range(6)]
+    results.append(SearchResult(write(tmp_path, "empty.txt", b""), 0, 0))
+    found = ContentSearcher("cible", processes=1).filter(iter(results))
+    assert sorted(r.path for r in found) == sorted(r.path for r in results[1:6:2])
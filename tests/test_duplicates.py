@@ -0,0 +1,106 @@
+import os
+
+from duplicates import PARTIAL_SIZE, DuplicateFinder, find_duplicates, full_hash, partial_hash
+from search_core import SearchResult, search, search_duplicates
+
+LARGE = 3 * PARTIAL_SIZE
+
+
+def write(root, relative, data):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+def make_tree(root):
+    head = b"h" * PARTIAL_SIZE
+    tail = b"t" * PARTIAL_SIZE
+    return {
+        # Même taille, contenus différents (écartés par l'empreinte partielle)
+        "small_a": write(root, "small/a.txt", b"abcd"),
+        "small_b": write(root, "small/b.txt", b"abce"),
+        # Mêmes premiers Ko, fin différente (écartés par l'empreinte partielle)
+        "tail_a": write(root, "tail/a.bin", head + b"m" * PARTIAL_SIZE + b"x" * PARTIAL_SIZE),
+        "tail_b": write(root, "tail/b.bin", head + b"m" * PARTIAL_SIZE + b"y" * PARTIAL_SIZE),
+        # Mêmes premiers et derniers Ko, milieu différent (écartés par l'empreinte complète)
+        "middle_a": write(root, "middle/a.bin", head + b"1" * PARTIAL_SIZE + tail),
+        "middle_b": write(root, "middle/b.bin", head + b"2" * PARTIAL_SIZE + tail),
+        # Vrais doublons, petits et grands
+        "dup_small_1": write(root, "dups/one.txt", b"identique\n"),
+        "dup_small_2": write(root, "dups/sub/two.txt", b"identique\n"),
+        "dup_large_1": write(root, "dups/big1.bin", head + b"3" * PARTIAL_SIZE + tail),
+        "dup_large_2": write(root, "dups/big2.bin", head + b"3" * PARTIAL_SIZE + tail),
+        "dup_large_3": write(root, "dups/sub/big3.bin", head + b"3" * PARTIAL_SIZE + tail),
+        # Entre une et deux fois PARTIAL_SIZE : l'empreinte partielle lit tout le fichier
+        "mid_a": write(root, "mid/a.bin", b"q" * (PARTIAL_SIZE + 10)),
+        "mid_b": write(root, "mid/b.bin", b"q" * PARTIAL_SIZE + b"r" * 10),
+        "empty_1": write(root, "empty/1", b""),
+        "empty_2": write(root, "empty/2", b""),
+    }
+
+
+def results_for(paths):
+    return [SearchResult(path, os.path.getsize(path), os.path.getmtime(path)) for path in paths]
+
+
+def test_only_true_duplicates_are_grouped(tmp_path):
+    files = make_tree(tmp_path)
+    finder = DuplicateFinder(workers=2)
+    groups = list(finder.find(results_for(sorted(files.values()))))
+    found = [[result.path for result in group.files] for group in groups]
+    assert found == [
+        [files["dup_large_1"], files["dup_large_2"], files["dup_large_3"]],
+        [files["dup_small_1"], files["dup_small_2"]],
+    ]
+    assert [group.size for group in groups] == [LARGE, len(b"identique\n")]
+    assert groups[0].digest == full_hash(files["dup_large_1"])
+    # Les étapes successives ne lisent que les candidats restants
+    assert finder.stats["files"] == len(files)
+    assert finder.stats["size_candidates"] == len(files) - 2
+    assert finder.stats["partial_hashed"] == len(files) - 2
+    assert finder.stats["full_hashed"] == 5
+    assert finder.stats["groups"] == 2
+
+
+def test_partial_hash_reads_head_and_tail(tmp_path):
+    files = make_tree(tmp_path)
+    assert partial_hash(files["middle_a"], LARGE) == partial_hash(files["middle_b"], LARGE)
+    assert full_hash(files["middle_a"]) != full_hash(files["middle_b"])
+    assert partial_hash(files["tail_a"], LARGE) != partial_hash(files["tail_b"], LARGE)
+    size = PARTIAL_SIZE + 10
+    assert partial_hash(files["mid_a"], size) != partial_hash(files["mid_b"], size)
+
+
+def test_same_path_twice_is_not_a_duplicate(tmp_path):
+    path = write(tmp_path, "a.txt", b"x")
+    assert list(find_duplicates(results_for([path, path]))) == []
+
+
+def test_min_size(tmp_path):
+    files = make_tree(tmp_path)
+    groups = list(find_duplicates(results_for(sorted(files.values())), min_size=100))
+    assert [group.size for group in groups] == [LARGE]
+
+
+def test_unreadable_files_are_skipped(tmp_path):
+    files = make_tree(tmp_path)
+    results = results_for([files["dup_small_1"], files["dup_small_2"]])
+    results.append(SearchResult(str(tmp_path / "disparu.txt"), results[0].size, 0.0))
+    groups = list(find_duplicates(results))
+    assert [len(group.files) for group in groups] == [2]
+
+
+def test_stop_before_hashing(tmp_path):
+    files = make_tree(tmp_path)
+    assert list(find_duplicates(results_for(sorted(files.values())), is_running=lambda: False)) == []
+
+
+def test_search_duplicates(tmp_path):
+    files = make_tree(tmp_path)
+    groups = list(search_duplicates([str(tmp_path)]))
+    assert sorted(len(group.files) for group in groups) == [2, 3]
+    # Dossiers de recherche imbriqués : chaque fichier ne compte qu'une fois
+    nested = list(search_duplicates([str(tmp_path), str(tmp_path / "dups")]))
+    assert sorted(len(group.files) for group in nested) == [2, 3]
+    assert len(list(search([str(tmp_path)], looseMatch=True))) == len(files)
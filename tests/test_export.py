@@ -0,0 +1,119 @@
+import csv
+import json
+import os
+
+import pytest
+
+from export import ResultExporter, format_from_path, parse_columns
+from search_core import SearchResult
+
+RESULTS = [SearchResult(f"/srv/partage/fichier {i}, « é ».pdf", i * 10, 1700000000.0 + i) for i in range(25)]
+
+
+def read_export(path, export_format):
+    with open(path, encoding='utf-8', newline='') as file:
+        if export_format == 'csv':
+            return [row["path"] for row in csv.DictReader(file)]
+        if export_format == 'json':
+            return [record["path"] for record in json.load(file)]
+        return [json.loads(line)["path"] for line in file]
+
+
+def interrupted(results, count):
+    for number, result in enumerate(results):
+        if number == count:
+            raise KeyboardInterrupt
+        yield result
+
+
+@pytest.mark.parametrize("export_format", ['csv', 'json', 'ndjson'])
+@pytest.mark.parametrize("count", [0, 1, 7, 25])
+def test_interrupted_export_is_valid(tmp_path, export_format, count):
+    path = str(tmp_path / f"export.{export_format}")
+    exporter = ResultExporter(path, columns=("size", "mtime", "type", "detail"), batch_size=3)
+    try:
+        for result in exporter.tee(interrupted(RESULTS, count), detail=lambda result: "détail"):
+            assert not os.path.exists(path)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        exporter.close()
+    assert os.listdir(tmp_path) == [f"export.{export_format}"]
+    assert read_export(path, export_format) == [result.path for result in RESULTS[:count]]
+    assert exporter.count == count
+
+
+def test_columns(tmp_path):
+    path = str(tmp_path / "export.ndjson")
+    with ResultExporter(path, columns=("detail", "size", "type", "mtime")) as exporter:
+        exporter.write("/a/b.pdf", 12, None, "ligne 3")
+    with open(path, encoding='utf-8') as file:
+        record = json.loads(file.readline())
+    assert list(record) == ["path", "size", "mtime", "type", "detail"]
+    assert record == {"path": "/a/b.pdf", "size": 12, "mtime": None, "type": "application/pdf", "detail": "ligne 3"}
+
+
+def test_failed_close_removes_the_temporary_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "export.csv")
+    exporter = ResultExporter(path)
+    exporter.write("/a")
+
+    def fail(*args):
+        raise OSError("disque plein")
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        exporter.close()
+    assert exporter.closed
+    assert os.listdir(tmp_path) == []
+
+
+def test_parse_columns():
+    assert parse_columns("size, mtime,,type") == ("size", "mtime", "type")
+    assert parse_columns("") == ()
+    assert parse_columns(None) == ()
+    with pytest.raises(ValueError, match="owner"):
+        parse_columns("size,owner")
+
+
+def test_formats():
+    assert format_from_path("a.JSON") == 'json'
+    assert format_from_path("a.jsonl") == 'ndjson'
+    assert format_from_path("a.txt") == 'csv'
+    with pytest.raises(ValueError):
+        ResultExporter("/nulle/part.xml", export_format='xml')
+
+
+def test_abort_keeps_the_existing_file(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_text("ancien export\n")
+    exporter = ResultExporter(str(path))
+    exporter.write("/a")
+    exporter.abort()
+    exporter.close()
+    assert exporter.closed
+    assert path.read_text() == "ancien export\n"
+    assert os.listdir(tmp_path) == ["export.csv"]
+
+
+def test_context_manager_publishes_only_on_success_or_interruption(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text("[]\n")
+    with pytest.raises(RuntimeError):
+        with ResultExporter(str(path)) as exporter:
+            exporter.write("/a")
+            raise RuntimeError("erreur")
+    assert path.read_text() == "[]\n"
+    with pytest.raises(KeyboardInterrupt):
+        with ResultExporter(str(path)) as exporter:
+            exporter.write("/a")
+            raise KeyboardInterrupt
+    assert read_export(str(path), 'json') == ["/a"]
+
+
+def test_cli_invalid_pattern_keeps_the_existing_export(tmp_path):
+    import filefinder
+    path = tmp_path / "export.csv"
+    path.write_text("ancien export\n")
+    assert filefinder.main([str(tmp_path), "--syntax", "regex", "--name", "(", "--export", str(path)]) == 2
+    assert path.read_text() == "ancien export\n"
+    assert sorted(os.listdir(tmp_path)) == ["export.csv"]
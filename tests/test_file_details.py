@@ -0,0 +1,59 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from file_details import DetailsCache, read_details  # noqa: E402
+
+
+def test_read_details(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("bonjour")
+    details = read_details(str(path))
+    assert details.size == 7
+    assert details.mime == "text/plain"
+    assert details.error is None
+    missing = read_details(str(tmp_path / "absent.txt"))
+    assert missing.size is None
+    assert missing.error
+
+
+def test_entries_expire():
+    cache = DetailsCache(max_age=0.05)
+    details = read_details(__file__)
+    cache.put(details)
+    assert cache.get(__file__) is details
+    time.sleep(0.1)
+    assert cache.get(__file__) is None
+
+
+def test_least_recently_used_is_evicted(tmp_path):
+    cache = DetailsCache(max_entries=2)
+    paths = [str(tmp_path / name) for name in ("a", "b", "c")]
+    cache.put(read_details(paths[0]))
+    cache.put(read_details(paths[1]))
+    # Lire « a » le rend plus récent que « b »
+    cache.get(paths[0])
+    cache.put(read_details(paths[2]))
+    assert cache.get(paths[1]) is None
+    assert cache.get(paths[0]) is not None
+    assert cache.get(paths[2]) is not None
+
+
+def test_invalidation(tmp_path):
+    cache = DetailsCache()
+    inside = [os.path.join(str(tmp_path), "d", "x"), os.path.join(str(tmp_path), "d", "sub", "y")]
+    sibling = os.path.join(str(tmp_path), "dd", "z")
+    for path in inside + [sibling]:
+        cache.put(read_details(path))
+    cache.invalidate(sibling)
+    assert cache.get(sibling) is None
+    cache.put(read_details(sibling))
+    cache.invalidate_tree(os.path.join(str(tmp_path), "d") + os.sep)
+    assert [cache.get(path) for path in inside] == [None, None]
+    # Préfixe commun sans être dans le dossier : conservé
+    assert cache.get(sibling) is not None
+    cache.clear()
+    assert cache.get(sibling) is None
@@ -0,0 +1,111 @@
+import os
+import shutil
+
+from file_index import FileIndex
+from query import compile_query
+from search_core import search
+
+
+def make_tree(root):
+    for relative in ("a/b", "c"):
+        (root / relative).mkdir(parents=True)
+    for relative in ("top.txt", "a/rapport.pdf", "a/b/rapport_final.txt", "c/notes.md"):
+        (root / relative).write_text(relative)
+
+
+# Date du dossier changée explicitement : le rafraîchissement ne dépend pas de la résolution de l'horloge
+def bump(path, seconds=10):
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + seconds))
+
+
+def names(index, root, query=None):
+    return sorted(entry.name for entry in index.query(str(root), query))
+
+
+def test_refresh_only_relists_changed_directories(tmp_path):
+    root = tmp_path / "arbre"
+    root.mkdir()
+    make_tree(root)
+    index = FileIndex(str(tmp_path / "index.db"))
+    try:
+        assert not index.is_indexed(str(root))
+        assert index.refresh([str(root)]) == 4
+        assert index.is_indexed(str(root))
+        assert names(index, root) == ["notes.md", "rapport.pdf", "rapport_final.txt", "top.txt"]
+        assert index.refresh([str(root)]) == 0
+
+        (root / "a" / "b" / "nouveau.txt").write_text("")
+        bump(root / "a" / "b")
+        assert index.refresh([str(root)]) == 1
+        assert "nouveau.txt" in names(index, root)
+
+        shutil.rmtree(root / "c")
+        bump(root)
+        assert index.refresh([str(root)]) == 1
+        assert "notes.md" not in names(index, root)
+        assert index.count_files([str(root)]) == 4
+        # Un rafraîchissement complet reliste tout
+        assert index.refresh([str(root)], full=True) == 3
+    finally:
+        index.close()
+
+
+def test_interrupted_refresh_writes_no_partial_listing(tmp_path):
+    root = tmp_path / "arbre"
+    root.mkdir()
+    make_tree(root)
+    index = FileIndex(str(tmp_path / "index.db"))
+    try:
+        assert index.refresh([str(root)], is_running=lambda: False) == 0
+        assert not index.is_indexed(str(root))
+        assert names(index, root) == []
+    finally:
+        index.close()
+
+
+def test_update_path_and_touch_dir(tmp_path):
+    root = tmp_path / "arbre"
+    root.mkdir()
+    make_tree(root)
+    index = FileIndex(str(tmp_path / "index.db"))
+    try:
+        index.refresh([str(root)])
+        (root / "c" / "ajout.txt").write_text("")
+        index.update_path(str(root / "c" / "ajout.txt"))
+        index.touch_dir(str(root / "c"))
+        assert "ajout.txt" in names(index, root)
+        assert index.refresh([str(root)]) == 0
+        shutil.rmtree(root / "a")
+        index.update_path(str(root / "a"))
+        assert names(index, root) == ["ajout.txt", "notes.md", "top.txt"]
+    finally:
+        index.close()
+
+
+def test_query_narrows_candidates(tmp_path):
+    root = tmp_path / "arbre"
+    root.mkdir()
+    make_tree(root)
+    index = FileIndex(str(tmp_path / "index.db"))
+    try:
+        index.refresh([str(root)])
+        loose = compile_query("rapport", looseMatch=True)
+        assert names(index, root, loose) == ["rapport.pdf", "rapport_final.txt"]
+        assert index.count_candidates(str(root), loose) == 2
+        assert names(index, root, compile_query("rapport", ".pdf")) == ["rapport.pdf"]
+        assert names(index, root / "a" / "b") == ["rapport_final.txt"]
+    finally:
+        index.close()
+
+
+def test_index_search_matches_the_walk(tmp_path):
+    root = tmp_path / "arbre"
+    root.mkdir()
+    make_tree(root)
+    db_path = str(tmp_path / "index.db")
+    for options in ({"fileName": "rapport", "looseMatch": True}, {"fileFormat": ".txt", "looseMatch": True}):
+        walked = sorted(result.path for result in search([str(root)], **options))
+        indexed = sorted(result.path for result in search([str(root)], index_mode='refresh', index_path=db_path,
+                                                          **options))
+        assert indexed == walked
@@ -0,0 +1,72 @@
+import json
+
+import filefinder
+
+
+def make_tree(root):
+    (root / "a").mkdir()
+    (root / "a" / "rapport.txt").write_text("ligne\nTODO : finir\n")
+    (root / "a" / "copie.txt").write_text("ligne\nTODO : finir\n")
+    (root / "notes.md").write_text("rien")
+
+
+def run(capsysbinary, argv):
+    code = filefinder.main(argv)
+    return code, capsysbinary.readouterr().out
+
+
+def test_ndjson_output(tmp_path, capsysbinary):
+    make_tree(tmp_path)
+    code, out = run(capsysbinary, [str(tmp_path), "--name", "rapport"])
+    assert code == 0
+    records = [json.loads(line) for line in out.decode().splitlines()]
+    assert [record["path"] for record in records] == [str(tmp_path / "a" / "rapport.txt")]
+    assert records[0]["size"] == len("ligne\nTODO : finir\n")
+    assert "matches" not in records[0]
+
+
+def test_lines_and_null_output(tmp_path, capsysbinary):
+    make_tree(tmp_path)
+    code, out = run(capsysbinary, [str(tmp_path), "--format", ".txt", "--loose", "--output", "lines"])
+    assert code == 0
+    assert sorted(out.decode().splitlines()) == [str(tmp_path / "a" / "copie.txt"), str(tmp_path / "a" / "rapport.txt")]
+    code, out = run(capsysbinary, [str(tmp_path), "--format", ".md", "--loose", "-0"])
+    assert out == str(tmp_path / "notes.md").encode() + b"\0"
+
+
+def test_content_matches_and_limits(tmp_path, capsysbinary):
+    make_tree(tmp_path)
+    code, out = run(capsysbinary, [str(tmp_path), "--content", "todo", "--workers", "1"])
+    records = [json.loads(line) for line in out.decode().splitlines()]
+    assert len(records) == 2
+    assert records[0]["matches"] == [{"line": 2, "offset": 6, "text": "TODO : finir"}]
+    code, out = run(capsysbinary, [str(tmp_path), "--format", ".txt", "--loose", "-n", "1", "--output", "lines"])
+    assert len(out.splitlines()) == 1
+
+
+def test_duplicates_groups(tmp_path, capsysbinary):
+    make_tree(tmp_path)
+    code, out = run(capsysbinary, [str(tmp_path), "--duplicates"])
+    assert code == 0
+    [group] = [json.loads(line) for line in out.decode().splitlines()]
+    assert sorted(group["paths"]) == [str(tmp_path / "a" / "copie.txt"), str(tmp_path / "a" / "rapport.txt")]
+    code, out = run(capsysbinary, [str(tmp_path), "--duplicates", "--output", "lines"])
+    # Groupes séparés par un enregistrement vide
+    assert out.endswith(b"\n\n")
+
+
+def test_settings_file_overridden_by_options(tmp_path, capsysbinary):
+    make_tree(tmp_path)
+    settings = tmp_path / "recherche.json"
+    settings.write_text(json.dumps({"directories": [str(tmp_path)], "fileName": "notes", "looseMatch": False}))
+    code, out = run(capsysbinary, ["--settings", str(settings), "--output", "lines"])
+    assert out.decode().splitlines() == [str(tmp_path / "notes.md")]
+    code, out = run(capsysbinary, ["--settings", str(settings), "--name", "copie", "--output", "lines"])
+    assert out.decode().splitlines() == [str(tmp_path / "a" / "copie.txt")]
+
+
+def test_exit_codes(tmp_path, capsysbinary):
+    make_tree(tmp_path)
+    assert run(capsysbinary, [str(tmp_path), "--name", "absent"]) == (1, b"")
+    assert filefinder.main([]) == 2
+    assert filefinder.main([str(tmp_path), "--syntax", "regex", "--name", "("]) == 2
@@ -0,0 +1,90 @@
+import random
+
+from fuzzy import TopK, fuzzy_score, subsequence_pattern
+from query import compile_query
+from search_core import SearchResult, rank_results
+
+
+def ranking(needle, names):
+    scored = [(fuzzy_score(needle, name), name) for name in names]
+    return [name for score, name in sorted(scored, key=lambda pair: -pair[0]) if score is not None]
+
+
+def test_exact_then_prefix_then_scattered():
+    names = ["file_search.py", "fsearch.py", "fsearch_test.py", "f_s_e_a_r_c_h.txt", "fastresearch.md"]
+    order = ranking("fsearch", names)
+    assert order[:2] == ["fsearch.py", "fsearch_test.py"]
+    assert order.index("file_search.py") < order.index("fastresearch.md")
+
+
+def test_consecutive_letters_and_word_starts_score_higher():
+    assert fuzzy_score("main", "main.py") > fuzzy_score("main", "my_animation.py")
+    assert fuzzy_score("fs", "file_search") > fuzzy_score("fs", "offset")
+    assert fuzzy_score("fs", "FileSearch") > fuzzy_score("fs", "fileseArch")
+    assert fuzzy_score("rep", "report.txt") > fuzzy_score("rep", "ab_report.txt")
+
+
+def test_shorter_names_win_ties():
+    assert fuzzy_score("abc", "abc_x.txt") > fuzzy_score("abc", "abc_xyz.txt")
+
+
+def test_no_match():
+    assert fuzzy_score("xyz", "rapport.pdf") is None
+    assert fuzzy_score("cba", "abc") is None
+    assert fuzzy_score("abcdef", "abc") is None
+    assert subsequence_pattern("xyz").search("rapport.pdf") is None
+    assert not compile_query("xyz", nameSyntax='fuzzy').match_name("rapport.pdf")
+
+
+def test_empty_query():
+    assert fuzzy_score("", "n'importe quoi") == 0
+    assert compile_query("", nameSyntax='fuzzy').match_name("n'importe quoi")
+
+
+def test_score_exists_exactly_for_subsequences():
+    rng = random.Random(4)
+    for _ in range(500):
+        name = "".join(rng.choice("abcAB_.") for _ in range(rng.randint(1, 10)))
+        needle = "".join(rng.choice("ab_") for _ in range(rng.randint(1, 4)))
+        is_subsequence = subsequence_pattern(needle).search(name) is not None
+        assert (fuzzy_score(needle, name) is not None) == is_subsequence, (needle, name)
+
+
+def test_topk_keeps_the_k_best():
+    best = TopK(3)
+    values = [5, 1, 9, 7, 3, 8, 2]
+    for value in values:
+        best.push(value, f"r{value}")
+    assert len(best) == 3
+    assert best.seen == len(values)
+    assert best.items() == [(9, "r9"), (8, "r8"), (7, "r7")]
+    assert best.threshold == 7
+    assert TopK(3).threshold is None
+
+
+def test_topk_ties_keep_arrival_order():
+    best = TopK(2)
+    for name in ("premier", "deuxième", "troisième"):
+        best.push(1.0, name)
+    assert best.items() == [(1.0, "premier"), (1.0, "deuxième")]
+    best.push(2.0, "meilleur")
+    assert best.items() == [(2.0, "meilleur"), (1.0, "premier")]
+
+
+def test_topk_bound_over_many_items():
+    best = TopK(10)
+    rng = random.Random(1)
+    values = [rng.random() for _ in range(10000)]
+    for value in values:
+        best.push(value, value)
+    assert len(best) == 10
+    assert [value for value, _ in best.items()] == sorted(values, reverse=True)[:10]
+
+
+def test_rank_results_orders_by_score():
+    query = compile_query("fsearch", nameSyntax='fuzzy')
+    paths = ["/a/fastresearch.md", "/a/fsearch.py", "/b/file_search.py", "/b/notes.txt"]
+    results = [SearchResult(path, 1, 0.0) for path in paths]
+    ranked = list(rank_results(results, query, top_k=2))
+    assert [result.path for result in ranked] == ["/a/fsearch.py", "/b/file_search.py"]
+    assert ranked[0].score > ranked[1].score
@@ -0,0 +1,64 @@
+from file_index import IndexBackend
+from progress import ProgressTracker, estimate_files
+from pruning import PruneRules
+from query import compile_query
+from search_core import iter_matches
+
+
+def make_tree(root):
+    (root / "a").mkdir()
+    (root / "node_modules" / "x").mkdir(parents=True)
+    for i in range(5):
+        (root / "a" / f"f{i}.txt").write_text("")
+    for i in range(50):
+        (root / "node_modules" / "x" / f"g{i}.txt").write_text("")
+
+
+def test_estimate_applies_prune_rules(tmp_path):
+    make_tree(tmp_path)
+    assert estimate_files(str(tmp_path), probes=200) > 5
+    assert estimate_files(str(tmp_path), probes=200, prune=PruneRules(["node_modules"])) == 5
+
+
+def test_estimate_does_not_mark_directories_visited(tmp_path):
+    make_tree(tmp_path)
+    prune = PruneRules(follow_symlinks=True)
+    estimate_files(str(tmp_path), probes=200, prune=prune)
+    assert prune.root(str(tmp_path)) is not None
+
+
+def test_tracker_counts_per_root_and_finishes(tmp_path):
+    updates = []
+    tracker = ProgressTracker([str(tmp_path / "a"), str(tmp_path / "b")], on_update=updates.append, interval=0)
+    tracker.dir_done(str(tmp_path / "a"), 3)
+    tracker.dir_done(str(tmp_path / "a" / "sub"), 2)
+    tracker.dir_done(str(tmp_path / "b"), 4, dirs=5)
+    tracker.estimated_total = 18
+    snapshot = tracker.snapshot()
+    assert (snapshot["dirs"], snapshot["files"]) == (7, 9)
+    assert snapshot["fraction"] == 0.5
+    assert snapshot["roots"][str(tmp_path / "a")]["files"] == 5
+    assert snapshot["roots"][str(tmp_path / "b")]["dirs"] == 5
+    tracker.finish()
+    assert updates[-1]["fraction"] == 1.0
+    assert updates[-1]["eta"] == 0.0
+
+
+def test_exact_total_wins_over_estimate(tmp_path):
+    make_tree(tmp_path)
+    tracker = ProgressTracker([str(tmp_path)])
+    tracker.set_total(7, 'index')
+    tracker.estimate_async(db_path=str(tmp_path / "absent.db")).join()
+    assert (tracker.estimated_total, tracker.estimate_source) == (7, 'index')
+
+
+def test_index_progress_counts_examined_rows(tmp_path):
+    make_tree(tmp_path)
+    query = compile_query("", ".txt", looseMatch=True)
+    backend = IndexBackend(str(tmp_path / "index.db"), query=query)
+    backend.prune = PruneRules(["node_modules"])
+    backend.progress = tracker = ProgressTracker([str(tmp_path)])
+    found = list(iter_matches(backend, [str(tmp_path)], query))
+    assert len(found) == 5
+    # Les lignes écartées par l'élagage sont examinées : même unité que le total
+    assert tracker.estimated_total == tracker.files == 55
@@ -0,0 +1,157 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from pruning import PruneRules, parse_patterns, parse_rules
+from search_core import search
+
+
+def make_tree(root, files):
+    for relative in files:
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+
+
+def found(root, backend='scandir', **options):
+    return sorted(os.path.relpath(result.path, root).replace(os.sep, '/')
+                  for result in search([str(root)], looseMatch=True, backend=backend, **options))
+
+
+TREE = ["README.md", "build/out.o", "src/build/gen.c", "src/main.c", "src/app.log", "logs/a.log",
+        "node_modules/pkg/index.js", "docs/guide/tmp/draft.md", "docs/tmp/note.md", "keep.log"]
+
+
+def test_unanchored_pattern_matches_at_any_depth(tmp_path):
+    make_tree(tmp_path, TREE)
+    result = found(tmp_path, exclude=["build"])
+    assert "build/out.o" not in result and "src/build/gen.c" not in result
+    assert "src/main.c" in result
+
+
+def test_leading_slash_anchors_to_the_root(tmp_path):
+    make_tree(tmp_path, TREE)
+    result = found(tmp_path, exclude=["/build"])
+    assert "build/out.o" not in result
+    assert "src/build/gen.c" in result
+
+
+def test_middle_slash_and_double_star_anchor(tmp_path):
+    make_tree(tmp_path, TREE)
+    assert "docs/guide/tmp/draft.md" not in found(tmp_path, exclude=["docs/**/tmp"])
+    assert "docs/tmp/note.md" not in found(tmp_path, exclude=["docs/**/tmp"])
+    result = found(tmp_path, exclude=["docs/tmp"])
+    assert "docs/tmp/note.md" not in result
+    assert "docs/guide/tmp/draft.md" in result
+
+
+def test_trailing_slash_matches_directories_only(tmp_path):
+    make_tree(tmp_path, ["logs/a.log", "src/logs", "src/main.c"])
+    result = found(tmp_path, exclude=["logs/"])
+    assert "logs/a.log" not in result
+    assert "src/logs" in result
+
+
+def test_negation_reincludes_files(tmp_path):
+    make_tree(tmp_path, TREE)
+    result = found(tmp_path, exclude=["*.log", "!keep.log"])
+    assert "keep.log" in result
+    assert "src/app.log" not in result and "logs/a.log" not in result
+
+
+def test_rule_parsing():
+    rules = parse_rules(["# commentaire\n", "\n", "\\#fichier\n", "!important/  \n"])
+    assert len(rules) == 2
+    assert rules[0].regex.match("#fichier")
+    assert rules[1].negate and rules[1].dir_only and not rules[1].anchored
+    assert parse_patterns("node_modules, .git/;*.log\n") == ["node_modules", " .git/", "*.log"]
+
+
+def test_ignore_files_apply_to_their_own_subtree(tmp_path):
+    make_tree(tmp_path, ["a/x.tmp", "a/b/y.tmp", "a/b/keep.tmp", "c/z.tmp", "a/sub/w.txt", "top.tmp"])
+    (tmp_path / "a" / ".gitignore").write_text("*.tmp\n/sub\n")
+    (tmp_path / "a" / "b" / ".ignore").write_text("!keep.tmp\n")
+    result = found(tmp_path, ignore_files=True)
+    assert "a/x.tmp" not in result and "a/b/y.tmp" not in result
+    assert "a/b/keep.tmp" in result
+    assert "c/z.tmp" in result and "top.tmp" in result
+    assert "a/sub/w.txt" not in result
+    assert "a/x.tmp" in found(tmp_path)
+
+
+def test_max_depth(tmp_path):
+    make_tree(tmp_path, ["0.txt", "a/1.txt", "a/b/2.txt", "a/b/c/3.txt"])
+    assert found(tmp_path, max_depth=0) == ["0.txt"]
+    assert found(tmp_path, max_depth=1) == ["0.txt", "a/1.txt"]
+    assert len(found(tmp_path, max_depth=None)) == 4
+
+
+def test_one_filesystem_stops_at_other_devices():
+    rules = PruneRules(one_filesystem=True)
+    state = SimpleNamespace(depth=0, dev=1, rules=())
+
+    def entry(dev):
+        return SimpleNamespace(is_symlink=lambda: False, stat=lambda: SimpleNamespace(st_dev=dev, st_ino=dev))
+    assert rules.allow_dir("/racine/local", "local", state, entry(1)) is not None
+    assert rules.allow_dir("/racine/montage", "montage", state, entry(2)) is None
+    assert rules.key != PruneRules().key and rules.active and not PruneRules().active
+
+
+def test_one_filesystem_search(tmp_path):
+    make_tree(tmp_path, ["a/1.txt", "a/b/2.txt"])
+    assert found(tmp_path, one_filesystem=True) == found(tmp_path)
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="liens symboliques indisponibles")
+def test_symlink_loops_are_visited_once(tmp_path):
+    make_tree(tmp_path, ["a/1.txt", "a/b/2.txt"])
+    os.symlink(tmp_path / "a", tmp_path / "a" / "b" / "boucle")
+    assert found(tmp_path) == ["a/1.txt", "a/b/2.txt"]
+    assert found(tmp_path, follow_symlinks=True) == ["a/1.txt", "a/b/2.txt"]
+
+
+@pytest.mark.parametrize("backend", ['parallel', 'process'])
+def test_backends_prune_like_scandir(tmp_path, backend):
+    make_tree(tmp_path, TREE + [f"deep/{i}/x/y/z/{i}.log" for i in range(6)])
+    options = {"exclude": ["/build", "*.log", "!keep.log"], "max_depth": 5}
+    assert found(tmp_path, backend, **options) == found(tmp_path, **options)
+
+
+def linked_tree(root):
+    make_tree(root, ["t0/x/cible/partage.txt", "t1/x/autre.txt"])
+    os.symlink(root / "t0" / "x" / "cible", root / "t1" / "x" / "lien")
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="liens symboliques indisponibles")
+def test_process_workers_report_a_linked_directory_once(tmp_path):
+    import pickle
+    import queue
+    import threading
+
+    import process_scan
+
+    linked_tree(tmp_path)
+    prune = PruneRules(follow_symlinks=True)
+    rows = []
+    # Deux processus de parcours (chacun sa copie des règles), une sous-arborescence chacun
+    for task in ("t0", "t1"):
+        worker_prune = pickle.loads(pickle.dumps(prune))
+        path = str(tmp_path / task)
+        tasks, results = queue.Queue(), queue.Queue()
+        tasks.put((path, worker_prune.root(path)))
+        tasks.put(None)
+        process_scan._scan_worker(tasks, results, threading.Event(), None, None, worker_prune)
+        for message in iter(results.get, None):
+            rows.extend((row[0], message[4]) for row in message[0])
+    assert sorted(os.path.basename(path) for path, _ in rows) == ["autre.txt", "partage.txt", "partage.txt"]
+    owners = {}
+    kept = [path for path, identities in rows if not process_scan._seen_elsewhere(owners, identities, path)]
+    assert sorted(os.path.basename(path) for path in kept) == ["autre.txt", "partage.txt"]
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="liens symboliques indisponibles")
+def test_process_backend_follows_symlinks_without_duplicates(tmp_path):
+    linked_tree(tmp_path)
+    assert found(tmp_path, 'process', follow_symlinks=True) == found(tmp_path, follow_symlinks=True)
+    assert found(tmp_path, 'process', follow_symlinks=True) == ["t0/x/cible/partage.txt", "t1/x/autre.txt"]
@@ -0,0 +1,162 @@
+import datetime
+import itertools
+import os
+import pickle
+import time
+
+import pytest
+
+from query import compile_query, date_to_epoch, parse_extensions
+
+
+# Ancienne vérification, critère par critère (FileSearchThread.run avant la compilation des critères)
+def reference_match(name, size, mtime, fileName, fileFormat, minSize, maxSize, looseMatch, dateFrom, dateTo):
+    if fileFormat and not name.lower().endswith(fileFormat.lower()):
+        return False
+    stem = os.path.splitext(name)[0]
+    file_date = datetime.date.fromtimestamp(mtime)
+    return (((looseMatch and fileName.lower() in stem.lower()) or stem.lower() == fileName.lower()) and
+            minSize <= size <= maxSize and dateFrom <= file_date <= dateTo)
+
+
+def matches(query, name, size=0, mtime=None):
+    if mtime is None:
+        mtime = time.time()
+    return query.match_name(name) and query.match_meta(size, mtime)
+
+
+def test_strict_name_ignores_case_and_extension():
+    query = compile_query("Rapport")
+    assert query.match_name("rapport.pdf")
+    assert query.match_name("RAPPORT")
+    assert not query.match_name("rapport_final.pdf")
+    assert not query.match_name("mon rapport.pdf")
+
+
+def test_loose_name_looks_only_at_the_stem():
+    query = compile_query("port", looseMatch=True)
+    assert query.match_name("rapport.pdf")
+    assert query.match_name("Portable.txt")
+    assert not query.match_name("notes.port")
+
+
+def test_empty_name():
+    assert compile_query("", looseMatch=True).match_name("n'importe quoi.txt")
+    assert not compile_query("").match_name("fichier.txt")
+
+
+def test_extension_list():
+    assert parse_extensions(".png, .JPG;.gif |.bmp") == ('.png', '.jpg', '.gif', '.bmp')
+    assert parse_extensions("") is None
+    assert parse_extensions(" , ") is None
+    query = compile_query("", ".png,.jpg", looseMatch=True)
+    assert query.match_name("photo.PNG")
+    assert query.match_name("photo.jpg")
+    assert not query.match_name("photo.jpeg")
+    assert not query.match_name("png")
+
+
+def test_glob_syntax():
+    strict = compile_query("rap*.p?f", nameSyntax='glob')
+    assert strict.match_name("Rapport.pdf")
+    assert not strict.match_name("rapport.pdf.bak")
+    assert not strict.match_name("mon rapport.pdf")
+    loose = compile_query("rap*.p?f", looseMatch=True, nameSyntax='glob')
+    assert loose.match_name("mon rapport.pdf.bak")
+    assert compile_query("[ab]*", nameSyntax='glob').match_name("b.txt")
+    assert not compile_query("[ab]*", nameSyntax='glob').match_name("c.txt")
+
+
+def test_regex_syntax():
+    strict = compile_query(r"img_\d+\.jpe?g", nameSyntax='regex')
+    assert strict.match_name("IMG_0042.JPG")
+    assert not strict.match_name("IMG_0042.jpg.txt")
+    # Le motif porte sur le nom complet : sans l'extension, pas de correspondance stricte
+    assert not compile_query(r"img_\d+", nameSyntax='regex').match_name("img_1.jpg")
+    loose = compile_query(r"\d{4}", looseMatch=True, nameSyntax='regex')
+    assert loose.match_name("rapport 2024.pdf")
+    assert not loose.match_name("rapport.pdf")
+    with pytest.raises(ValueError):
+        compile_query("(", nameSyntax='regex')
+
+
+def test_unknown_syntax():
+    with pytest.raises(ValueError):
+        compile_query("x", nameSyntax='sql')
+
+
+def test_size_bounds_are_inclusive():
+    query = compile_query("", looseMatch=True, minSize=100, maxSize=200)
+    assert query.needs_meta
+    assert not query.match_meta(99, 0)
+    assert query.match_meta(100, 0)
+    assert query.match_meta(200, 0)
+    assert not query.match_meta(201, 0)
+    assert compile_query("", minSize=0).match_meta(10 ** 15, 0)
+    assert not compile_query("").needs_meta
+
+
+def test_date_bounds_cover_whole_days():
+    day = datetime.date(2024, 3, 10)
+    query = compile_query("", looseMatch=True, dateFrom=day, dateTo=day)
+    midnight = date_to_epoch(day)
+    assert query.match_meta(0, midnight)
+    assert query.match_meta(0, midnight + 23 * 3600 + 3599)
+    assert not query.match_meta(0, midnight - 1)
+    assert not query.match_meta(0, date_to_epoch(day + datetime.timedelta(days=1)))
+    only_from = compile_query("", looseMatch=True, dateFrom=day)
+    assert only_from.match_meta(0, time.time())
+    assert not only_from.match_meta(0, midnight - 1)
+
+
+def test_compiled_query_survives_pickling():
+    query = compile_query("rap*", ".pdf", 10, 20, True, datetime.date(2024, 1, 1), None, 'glob')
+    copy = pickle.loads(pickle.dumps(query))
+    assert copy.match_name("mon rapport.pdf")
+    assert copy.match_meta(15, time.time())
+    assert not copy.match_meta(25, time.time())
+
+
+def test_same_results_as_the_per_criterion_check():
+    names = ["rapport.pdf", "Rapport.PDF", "rapport_final.pdf", "mon rapport.txt", "rapport", ".bashrc",
+             "archive.tar.gz", "notes.txt", "RAPPORT.tar.gz", "photo.Jpg", "port.pdf"]
+    days = [datetime.date(2024, 1, 1) + datetime.timedelta(days=n) for n in (0, 1, 30, 31, 60)]
+    files = [(name, size, date_to_epoch(day) + seconds)
+             for name in names for size in (0, 100, 5000)
+             for day in days for seconds in (0, 43200, 86399)]
+    criteria = itertools.product(["rapport", "port", "RAPPORT", ""], [None, ".pdf", ".gz", ".jpg"],
+                                 [(0, float('inf')), (100, 100), (1, 5000)], [False, True],
+                                 [(days[1], days[3]), (datetime.date(1970, 1, 2), datetime.date(2100, 1, 1))])
+    checked = 0
+    for fileName, fileFormat, (minSize, maxSize), looseMatch, (dateFrom, dateTo) in criteria:
+        query = compile_query(fileName, fileFormat, minSize, None if maxSize == float('inf') else maxSize,
+                              looseMatch, dateFrom, dateTo)
+        for name, size, mtime in files:
+            expected = reference_match(name, size, mtime, fileName, fileFormat, minSize, maxSize,
+                                       looseMatch, dateFrom, dateTo)
+            assert matches(query, name, size, mtime) == expected, (name, size, mtime, fileName, fileFormat)
+            checked += expected
+    assert checked > 0
+
+
+def test_search_finds_what_the_old_walk_found(tmp_path):
+    from search_core import search
+    for relative, size in (("rapport.pdf", 10), ("a/Rapport.PDF", 500), ("a/rapport_final.pdf", 10),
+                           ("a/b/rapport.txt", 0), ("b/notes.pdf", 10), ("b/rapport.pdf", 3000)):
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * size)
+    dateFrom, dateTo = datetime.date(1970, 1, 2), datetime.date(2100, 1, 1)
+    cases = (("rapport", ".pdf", False, None), ("rapport", None, True, 1000),
+             ("", ".pdf", True, None), ("notes", None, False, None))
+    for fileName, fileFormat, looseMatch, maxSize in cases:
+        expected = set()
+        for root, dirs, files in os.walk(tmp_path):
+            for name in files:
+                path = os.path.join(root, name)
+                if reference_match(name, os.path.getsize(path), os.path.getmtime(path), fileName, fileFormat,
+                                   0, float('inf') if maxSize is None else maxSize, looseMatch, dateFrom, dateTo):
+                    expected.add(path)
+        found = {result.path for result in search([str(tmp_path)], fileName, fileFormat, 0, maxSize, looseMatch,
+                                                  dateFrom, dateTo)}
+        assert found == expected and expected
@@ -0,0 +1,44 @@
+from progress import ProgressTracker
+from query import compile_query
+from result_cache import ResultCache
+from search_core import iter_matches
+
+
+def make_tree(root):
+    for relative in ("a/rapport1.txt", "a/rapport2.txt", "a/notes.md", "b/rapport3.txt",
+                     "b/c/rapport4.txt", "rapport5.txt", "rapport6.txt"):
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+
+
+def run(cache, query, root):
+    backend = cache.backend(query)
+    progress = backend.progress = ProgressTracker([str(root)])
+    paths = sorted(result.path for result in iter_matches(backend, [str(root)], query))
+    return paths, progress.snapshot()
+
+
+def test_reused_directories_report_all_their_files(tmp_path):
+    make_tree(tmp_path)
+    cache = ResultCache()
+    query = compile_query("rapport", looseMatch=True)
+    first, first_progress = run(cache, query, tmp_path)
+    second, second_progress = run(cache, query, tmp_path)
+    assert len(first) == 6
+    assert second == first
+    assert cache.stats["dirs_reused"] == 4
+    assert first_progress["files"] == second_progress["files"] == 7
+    assert first_progress["dirs"] == second_progress["dirs"] == 4
+
+
+def test_modified_directory_is_rescanned(tmp_path):
+    make_tree(tmp_path)
+    cache = ResultCache()
+    query = compile_query("rapport", looseMatch=True)
+    run(cache, query, tmp_path)
+    (tmp_path / "b" / "rapport7.txt").write_text("x")
+    paths, progress = run(cache, query, tmp_path)
+    assert str(tmp_path / "b" / "rapport7.txt") in paths
+    assert cache.stats["dirs_rescanned"] >= 5
+    assert progress["files"] == 8
@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from result_filter import FilterEngine  # noqa: E402
+from result_model import ResultStore  # noqa: E402
+
+
+def make_store(paths):
+    store = ResultStore()
+    store.extend((path, 0, 0.0) for path in paths)
+    return store
+
+
+def visible(mask):
+    return [i for i, bit in enumerate(mask) if bit]
+
+
+PATHS = [
+    os.path.join("/projets", "Rapport", "notes.txt"),
+    os.path.join("/projets", "code", "RAPPORT_final.pdf"),
+    os.path.join("/projets", "code", "main.py"),
+    os.path.join("/autres", "rapide.md"),
+]
+
+
+def test_matches_names_and_directories_case_insensitively():
+    store = make_store(PATHS)
+    engine = FilterEngine()
+    engine.add(store)
+    assert visible(engine.compute("rapport", engine.generation)) == [0, 1]
+    assert visible(engine.compute("code", engine.generation)) == [1, 2]
+    # Un séparateur : le texte peut chevaucher dossier et nom
+    text = "code" + os.sep + "main"
+    assert visible(engine.compute(text, engine.generation)) == [2]
+
+
+def test_narrowing_reuses_previous_matches():
+    store = make_store(PATHS)
+    engine = FilterEngine()
+    engine.add(store)
+    assert visible(engine.compute("rap", engine.generation)) == [0, 1, 3]
+    # Seules les lignes qui contenaient « rap » sont réexaminées, plus celles arrivées depuis
+    store.extend([(os.path.join("/nouveau", "rapport2.txt"), 0, 0.0)])
+    engine.add(store)
+    engine.compute("rap", engine.generation)
+    previous, count = engine._history["rap"]
+    assert (previous, count) == ([0, 1, 3, 4], 5)
+    engine._history["rap"] = ([1], count)
+    # Historique volontairement faussé : prouve que le calcul part du résultat précédent
+    assert visible(engine.compute("rapport", engine.generation)) == [1]
+
+
+def test_stale_generation_is_not_remembered():
+    store = make_store(PATHS)
+    engine = FilterEngine()
+    engine.add(store)
+    old = engine.generation
+    engine.clear()
+    engine.add(store)
+    assert visible(engine.compute("main", old)) == [2]
+    assert "main" not in engine._history
+    assert engine.generation == old + 1
+
+
+def test_history_is_bounded():
+    store = make_store(PATHS)
+    engine = FilterEngine()
+    engine.add(store)
+    for i in range(FilterEngine.HISTORY_SIZE + 5):
+        engine.compute(f"x{i}", engine.generation)
+    assert len(engine._history) == FilterEngine.HISTORY_SIZE
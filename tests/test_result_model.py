@@ -0,0 +1,110 @@
+import os
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from PyQt5.QtCore import Qt  # noqa: E402
+
+from result_model import TYPE_IMAGE, TYPE_OTHER, TYPE_TEXT, ResultStore, ResultTableModel, split_path  # noqa: E402
+
+ROWS = [
+    (os.path.join("/data", "b.txt"), 30, 300.0),
+    (os.path.join("/data", "a.png"), 10, 100.0),
+    (os.path.join("/data", "sub", "c.bin"), 20, 200.0, "ligne 3"),
+]
+
+
+def shown(model):
+    return [model.path(row) for row in range(model.rowCount())]
+
+
+def test_append_keeps_rows_and_columns():
+    model = ResultTableModel()
+    model.appendRows(ROWS)
+    assert model.rowCount() == model.totalCount() == 3
+    assert shown(model) == [row[0] for row in ROWS]
+    assert list(model.store.types) == [TYPE_TEXT, TYPE_IMAGE, TYPE_OTHER]
+    assert model.data(model.index(0, model.COLUMN_SIZE)) == "0.03 Ko"
+    assert model.data(model.index(2, model.COLUMN_DETAIL)) == "ligne 3"
+    assert model.data(model.index(0, model.COLUMN_DETAIL)) == ""
+    assert model.fileInfo(1) == (ROWS[1][0], 10, 100.0)
+
+
+def test_sort_is_a_permutation_and_new_rows_go_last():
+    model = ResultTableModel()
+    model.appendRows(ROWS)
+    model.sort(model.COLUMN_SIZE)
+    assert shown(model) == [ROWS[1][0], ROWS[2][0], ROWS[0][0]]
+    model.sort(model.COLUMN_PATH, Qt.DescendingOrder)
+    assert shown(model) == sorted((row[0] for row in ROWS), reverse=True)
+    # Le stockage n'est pas déplacé
+    assert model.store.path(0) == ROWS[0][0]
+    model.appendRows([(os.path.join("/data", "0.txt"), 1, 1.0)])
+    assert shown(model)[-1] == os.path.join("/data", "0.txt")
+
+
+def test_filter_mask_and_predicate_for_new_rows():
+    model = ResultTableModel()
+    model.appendRows(ROWS)
+
+    def predicate(path):
+        return path.endswith(".txt")
+
+    model.setFilterMask(bytearray([1, 0, 0]), predicate)
+    assert shown(model) == [ROWS[0][0]]
+    model.appendRows([(os.path.join("/data", "d.txt"), 1, 1.0), (os.path.join("/data", "e.png"), 1, 1.0)])
+    assert shown(model) == [ROWS[0][0], os.path.join("/data", "d.txt")]
+    assert model.totalCount() == 5
+    # Masque plus court que le stockage : complété par le prédicat
+    model.setFilterMask(bytearray([0]), predicate)
+    assert shown(model) == [os.path.join("/data", "d.txt")]
+    model.setFilterMask(None)
+    assert model.rowCount() == 5
+
+
+def test_sort_and_filter_combine():
+    model = ResultTableModel()
+    model.appendRows(ROWS)
+    model.sort(model.COLUMN_MTIME, Qt.DescendingOrder)
+    model.setFilterMask(bytearray([1, 1, 0]), lambda path: True)
+    assert shown(model) == [ROWS[0][0], ROWS[1][0]]
+
+
+def test_remove_and_update_rows():
+    model = ResultTableModel()
+    model.appendRows(ROWS)
+    model.sort(model.COLUMN_SIZE)
+    model.removeStoreRows([1])
+    assert shown(model) == [ROWS[2][0], ROWS[0][0]]
+    assert model.store.details == {1: "ligne 3"}
+    model.updateStoreRows([(0, 99, 9.0, "nouveau")])
+    assert model.fileInfo(1) == (ROWS[0][0], 99, 9.0)
+    assert model.store.details[0] == "nouveau"
+    model.clear()
+    assert model.rowCount() == 0
+
+
+def test_store_keeps_each_directory_once():
+    store = ResultStore()
+    paths = [os.path.join("/data", "a.txt"), os.path.join("/data", "b.txt"),
+             os.path.join("/autre", "c.txt"), os.path.join("/data", "d.txt")]
+    store.extend((path, 1, 1.0) for path in paths)
+    assert store.dirs == [os.path.join("/data", ""), os.path.join("/autre", "")]
+    assert list(store.dir_ids) == [0, 0, 1, 0]
+    assert store.names == ["a.txt", "b.txt", "c.txt", "d.txt"]
+    assert [store.path(i) for i in range(len(store))] == paths
+    assert split_path("sans_dossier.txt") == ("", "sans_dossier.txt")
+
+
+def test_store_remove_returns_the_remap():
+    store = ResultStore()
+    store.extend([(os.path.join("/data", "a.txt"), 1, 1.0), (os.path.join("/data", "b.txt"), 2, 2.0, "l. 1"),
+                  (os.path.join("/autre", "c.txt"), 3, 3.0, "l. 2")])
+    remap = store.remove([0])
+    assert list(remap) == [-1, 0, 1]
+    assert [store.path(i) for i in range(len(store))] == [os.path.join("/data", "b.txt"), os.path.join("/autre", "c.txt")]
+    assert list(store.sizes) == [2, 3]
+    assert store.details == {0: "l. 1", 1: "l. 2"}
+    # La table des dossiers n'est pas compactée
+    assert len(store.dirs) == 2
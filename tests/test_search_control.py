@@ -0,0 +1,77 @@
+import threading
+import time
+
+from search_control import SearchControl
+from search_core import search
+
+
+def test_limit_stops_at_the_last_result():
+    control = SearchControl(max_results=3)
+    assert list(control.limit(iter(range(10)))) == [0, 1, 2]
+    assert control.stopped
+    assert control.reason == 'limit'
+    assert not control()
+
+
+def test_zero_means_unlimited():
+    control = SearchControl(max_results=0, deadline=0)
+    assert list(control.limit(iter(range(5)))) == [0, 1, 2, 3, 4]
+    assert control()
+    assert control.reason is None
+
+
+def test_deadline():
+    control = SearchControl(deadline=0.05)
+    assert control()
+    time.sleep(0.1)
+    assert not control()
+    assert control.reason == 'deadline'
+
+
+def test_cancel_keeps_the_first_reason():
+    control = SearchControl(max_results=1)
+    list(control.limit(iter(range(3))))
+    control.cancel()
+    assert control.reason == 'limit'
+
+
+def test_parent_is_running():
+    running = [True]
+    control = SearchControl(is_running=lambda: running[0])
+    assert control()
+    running[0] = False
+    assert not control()
+    assert control.reason == 'cancelled'
+
+
+def test_pause_blocks_until_resume_and_does_not_count_against_the_deadline():
+    control = SearchControl(deadline=0.3)
+    control.pause()
+    assert control.paused
+    answers = []
+    worker = threading.Thread(target=lambda: answers.append(control()))
+    worker.start()
+    time.sleep(0.4)
+    # Toujours bloqué : la pause suspend le thread qui consulte le contrôle
+    assert answers == []
+    control.resume()
+    worker.join(2)
+    assert answers == [True]
+    assert not control.paused
+
+
+def test_stop_releases_a_paused_thread():
+    control = SearchControl()
+    control.pause()
+    answers = []
+    worker = threading.Thread(target=lambda: answers.append(control()))
+    worker.start()
+    control.cancel()
+    worker.join(2)
+    assert answers == [False]
+
+
+def test_search_honours_max_results(tmp_path):
+    for i in range(20):
+        (tmp_path / f"f{i}.txt").write_text("")
+    assert len(list(search([str(tmp_path)], fileFormat=".txt", looseMatch=True, max_results=5))) == 5
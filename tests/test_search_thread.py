@@ -0,0 +1,72 @@
+import datetime
+import os
+
+import pytest
+
+pytest.importorskip("PyQt5")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import main  # noqa: E402
+
+FROM = datetime.date(1970, 1, 1)
+TO = datetime.date.today() + datetime.timedelta(days=1)
+
+
+def make_tree(root, count):
+    for i in range(count):
+        (root / f"d{i % 3}").mkdir(exist_ok=True)
+        (root / f"d{i % 3}" / f"rapport{i}.txt").write_text("x" * i)
+
+
+def run(thread):
+    batches = []
+    single = []
+    complete = []
+    thread.files_found_signal.connect(batches.append)
+    thread.file_found_signal.connect(single.append)
+    thread.search_complete_signal.connect(complete.append)
+    # Exécuté dans le thread du test : les signaux sont livrés immédiatement
+    thread.run()
+    return batches, single, complete
+
+
+def test_results_are_delivered_in_bounded_batches(tmp_path):
+    make_tree(tmp_path, 25)
+    thread = main.FileSearchThread([str(tmp_path)], "rapport", None, 0, None, True, FROM, TO,
+                                   batch_size=10, batch_interval=60)
+    batches, single, complete = run(thread)
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert single == []
+    assert complete == [True]
+    rows = [row for batch in batches for row in batch]
+    assert sorted(row[0] for row in rows) == sorted(str(path) for path in tmp_path.glob("*/*.txt"))
+    assert all(row[1] == os.path.getsize(row[0]) for row in rows)
+    assert thread.delivery_stats["signals"] == 3
+    assert thread.delivery_stats["results"] == 25
+
+
+def test_pending_batch_is_sent_after_the_interval(tmp_path):
+    make_tree(tmp_path, 4)
+    thread = main.FileSearchThread([str(tmp_path)], "rapport", None, 0, None, True, FROM, TO,
+                                   batch_size=100, batch_interval=0)
+    batches, _, _ = run(thread)
+    # Intervalle nul : chaque résultat part dès l'entrée suivante examinée
+    assert len(batches) > 1
+    assert sum(len(batch) for batch in batches) == 4
+
+
+def test_without_batch_size_one_signal_per_file(tmp_path):
+    make_tree(tmp_path, 3)
+    thread = main.FileSearchThread([str(tmp_path)], "rapport", None, 0, None, True, FROM, TO)
+    batches, single, complete = run(thread)
+    assert batches == []
+    assert len(single) == 3
+    assert complete == [True]
+
+
+def test_no_result_still_completes(tmp_path):
+    make_tree(tmp_path, 3)
+    thread = main.FileSearchThread([str(tmp_path)], "absent", None, 0, None, False, FROM, TO, batch_size=10)
+    batches, _, complete = run(thread)
+    assert batches == []
+    assert complete == [False]
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from search_core import SearchResult
+from search_watch import ResultDelta, SearchWatch, diff_results, watch_from_settings
+
+
+def test_diff_results():
+    previous = {"/a": (1, 1.0), "/b": (2, 2.0), "/c": (3, 3.0)}
+    results = [SearchResult("/a", 1, 1.0), SearchResult("/b", 20, 2.0), SearchResult("/d", 4, 4.0)]
+    current, delta = diff_results(previous, results)
+    assert current == {"/a": (1, 1.0), "/b": (20, 2.0), "/d": (4, 4.0)}
+    assert [result.path for result in delta.added] == ["/d"]
+    assert delta.removed == ["/c"]
+    assert [result.path for result in delta.changed] == ["/b"]
+    assert delta.summary() == "1 nouveau, 1 supprimé, 1 modifié"
+    assert not ResultDelta([], [], [])
+    assert ResultDelta([], [], []).summary() == "aucun changement"
+
+
+def test_checks_report_only_the_difference(tmp_path):
+    for name in ("a.log", "b.log", "c.txt"):
+        (tmp_path / name).write_text("x")
+    watch = SearchWatch({"directories": [str(tmp_path)], "fileFormat": ".log", "looseMatch": True})
+    first = watch.check()
+    assert sorted(os.path.basename(result.path) for result in first.added) == ["a.log", "b.log"]
+    assert not watch.check()
+    (tmp_path / "a.log").unlink()
+    (tmp_path / "d.log").write_text("x")
+    delta = watch.check()
+    assert [os.path.basename(result.path) for result in delta.added] == ["d.log"]
+    assert delta.removed == [str(tmp_path / "a.log")]
+    assert watch.checks == 3
+
+
+def test_snapshot_and_interrupted_check(tmp_path):
+    (tmp_path / "a.log").write_text("x")
+    known = {str(tmp_path / "a.log"): (1, os.path.getmtime(tmp_path / "a.log"))}
+    watch = watch_from_settings({"directories": [str(tmp_path)], "fileFormat": ".log", "looseMatch": True,
+                                 "watchInterval": 1}, snapshot=known)
+    assert watch.interval == 60
+    assert not watch.check()
+    assert watch.check(is_running=lambda: False) is None
+    assert watch.snapshot == known
+
+
+def test_invalid_settings(tmp_path):
+    settings = {"directories": [str(tmp_path)]}
+    with pytest.raises(ValueError):
+        SearchWatch(settings, mode='off')
+    with pytest.raises(ValueError):
+        SearchWatch(dict(settings, duplicates=True))
+    with pytest.raises(ValueError):
+        SearchWatch({"directories": []})
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import startup_trace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules chargés à la première recherche ou à la fin de la construction, pas à l'import de main
+DEFERRED = ("search_core", "file_index", "export", "search_watch", "result_cache", "pruning", "progress")
+
+
+def test_main_defers_search_modules():
+    pytest.importorskip("PyQt5")
+    code = "import sys, main; print(' '.join(name for name in %r if name in sys.modules))" % (DEFERRED,)
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    assert output.stdout.split() == []
+
+
+def test_marks_are_recorded_even_when_disabled(monkeypatch, capsys):
+    monkeypatch.setattr(startup_trace, "enabled", False)
+    monkeypatch.setattr(startup_trace, "marks", [])
+    first = startup_trace.mark("a")
+    second = startup_trace.mark("b")
+    assert [label for label, _ in startup_trace.marks] == ["a", "b"]
+    assert 0 <= first <= second
+    assert capsys.readouterr().err == ""
+    monkeypatch.setattr(startup_trace, "enabled", True)
+    startup_trace.mark("c")
+    assert "c" in capsys.readouterr().err
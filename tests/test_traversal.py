@@ -0,0 +1,118 @@
+import os
+import threading
+
+import pytest
+
+from pruning import PruneRules
+from traversal import BACKENDS, ParallelScandirBackend, ScandirBackend, WalkBackend, get_backend
+
+
+def make_tree(root):
+    for relative in ("a/b/c", "a/d", "e", "skip/deep"):
+        (root / relative).mkdir(parents=True, exist_ok=True)
+    files = ["top.txt", "a/one.py", "a/b/two.txt", "a/b/c/three.log", "a/d/four.txt", "e/five.md",
+             "skip/six.txt", "skip/deep/seven.txt"]
+    for relative in files:
+        (root / relative).write_text(relative)
+    # Lien symbolique vers un dossier : jamais suivi sans règle le demandant
+    os.symlink(root / "a", root / "link")
+    return {str(root / relative) for relative in files}
+
+
+def paths(backend, directories):
+    return sorted(entry.path for entry in backend.iter_roots([str(d) for d in directories]))
+
+
+def test_scandir_and_walk_find_the_same_files(tmp_path):
+    expected = make_tree(tmp_path)
+    # Le lien vers un dossier apparaît comme fichier pour os.walk, pas pour scandir
+    walk = [path for path in paths(WalkBackend(), [tmp_path]) if not path.endswith("link")]
+    assert walk == paths(ScandirBackend(), [tmp_path]) == sorted(expected)
+
+
+def test_scandir_entries_reuse_stat(tmp_path):
+    make_tree(tmp_path)
+    for entry in ScandirBackend().iter_files(str(tmp_path)):
+        assert entry.stat().st_size == len(os.path.relpath(entry.path, tmp_path))
+
+
+def test_backends_apply_the_same_prune_rules(tmp_path):
+    make_tree(tmp_path)
+    results = []
+    for name in ("walk", "scandir"):
+        backend = get_backend(name)
+        backend.prune = PruneRules(["skip", "*.log"], max_depth=2)
+        results.append([path for path in paths(backend, [tmp_path]) if not path.endswith("link")])
+    assert results[0] == results[1]
+    assert str(tmp_path / "a" / "b" / "two.txt") in results[0]
+    assert not any("skip" in path or path.endswith(".log") for path in results[0])
+
+
+def test_scandir_stops_when_asked(tmp_path):
+    make_tree(tmp_path)
+    seen = []
+    for entry in ScandirBackend().iter_files(str(tmp_path), is_running=lambda: len(seen) < 2):
+        seen.append(entry)
+    assert len(seen) == 2
+
+
+def test_unknown_backend():
+    assert set(BACKENDS) >= {"walk", "scandir"}
+    with pytest.raises(ValueError):
+        get_backend("inconnu")
+
+
+def test_parallel_finds_the_same_files_across_roots(tmp_path):
+    expected = make_tree(tmp_path)
+    roots = [tmp_path / "a", tmp_path / "e", tmp_path / "skip"]
+    for workers in (1, 3, 8):
+        assert paths(ParallelScandirBackend(workers=workers), roots) == paths(ScandirBackend(), roots)
+    assert paths(ParallelScandirBackend(workers=4), [tmp_path]) == sorted(expected)
+
+
+def test_parallel_applies_prune_rules_and_name_filter(tmp_path):
+    make_tree(tmp_path)
+    results = []
+    for backend in (ScandirBackend(), ParallelScandirBackend(workers=4)):
+        backend.prune = PruneRules(["skip"], follow_symlinks=True)
+        results.append(paths(backend, [tmp_path]))
+    assert results[0] == results[1]
+    backend = ParallelScandirBackend(workers=4)
+    backend.name_filter = lambda name: name.endswith(".txt")
+    assert sorted(os.path.basename(path) for path in paths(backend, [tmp_path / "a"])) == ["four.txt", "two.txt"]
+
+
+def test_parallel_releases_its_threads_when_abandoned(tmp_path):
+    make_tree(tmp_path)
+    before = threading.active_count()
+    entries = ParallelScandirBackend(workers=4).iter_roots([str(tmp_path)])
+    next(entries)
+    entries.close()
+    assert threading.active_count() == before
+
+
+def test_parallel_runs_on_one_backend_do_not_share_state(tmp_path):
+    make_tree(tmp_path)
+    backend = ParallelScandirBackend(workers=2)
+    backend.BATCH_SIZE = 1
+    first = backend.iter_roots([str(tmp_path / "a")])
+    second = backend.iter_roots([str(tmp_path / "skip")])
+    found = [next(first), next(second)]
+    found += list(first) + list(second)
+    assert sorted(entry.path for entry in found) == paths(ScandirBackend(), [tmp_path / "a", tmp_path / "skip"])
+
+
+def test_process_backend_matches_scandir(tmp_path):
+    from search_core import search
+
+    for i in range(3):
+        for depth in range(5):
+            directory = tmp_path / f"r{i}" / "/".join(f"d{level}" for level in range(depth))
+            directory.mkdir(parents=True, exist_ok=True)
+            (directory / f"rapport{depth}.txt").write_text("x" * depth)
+            (directory / f"autre{depth}.log").write_text("y")
+    options = {"fileName": "rapport", "looseMatch": True, "minSize": 2}
+    found = [sorted(result.path for result in search([str(tmp_path)], backend=backend, workers=2, **options))
+             for backend in ("scandir", "process")]
+    assert found[0] == found[1]
+    assert len(found[0]) == 9
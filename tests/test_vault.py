@@ -0,0 +1,210 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("cryptography")
+from cryptography.fernet import Fernet, InvalidToken  # noqa: E402
+
+import vault  # noqa: E402
+from vault import VaultLog, derive_key, legacy_params  # noqa: E402
+
+# Dérivation rapide : seul le format du coffre est testé ici
+FAST = {"kdf": 'pbkdf2', "iterations": 1000, "salt": "c2VsLWRlLXRlc3Q="}
+OTHER = {"kdf": 'pbkdf2', "iterations": 1000, "salt": "YXV0cmUtc2Vs"}
+
+
+def fail_replace(*args):
+    raise OSError(28, "No space left on device")
+
+
+def open_vault(path, password="maître"):
+    log = VaultLog(str(path))
+    params = log.read_header()
+    log.unlock(derive_key(password, params or FAST), params or FAST)
+    return log
+
+
+def new_vault(path, passwords, password="maître"):
+    log = VaultLog(str(path))
+    log.unlock(derive_key(password, FAST), FAST)
+    log.compact(passwords)
+    return log
+
+
+def test_append_replay_round_trip(tmp_path):
+    path = tmp_path / "passwords.dat"
+    passwords = {"a": "1"}
+    log = new_vault(path, passwords)
+    passwords["b"] = "2"
+    log.append(passwords, "b")
+    passwords["a"] = "3"
+    log.append(passwords, "a")
+    del passwords["b"]
+    log.append(passwords, "b")
+    reloaded = open_vault(path)
+    assert reloaded.load() == {"a": "3"}
+    assert reloaded.records == 4
+    assert list(reloaded.replay()) == [("a", "1"), ("b", "2"), ("a", "3"), ("b", None)]
+
+
+def test_append_writes_only_one_record(tmp_path):
+    path = tmp_path / "passwords.dat"
+    passwords = {f"site{i}": "x" * 12 for i in range(100)}
+    log = new_vault(path, passwords)
+    size = os.path.getsize(path)
+    passwords["nouveau"] = "y"
+    log.append(passwords, "nouveau")
+    assert os.path.getsize(path) - size < 200
+
+
+def test_torn_tail_is_ignored_then_overwritten(tmp_path):
+    path = tmp_path / "passwords.dat"
+    new_vault(path, {"a": "1", "b": "2"})
+    with open(path, "ab") as file:
+        file.write(b"gAAAAABincomplet")
+    log = open_vault(path)
+    passwords = log.load()
+    assert passwords == {"a": "1", "b": "2"}
+    passwords["c"] = "3"
+    log.append(passwords, "c")
+    assert open_vault(path).load() == {"a": "1", "b": "2", "c": "3"}
+    assert b"incomplet" not in path.read_bytes()
+
+
+def test_unreadable_record_in_the_middle_is_an_error(tmp_path):
+    path = tmp_path / "passwords.dat"
+    log = new_vault(path, {"a": "1"})
+    log.append({"a": "1", "b": "2"}, "b")
+    lines = path.read_bytes().split(b"\n")
+    lines[1] = Fernet(Fernet.generate_key()).encrypt(b"{}")
+    path.write_bytes(b"\n".join(lines))
+    with pytest.raises(ValueError):
+        open_vault(path).load()
+
+
+def test_wrong_password_on_empty_vault(tmp_path):
+    path = tmp_path / "passwords.dat"
+    new_vault(path, {})
+    with pytest.raises(InvalidToken):
+        open_vault(path, "faux").load()
+    assert open_vault(path).load() == {}
+
+
+def test_compaction_when_stale_records_dominate(tmp_path):
+    path = tmp_path / "passwords.dat"
+    passwords = {"a": "0"}
+    log = new_vault(path, passwords)
+    for i in range(vault.COMPACT_MIN_RECORDS * 2):
+        passwords["a"] = str(i)
+        log.append(passwords, "a")
+    assert log.records <= vault.COMPACT_MIN_RECORDS + 1
+    assert open_vault(path).load() == passwords
+
+
+@pytest.mark.parametrize("version", [0, 1])
+def test_legacy_formats_are_migrated(tmp_path, version):
+    path = tmp_path / "passwords.dat"
+    params = legacy_params(b"ancien-sel")
+    key = derive_key("maître", params)
+    blob = Fernet(key).encrypt(json.dumps({"a": "1"}).encode())
+    if version == 1:
+        blob = json.dumps({"vault": 1, "kdf": params}).encode() + b"\n" + blob
+    path.write_bytes(blob)
+
+    log = VaultLog(str(path))
+    header_params = log.read_header()
+    assert log.version == version
+    assert header_params == (params if version == 1 else None)
+    log.unlock(key, params)
+    passwords = log.load()
+    assert passwords == {"a": "1"}
+    passwords["b"] = "2"
+    log.append(passwords, "b")
+
+    migrated = VaultLog(str(path))
+    assert migrated.read_header() == params
+    assert migrated.version == vault.VAULT_VERSION
+    migrated.unlock(key, params)
+    assert migrated.load() == {"a": "1", "b": "2"}
+
+
+def test_rekey(tmp_path):
+    path = tmp_path / "passwords.dat"
+    log = new_vault(path, {"a": "1"})
+    log.compact({"a": "1"}, derive_key("nouveau", OTHER), OTHER)
+    assert log.kdf_params == OTHER
+    log.append({"a": "1", "b": "2"}, "b")
+    reloaded = VaultLog(str(path))
+    assert reloaded.read_header() == OTHER
+    reloaded.unlock(derive_key("nouveau", OTHER), OTHER)
+    assert reloaded.load() == {"a": "1", "b": "2"}
+
+
+def test_failed_rekey_keeps_the_old_key(tmp_path, monkeypatch):
+    path = tmp_path / "passwords.dat"
+    passwords = {"s1": "1", "s2": "2"}
+    log = new_vault(path, passwords)
+    monkeypatch.setattr(vault.os, "replace", fail_replace)
+    with pytest.raises(OSError):
+        log.compact(passwords, derive_key("nouveau", OTHER), OTHER)
+    monkeypatch.undo()
+    assert log.kdf_params == FAST
+    assert [name for name in os.listdir(tmp_path) if name.startswith(".vault-")] == []
+
+    for site in ("s3", "s4"):
+        passwords[site] = site
+        log.append(passwords, site)
+    assert open_vault(path).load() == passwords
+
+
+def test_password_manager_keeps_old_key_when_rekey_fails(tmp_path, monkeypatch):
+    pytest.importorskip("PyQt5")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+    import Mdp
+
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    warnings = []
+    monkeypatch.setattr(QMessageBox, "warning", staticmethod(lambda *args: warnings.append(args[2])))
+    window = Mdp.PasswordManager()
+    path = tmp_path / "passwords.dat"
+    window.password_file = str(path)
+    window.vault = new_vault(path, {"s1": "1"})
+    window.passwords = {"s1": "1"}
+    window.encryption_key = derive_key("maître", FAST)
+    window.kdf_params = FAST
+
+    monkeypatch.setattr(vault.os, "replace", fail_replace)
+    window.rekeyReady(derive_key("nouveau", OTHER), OTHER)
+    monkeypatch.undo()
+    assert warnings
+    assert window.kdf_params == FAST
+    assert window.encryption_key == derive_key("maître", FAST)
+
+    window.passwords["s2"] = "2"
+    window.saveRecord("s2")
+    assert open_vault(path).load() == {"s1": "1", "s2": "2"}
+
+
+def test_password_manager_refuses_legacy_vault_without_salt(tmp_path, monkeypatch):
+    pytest.importorskip("PyQt5")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+    import Mdp
+
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    warnings = []
+    monkeypatch.setattr(QMessageBox, "warning", staticmethod(lambda *args: warnings.append(args[2])))
+    derivations = []
+    window = Mdp.PasswordManager()
+    monkeypatch.setattr(window, "startKeyDerivation", lambda *args: derivations.append(args))
+    path = tmp_path / "passwords.dat"
+    path.write_bytes(Fernet(Fernet.generate_key()).encrypt(b"{}"))
+    window.vault = VaultLog(str(path))
+    window.salt = None
+    window.masterPasswordInput.setText("maître")
+    window.unlock()
+    assert len(warnings) == 1
+    assert derivations == []
+    assert window.encryption_key is None
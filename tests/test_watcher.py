@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+
+import watcher
+from file_index import FileIndex
+
+pytestmark = pytest.mark.skipif(not watcher.is_supported(), reason="inotify indisponible")
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def start(directories, debounce=0.05, max_delay=0.2, **options):
+    live = watcher.InotifyWatcher([str(d) for d in directories], debounce=debounce, max_delay=max_delay, **options)
+    live.start()
+    assert live.wait_ready(5)
+    return live
+
+
+def stop(live):
+    live.stop()
+    live.join(5)
+    assert not live.is_alive()
+
+
+def test_changes_are_grouped_and_reported(tmp_path):
+    (tmp_path / "sous").mkdir()
+    changes = []
+    lock = threading.Lock()
+
+    def on_change(paths):
+        with lock:
+            changes.extend(paths)
+
+    # Attente assez longue pour que toute la rafale tombe dans le même lot
+    live = start([tmp_path], debounce=0.5, max_delay=2.0, db_path=None, on_change=on_change)
+    try:
+        assert live.stats()["watches"] == 2
+        target = tmp_path / "sous" / "fichier.txt"
+        for i in range(20):
+            target.write_text(str(i))
+        assert wait_for(lambda: str(target) in changes)
+        # Une rafale sur un même fichier ne donne qu'une mise à jour
+        with lock:
+            assert changes.count(str(target)) == 1
+        # Un dossier créé est surveillé à son tour
+        (tmp_path / "nouveau").mkdir()
+        assert wait_for(lambda: live.stats()["watches"] == 3)
+        (tmp_path / "nouveau" / "dedans.txt").write_text("")
+        assert wait_for(lambda: str(tmp_path / "nouveau" / "dedans.txt") in changes)
+    finally:
+        stop(live)
+
+
+def test_index_follows_the_disk(tmp_path):
+    root = tmp_path / "arbre"
+    root.mkdir()
+    (root / "ancien.txt").write_text("")
+    db_path = str(tmp_path / "index.db")
+    live = start([root], db_path=db_path)
+    try:
+        (root / "nouveau.txt").write_text("")
+        (root / "ancien.txt").unlink()
+        assert wait_for(lambda: live.stats()["applied"] >= 2)
+    finally:
+        stop(live)
+    index = FileIndex(db_path)
+    try:
+        assert [entry.name for entry in index.query(str(root))] == ["nouveau.txt"]
+    finally:
+        index.close()
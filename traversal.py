@@ -0,0 +1,389 @@
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+
+# Moteurs de parcours de l'arborescence.
+# Chaque moteur produit des entrées compatibles avec os.DirEntry (name, path, stat(), is_dir(), is_file())
+# afin que FileSearchThread puisse changer de moteur sans changer sa logique de recherche.
+# is_running est consulté à chaque entrée (et pas seulement à chaque dossier) : un dossier de
+# plusieurs centaines de milliers d'entrées ne retarde ni l'arrêt ni la pause.
+
+
+# Entrée produite par le moteur os.walk (équivalent minimal d'un os.DirEntry)
+class WalkEntry:
+    __slots__ = ('name', 'path', '_stat')
+
+    def __init__(self, root, name):
+        self.name = name
+        self.path = os.path.join(root, name)
+        self._stat = None
+
+    def stat(self, follow_symlinks=True):
+        if self._stat is None:
+            self._stat = os.stat(self.path)
+        return self._stat
+
+    def is_dir(self, follow_symlinks=True):
+        return False
+
+    def is_file(self, follow_symlinks=True):
+        return True
+
+
+# Base commune : par défaut les dossiers racines sont parcourus l'un après l'autre.
+# name_filter (facultatif) permet au moteur d'écarter tôt les entrées dont le nom ne convient pas.
+# progress (facultatif, progress.ProgressTracker) est informé de chaque dossier lu.
+# prune (facultatif, pruning.PruneRules) écarte des sous-dossiers avant qu'ils ne soient listés.
+# meta_filter(size, mtime) (facultatif) sert aux moteurs qui font eux-mêmes le stat des fichiers retenus.
+# parallel : le constructeur accepte workers (nombre de threads ou de processus).
+# exact_total : le moteur donne lui-même le total à progress (set_total), sans estimation.
+class Backend:
+    name = None
+    name_filter = None
+    meta_filter = None
+    progress = None
+    prune = None
+    parallel = False
+    exact_total = False
+
+    def iter_files(self, rootDir, is_running=lambda: True):
+        raise NotImplementedError
+
+    def iter_roots(self, directories, is_running=lambda: True):
+        for rootDir in directories:
+            if not is_running():
+                return
+            yield from self.iter_files(rootDir, is_running)
+
+
+# Moteur historique : os.walk puis un stat par fichier
+class WalkBackend(Backend):
+    name = 'walk'
+
+    def iter_files(self, rootDir, is_running=lambda: True):
+        progress = self.progress
+        prune = self.prune
+        states = {}
+        if prune is not None:
+            states[rootDir] = prune.root(rootDir)
+            if states[rootDir] is None:
+                return
+        for root, dirs, files in os.walk(rootDir, followlinks=prune is not None and prune.follow_symlinks):
+            if prune is not None:
+                # os.walk (topdown) ne descend que dans les dossiers laissés dans dirs
+                state = prune.enter(root, states.pop(root))
+                kept = []
+                for name in dirs:
+                    path = os.path.join(root, name)
+                    child = prune.allow_dir(path, name, state)
+                    if child is not None:
+                        states[path] = child
+                        kept.append(name)
+                dirs[:] = kept
+                files = [file for file in files if prune.allow_file(os.path.join(root, file), file, state)]
+            if progress is not None:
+                progress.enter_dir(root)
+                progress.dir_done(root, len(files))
+            for file in files:
+                if not is_running():
+                    return
+                yield WalkEntry(root, file)
+
+
+# Moteur basé sur os.scandir : le type vient du cache de DirEntry (d_type),
+# la taille et la date ne sont lues (stat) que si l'appelant en a besoin,
+# et ce stat est mis en cache par DirEntry (gratuit sous Windows).
+class ScandirBackend(Backend):
+    name = 'scandir'
+
+    def iter_files(self, rootDir, is_running=lambda: True):
+        state = None
+        if self.prune is not None:
+            state = self.prune.root(rootDir)
+            if state is None:
+                return
+        yield from self.iter_tree(rootDir, state, is_running)
+
+    # Parcourt l'arborescence sous path, dont l'état d'élagage est state (None sans élagage)
+    def iter_tree(self, path, state, is_running=lambda: True):
+        progress = self.progress
+        prune = self.prune
+        stack = [(path, state)]
+        while stack:
+            if not is_running():
+                return
+            path, state = stack.pop()
+            subdirs = []
+            files = 0
+            if progress is not None:
+                progress.enter_dir(path)
+            try:
+                for entry in list_dir(path, prune, state, subdirs, is_running):
+                    files += 1
+                    yield entry
+            except OSError:
+                continue
+            if not is_running():
+                return
+            if progress is not None:
+                progress.dir_done(path, files)
+            # Ordre inversé pour visiter les sous-dossiers dans l'ordre de listage
+            stack.extend(reversed(subdirs))
+
+
+# Liste le dossier path en appliquant les règles d'élagage (prune facultatif, state : état du dossier
+# avant prune.enter) : produit les fichiers retenus (os.DirEntry) et ajoute à subdirs les
+# sous-dossiers à parcourir, en couples (chemin, état). Sans règles, les liens vers des dossiers ne
+# sont pas suivis, comme os.walk. S'arrête quand is_running() devient faux ; un dossier illisible
+# lève OSError chez l'appelant.
+def list_dir(path, prune, state, subdirs, is_running=lambda: True):
+    if prune is not None:
+        state = prune.enter(path, state)
+    with os.scandir(path) as it:
+        for entry in it:
+            if not is_running():
+                return
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                subdirs.extend(_subdir(entry, prune, state))
+            elif prune is None or prune.allow_file(entry.path, entry.name, state):
+                yield entry
+
+
+# Sous-dossier à parcourir : [(chemin, état)], vide s'il est élagué ou si c'est un lien non suivi
+def _subdir(entry, prune, state):
+    if prune is None:
+        return [] if entry.is_symlink() else [(entry.path, None)]
+    child = prune.allow_dir(entry.path, entry.name, state, entry)
+    return [] if child is None else [(entry.path, child)]
+
+
+# État d'un parcours parallèle, propre à chaque appel d'iter_roots : deux parcours simultanés
+# avec le même moteur ne partagent ni files de dossiers ni résultats.
+# Les files contiennent des couples (dossier, état d'élagage).
+class _ParallelScan:
+    def __init__(self, roots, workers, is_running):
+        self.workers = workers
+        self.queues = [deque() for _ in range(workers)]
+        for i, root in enumerate(roots):
+            self.queues[i % workers].append(root)
+        self.pending = len(roots)
+        self.lock = threading.Condition()
+        self.stopped = threading.Event()
+        self.is_running = is_running
+        self.results = queue.Queue(maxsize=workers * 4)
+
+    def take(self, index):
+        try:
+            return self.queues[index].pop()
+        except IndexError:
+            pass
+        for offset in range(1, self.workers):
+            try:
+                return self.queues[(index + offset) % self.workers].popleft()
+            except IndexError:
+                continue
+        return None
+
+    def running(self):
+        return not self.stopped.is_set() and self.is_running()
+
+    def put(self, batch):
+        while self.running():
+            try:
+                self.results.put(batch, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    # Sous-dossiers trouvés par le thread index : ajoutés à sa propre file (sauf après l'arrêt)
+    def add_dirs(self, index, subdirs):
+        if subdirs and self.running():
+            with self.lock:
+                self.pending += len(subdirs)
+                self.queues[index].extend(subdirs)
+                self.lock.notify_all()
+
+    def dir_finished(self):
+        with self.lock:
+            self.pending -= 1
+            if self.pending == 0:
+                self.lock.notify_all()
+
+    # Vrai quand il n'y a plus rien à lire ; sinon attend un peu qu'un dossier se libère
+    def idle(self):
+        with self.lock:
+            if self.pending == 0:
+                self.lock.notify_all()
+                return True
+            self.lock.wait(0.01)
+            return False
+
+    def stop(self):
+        self.stopped.set()
+        with self.lock:
+            self.lock.notify_all()
+
+
+# Moteur parallèle : plusieurs threads lisent des dossiers en même temps.
+# Chaque thread possède sa file de dossiers (deque) : il dépile ses propres sous-dossiers
+# par la fin et, quand sa file est vide, vole le plus ancien dossier d'une autre file.
+# Les stat sont faits dans les threads de parcours pour recouvrir leur latence (SSD, NFS),
+# uniquement pour les entrées retenues par name_filter.
+# Toutes les racines sont distribuées dès le départ et parcourues simultanément.
+class ParallelScandirBackend(Backend):
+    name = 'parallel'
+    parallel = True
+    BATCH_SIZE = 256
+
+    def __init__(self, workers=None, prefetch_stat=True):
+        self.workers = max(1, workers or DEFAULT_WORKERS)
+        self.prefetch_stat = prefetch_stat
+
+    def iter_files(self, rootDir, is_running=lambda: True):
+        return self.iter_roots([rootDir], is_running)
+
+    def iter_roots(self, directories, is_running=lambda: True):
+        if not directories:
+            return
+        roots = [(rootDir, self.prune.root(rootDir) if self.prune is not None else None) for rootDir in directories]
+        if self.prune is not None:
+            roots = [root for root in roots if root[1] is not None]
+        scan = _ParallelScan(roots, self.workers, is_running)
+
+        threads = [threading.Thread(target=self._worker, args=(scan, i), daemon=True) for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        finished = 0
+        try:
+            while finished < len(threads):
+                batch = scan.results.get()
+                if batch is None:
+                    finished += 1
+                    continue
+                for entry in batch:
+                    if not is_running():
+                        return
+                    yield entry
+        finally:
+            # Arrêt demandé ou générateur abandonné : on libère les threads
+            scan.stop()
+            while any(thread.is_alive() for thread in threads):
+                try:
+                    scan.results.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+
+    def _worker(self, scan, index):
+        try:
+            while scan.running():
+                item = scan.take(index)
+                if item is None:
+                    if scan.idle():
+                        return
+                    continue
+                self._scan(scan, index, *item)
+                scan.dir_finished()
+        finally:
+            scan.results.put(None)
+
+    def _scan(self, scan, index, path, state):
+        progress = self.progress
+        if progress is not None:
+            progress.enter_dir(path)
+        subdirs = []
+        batch = []
+        files = 0
+        try:
+            for entry in list_dir(path, self.prune, state, subdirs, scan.running):
+                files += 1
+                if not self._keep(entry):
+                    continue
+                batch.append(entry)
+                if len(batch) >= self.BATCH_SIZE:
+                    if not scan.put(batch):
+                        return
+                    batch = []
+        except OSError:
+            pass
+        # Ordre inversé : le thread dépile ensuite ses sous-dossiers dans l'ordre de listage
+        scan.add_dirs(index, subdirs[::-1])
+        if progress is not None:
+            progress.dir_done(path, files)
+        if batch:
+            scan.put(batch)
+
+    # Entrée retenue par name_filter, avec son stat fait dans le thread de parcours
+    def _keep(self, entry):
+        if self.name_filter is not None and not self.name_filter(entry.name):
+            return False
+        if self.prefetch_stat:
+            try:
+                entry.stat()
+            except OSError:
+                # Le stat sera retenté (et échouera) côté appelant
+                pass
+        return True
+
+
+BACKENDS = {
+    WalkBackend.name: WalkBackend,
+    ScandirBackend.name: ScandirBackend,
+    ParallelScandirBackend.name: ParallelScandirBackend,
+}
+
+DEFAULT_BACKEND = ScandirBackend.name
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def get_backend(name=None, workers=None):
+    if name is None:
+        name = DEFAULT_BACKEND
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Moteur de parcours inconnu : {name}")
+    if backend_class.parallel:
+        return backend_class(workers=workers)
+    return backend_class()
+
+
+# Compare le débit (fichiers/s) des moteurs sur les mêmes dossiers.
+# Chaque fichier est « stat-é » comme le fait la recherche (taille + date).
+def benchmark_backends(directories, names=None, repeat=1):
+    results = {}
+    for name in names or list(BACKENDS):
+        backend = get_backend(name)
+        best = None
+        files = 0
+        for _ in range(repeat):
+            files = 0
+            start = time.perf_counter()
+            for entry in backend.iter_roots(directories):
+                try:
+                    entry.stat()
+                except OSError:
+                    continue
+                files += 1
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = {
+            "files": files,
+            "seconds": best,
+            "files_per_second": files / best if best else 0.0,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    directories = sys.argv[1:] or ["."]
+    for name, result in benchmark_backends(directories, repeat=3).items():
+        print(f"{name:10s} {result['files']:>10d} fichiers  {result['seconds']:8.3f} s  "
+              f"{result['files_per_second']:>12.0f} fichiers/s")
@@ -0,0 +1,263 @@
+import base64
+import json
+import math
+import os
+import tempfile
+import time
+
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+
+# Coffre du gestionnaire de mots de passe (Mdp.py) : dérivation de la clé et fichier du coffre.
+# La fonction de dérivation (PBKDF2-SHA256 ou scrypt), ses paramètres et le sel sont écrits dans
+# l'en-tête du coffre, une ligne JSON avant les données chiffrées :
+#     {"vault": 2, "kdf": {"kdf": "scrypt", "n": 32768, "r": 8, "p": 1, "salt": "..."}, "check": "..."}
+# Un coffre sans en-tête (ancien format) utilise PBKDF2 à 100 000 itérations et le sel de salt.dat.
+# calibrate() choisit les paramètres qui donnent une durée de dérivation cible sur cette machine.
+# La dérivation libère le GIL : elle peut tourner dans un thread sans figer l'interface.
+
+KDFS = {
+    'pbkdf2': "PBKDF2-SHA256",
+    'scrypt': "scrypt",
+}
+
+VAULT_VERSION = 2
+LEGACY_ITERATIONS = 100000
+MIN_ITERATIONS = 100000
+SCRYPT_R = 8
+SCRYPT_P = 1
+MIN_SCRYPT_N = 2 ** 14
+MAX_SCRYPT_N = 2 ** 20
+DEFAULT_TARGET = 0.5
+MEASURE_SECONDS = 0.05
+SALT_SIZE = 16
+# Pas de compactage en dessous de ce nombre d'enregistrements
+COMPACT_MIN_RECORDS = 64
+
+# Durée mesurée par unité de coût (itération PBKDF2, ou N × r × p pour scrypt), par fonction
+_rates = {}
+
+
+def _encode_salt(salt):
+    return base64.b64encode(salt).decode('ascii')
+
+
+def legacy_params(salt):
+    return {"kdf": 'pbkdf2', "iterations": LEGACY_ITERATIONS, "salt": _encode_salt(salt)}
+
+
+def _cost(params):
+    if params["kdf"] == 'scrypt':
+        return params["n"] * params["r"] * params["p"]
+    return params["iterations"]
+
+
+# Clé Fernet (32 octets en base64) dérivée du mot de passe maître
+def derive_key(password, params):
+    salt = base64.b64decode(params["salt"])
+    if params["kdf"] == 'pbkdf2':
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=params["iterations"])
+    elif params["kdf"] == 'scrypt':
+        kdf = Scrypt(salt=salt, length=32, n=params["n"], r=params["r"], p=params["p"])
+    else:
+        raise ValueError(f"Fonction de dérivation inconnue : {params['kdf']}")
+    start = time.perf_counter()
+    key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
+    _rates[params["kdf"]] = (time.perf_counter() - start) / _cost(params)
+    return key
+
+
+# Mesure sur des dérivations de coût croissant, jusqu'à une durée significative (MEASURE_SECONDS)
+def _measure(kdf):
+    if kdf == 'scrypt':
+        probe = {"kdf": kdf, "n": MIN_SCRYPT_N // 4, "r": SCRYPT_R, "p": SCRYPT_P}
+    else:
+        probe = {"kdf": kdf, "iterations": 10000}
+    probe["salt"] = _encode_salt(os.urandom(SALT_SIZE))
+    while True:
+        start = time.perf_counter()
+        derive_key("calibration", probe)
+        if time.perf_counter() - start >= MEASURE_SECONDS or (kdf == 'scrypt' and probe["n"] >= MAX_SCRYPT_N):
+            return _rates[kdf]
+        if kdf == 'scrypt':
+            probe["n"] *= 2
+        else:
+            probe["iterations"] *= 2
+
+
+# Durée estimée d'une dérivation (mesure de cette session, ou courte mesure préalable)
+def estimate_seconds(params):
+    rate = _rates.get(params["kdf"])
+    if rate is None:
+        rate = _measure(params["kdf"])
+    return rate * _cost(params)
+
+
+# Paramètres (avec un nouveau sel) pour une dérivation d'environ target secondes sur cette machine ;
+# jamais en dessous des minimums (100 000 itérations PBKDF2, N = 2^14 pour scrypt)
+def calibrate(kdf='pbkdf2', target=DEFAULT_TARGET):
+    if kdf not in KDFS:
+        raise ValueError(f"Fonction de dérivation inconnue : {kdf}")
+    rate = _measure(kdf)
+    params = {"kdf": kdf}
+    if kdf == 'scrypt':
+        # N est une puissance de 2 ; mémoire utilisée : 128 × N × r octets
+        n = target / (rate * SCRYPT_R * SCRYPT_P)
+        params.update(n=min(MAX_SCRYPT_N, max(MIN_SCRYPT_N, 2 ** round(math.log2(max(n, 1))))),
+                      r=SCRYPT_R, p=SCRYPT_P)
+    else:
+        params["iterations"] = max(MIN_ITERATIONS, int(target / rate) // 1000 * 1000)
+    params["salt"] = _encode_salt(os.urandom(SALT_SIZE))
+    return params
+
+
+def describe(params):
+    if params["kdf"] == 'scrypt':
+        return f"scrypt (N = {params['n']}, r = {params['r']}, p = {params['p']})"
+    return f"PBKDF2-SHA256 ({params['iterations']} itérations)"
+
+
+# Coffre en journal (version 2) : après l'en-tête, un enregistrement chiffré (jeton Fernet) par ligne,
+#     {"site": "...", "password": "..."}    ou    {"site": "...", "deleted": true}
+# Un ajout n'écrit que son enregistrement, à la fin du fichier, suivi d'un fsync ; le chargement rejoue
+# les enregistrements dans l'ordre. Quand les enregistrements périmés (remplacés ou supprimés) dépassent
+# les mots de passe actuels, le coffre est compacté : réécrit dans un fichier temporaire, fsync, puis
+# os.replace (atomique). Une ligne incomplète en fin de fichier (écriture interrompue) est ignorée et
+# écrasée par l'ajout suivant. L'en-tête contient un jeton de vérification du mot de passe maître.
+# Les anciens formats (sans en-tête, ou version 1 : un seul bloc chiffré) sont lus puis convertis
+# par le premier enregistrement.
+class VaultLog:
+    def __init__(self, path):
+        self.path = path
+        self.version = None  # None : pas de coffre ; 0 : ancien format sans en-tête
+        self.kdf_params = None
+        self.records = 0  # Enregistrements présents dans le journal, périmés compris
+        self.end = 0  # Position de la fin du dernier enregistrement complet
+        self._header = None
+        self._fernet = None
+
+    def exists(self):
+        return self.version is not None
+
+    # Paramètres de dérivation de l'en-tête ; None pour l'ancien format ou un coffre inexistant
+    def read_header(self):
+        self.version = self._header = None
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "rb") as file:
+            line = file.readline()
+        if not line.startswith(b"{"):
+            self.version = 0
+            return None
+        header = json.loads(line)
+        if header.get("vault") not in (1, VAULT_VERSION):
+            raise ValueError(f"Version de coffre non prise en charge : {header.get('vault')}")
+        self.version = header["vault"]
+        self._header = header
+        return header["kdf"]
+
+    def unlock(self, key, kdf_params):
+        self._fernet = Fernet(key)
+        self.kdf_params = kdf_params
+
+    # Rejoue le coffre : (site, mot de passe), mot de passe None pour une suppression.
+    # Mot de passe maître incorrect : cryptography.fernet.InvalidToken
+    def replay(self):
+        fernet = self._fernet
+        with open(self.path, "rb") as file:
+            if self.version != VAULT_VERSION:
+                # Ancien format : un seul bloc chiffré, après l'en-tête éventuel
+                if self.version == 1:
+                    file.readline()
+                yield from json.loads(fernet.decrypt(file.read())).items()
+                return
+            fernet.decrypt(self._header["check"].encode())
+            self.records = 0
+            self.end = len(file.readline())
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(fernet.decrypt(line.rstrip(b"\n")))
+                except InvalidToken:
+                    if file.read(1):
+                        raise ValueError("Coffre corrompu : enregistrement illisible")
+                    break
+                self.records += 1
+                self.end += len(line)
+                yield record["site"], None if record.get("deleted") else record["password"]
+
+    def load(self):
+        passwords = {}
+        for site, password in self.replay():
+            if password is None:
+                passwords.pop(site, None)
+            else:
+                passwords[site] = password
+        return passwords
+
+    def _record(self, site, password, fernet=None):
+        record = {"site": site, "deleted": True} if password is None else {"site": site, "password": password}
+        return (fernet or self._fernet).encrypt(json.dumps(record).encode()) + b"\n"
+
+    # Enregistre la valeur actuelle de site (absent de passwords : suppression) à la fin du journal ;
+    # ancien format ou trop d'enregistrements périmés : le coffre est compacté à la place
+    def append(self, passwords, site):
+        stale = self.records + 1 - len(passwords)
+        if self.version != VAULT_VERSION or (self.records >= COMPACT_MIN_RECORDS and stale > len(passwords)):
+            self.compact(passwords)
+            return
+        data = self._record(site, passwords.get(site))
+        with open(self.path, "r+b") as file:
+            file.seek(self.end)
+            file.write(data)
+            file.truncate()
+            file.flush()
+            os.fsync(file.fileno())
+        self.records += 1
+        self.end += len(data)
+
+    # Réécrit le coffre (un enregistrement par mot de passe) sans jamais laisser de fichier partiel ;
+    # avec key et kdf_params (changement de clé), le coffre n'utilise la nouvelle clé qu'une fois
+    # le fichier remplacé : en cas d'erreur, il reste entièrement lisible avec l'ancienne
+    def compact(self, passwords, key=None, kdf_params=None):
+        fernet = Fernet(key) if key is not None else self._fernet
+        if kdf_params is None:
+            kdf_params = self.kdf_params
+        header = {"vault": VAULT_VERSION, "kdf": kdf_params,
+                  "check": fernet.encrypt(b"vault").decode('ascii')}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(prefix=".vault-", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(json.dumps(header).encode() + b"\n")
+                for site, password in passwords.items():
+                    file.write(self._record(site, password, fernet))
+                end = file.tell()
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._fernet = fernet
+        self.kdf_params = kdf_params
+        self.version = VAULT_VERSION
+        self._header = header
+        self.records = len(passwords)
+        self.end = end
+        _fsync_directory(directory)
+
+
+# Rend le renommage durable (POSIX ; sans effet ailleurs)
+def _fsync_directory(directory):
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,248 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from file_index import DEFAULT_INDEX_PATH, FileIndex, normalize_root
+
+# Surveillance en direct des dossiers indexés via inotify (Linux uniquement).
+# Les événements sont regroupés par chemin et appliqués par lots à l'index :
+# une rafale (création, écritures, renommage...) sur un même fichier ne donne qu'une mise à jour,
+# l'état final étant relu sur le disque. En cas de débordement de la file du noyau,
+# les dossiers surveillés sont rafraîchis de façon incrémentale (dates des dossiers).
+# Sans db_path, aucun index n'est tenu : on_change(chemins) signale seulement les modifications
+# (surveillance d'une recherche, voir search_watch.py).
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR | IN_DONT_FOLLOW)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        _libc.inotify_init1.argtypes = [ctypes.c_int]
+        _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        _libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return _libc
+
+
+def is_supported():
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        _load_libc()
+    except OSError:
+        return False
+    return True
+
+
+class InotifyWatcher(threading.Thread):
+    def __init__(self, directories, db_path=DEFAULT_INDEX_PATH, debounce=0.2, max_delay=1.0, on_change=None):
+        super().__init__(daemon=True)
+        self.directories = [normalize_root(d) for d in directories]
+        self.db_path = db_path
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.on_change = on_change
+        self._stop_event = threading.Event()
+        self._ready = threading.Event()
+        self._fd = -1
+        self._watches = {}
+        self._pending = {}
+        self._last_event = 0.0
+        self._first_pending = 0.0
+        self._overflowed = False
+        self._lock = threading.Lock()
+        self._stats = {
+            "watches": 0,
+            "watch_errors": 0,
+            "events": 0,
+            "applied": 0,
+            "overflows": 0,
+            "last_lag": 0.0,
+            "max_lag": 0.0,
+        }
+
+    # Statistiques lisibles depuis un autre thread (nombre de surveillances, retard...)
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["pending"] = len(self._pending)
+        return stats
+
+    def wait_ready(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        libc = _load_libc()
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            self._ready.set()
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        index = FileIndex(self.db_path) if self.db_path is not None else None
+        try:
+            for rootDir in self.directories:
+                self._add_tree(rootDir)
+            if index is not None:
+                index.refresh(self.directories, lambda: not self._stop_event.is_set())
+            self._ready.set()
+            while not self._stop_event.is_set():
+                readable, _, _ = select.select([self._fd], [], [], 0.1)
+                if readable:
+                    self._read_events()
+                if self._due():
+                    self._flush(index)
+            if self._pending or self._overflowed:
+                self._flush(index)
+        finally:
+            self._ready.set()
+            if index is not None:
+                index.close()
+            os.close(self._fd)
+            self._fd = -1
+
+    def _add_watch(self, path):
+        wd = _libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            # ENOSPC : limite fs.inotify.max_user_watches atteinte
+            with self._lock:
+                self._stats["watch_errors"] += 1
+            return
+        self._watches[wd] = path
+        with self._lock:
+            self._stats["watches"] = len(self._watches)
+
+    def _add_tree(self, rootDir):
+        stack = [rootDir]
+        while stack:
+            path = stack.pop()
+            self._add_watch(path)
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+    def _remove_tree(self, path):
+        prefix = path + os.sep
+        for wd, watched in list(self._watches.items()):
+            if watched == path or watched.startswith(prefix):
+                _libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+        with self._lock:
+            self._stats["watches"] = len(self._watches)
+
+    def _read_events(self):
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return
+            raise
+        now = time.monotonic()
+        offset = 0
+        count = 0
+        while offset < len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            count += 1
+            if mask & IN_Q_OVERFLOW:
+                self._overflowed = True
+                with self._lock:
+                    self._stats["overflows"] += 1
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            dirpath = self._watches.get(wd)
+            if dirpath is None:
+                continue
+            if not name and not mask & IN_DELETE_SELF:
+                continue
+            path = os.path.join(dirpath, os.fsdecode(name)) if name else dirpath
+            if mask & IN_ISDIR:
+                if mask & (IN_MOVED_FROM | IN_DELETE):
+                    self._remove_tree(path)
+                elif mask & (IN_MOVED_TO | IN_CREATE):
+                    self._add_tree(path)
+                else:
+                    # Changement d'attributs d'un sous-dossier : rien à indexer
+                    continue
+            # On garde la date du premier événement pour mesurer le retard d'application
+            if not self._pending:
+                self._first_pending = now
+            self._pending.setdefault(path, now)
+            self._last_event = now
+        with self._lock:
+            self._stats["events"] += count
+
+    def _due(self):
+        if self._overflowed:
+            return True
+        if not self._pending:
+            return False
+        now = time.monotonic()
+        return now - self._last_event >= self.debounce or now - self._first_pending >= self.max_delay
+
+    def _flush(self, index):
+        pending, self._pending = self._pending, {}
+        if self._overflowed:
+            # Événements perdus : rafraîchissement incrémental des dossiers surveillés
+            self._overflowed = False
+            for rootDir in self.directories:
+                self._add_tree(rootDir)
+            if index is not None:
+                index.refresh(self.directories, lambda: not self._stop_event.is_set())
+        if index is not None:
+            touched = set()
+            for path in pending:
+                index.update_path(path)
+                touched.add(os.path.dirname(path))
+            for dirpath in touched:
+                index.touch_dir(dirpath)
+            index.commit()
+        now = time.monotonic()
+        if pending:
+            lag = now - min(pending.values())
+            with self._lock:
+                self._stats["applied"] += len(pending)
+                self._stats["last_lag"] = lag
+                self._stats["max_lag"] = max(self._stats["max_lag"], lag)
+        if self.on_change is not None:
+            self.on_change(set(pending))